@@ -0,0 +1,53 @@
+"""add background jobs table
+
+Revision ID: 0008_add_jobs
+Revises: 0007_add_storage_channel_id_for_gifts
+Create Date: 2026-10-17 10:00:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0008_add_jobs"
+down_revision: str | None = "0007_add_storage_channel_id_for_gifts"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("kind", sa.String(length=40), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("progress_total", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("progress_done", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("progress_failed", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("params_json", sa.Text(), server_default="{}", nullable=False),
+        sa.Column("result_json", sa.Text(), server_default="", nullable=False),
+        sa.Column("error", sa.Text(), server_default="", nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP")
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP")
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"], ["users.id"], name="fk_jobs_user_id_users", ondelete="SET NULL"
+        ),
+        sa.PrimaryKeyConstraint("id", name="pk_jobs"),
+    )
+    op.create_index("ix_jobs_kind", "jobs", ["kind"], unique=False)
+    op.create_index("ix_jobs_status", "jobs", ["status"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_status", table_name="jobs")
+    op.drop_index("ix_jobs_kind", table_name="jobs")
+    op.drop_table("jobs")
@@ -0,0 +1,32 @@
+"""add gift list indexes
+
+Revision ID: 0009_add_gift_list_indexes
+Revises: 0008_add_jobs
+Create Date: 2026-10-17 12:00:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+from sqlalchemy import inspect
+
+
+revision: str = "0009_add_gift_list_indexes"
+down_revision: str | None = "0008_add_jobs"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # 中文注释：单列 status 索引是新组合索引的前缀，保留只会多一份写放大，一并替换。
+    gift_indexes = {idx["name"] for idx in inspect(op.get_bind()).get_indexes("gift_qrcodes")}
+    if "ix_gift_qrcodes_status" in gift_indexes:
+        op.drop_index("ix_gift_qrcodes_status", table_name="gift_qrcodes")
+    op.create_index("ix_gift_qrcodes_title", "gift_qrcodes", ["title"], unique=False)
+    op.create_index("ix_gift_qrcodes_status_id", "gift_qrcodes", ["status", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_gift_qrcodes_status_id", table_name="gift_qrcodes")
+    op.drop_index("ix_gift_qrcodes_title", table_name="gift_qrcodes")
+    op.create_index("ix_gift_qrcodes_status", "gift_qrcodes", ["status"], unique=False)
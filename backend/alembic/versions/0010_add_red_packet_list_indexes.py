@@ -0,0 +1,57 @@
+"""add red packet list indexes
+
+Revision ID: 0010_add_red_packet_list_indexes
+Revises: 0009_add_gift_list_indexes
+Create Date: 2026-10-17 13:00:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+from sqlalchemy import inspect
+
+
+revision: str = "0010_add_red_packet_list_indexes"
+down_revision: str | None = "0009_add_gift_list_indexes"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # 中文注释：组合索引以筛选列开头、以 id 结尾，既能过滤又能按游标倒序走索引；
+    # 原单列索引是其前缀，一并替换。
+    inspector = inspect(op.get_bind())
+    red_packet_indexes = {idx["name"] for idx in inspector.get_indexes("red_packets")}
+    for name in ("ix_red_packets_status", "ix_red_packets_category_id"):
+        if name in red_packet_indexes:
+            op.drop_index(name, table_name="red_packets")
+    binding_indexes = {idx["name"] for idx in inspector.get_indexes("red_packet_tag_bindings")}
+    if "ix_red_packet_tag_bindings_tag_id" in binding_indexes:
+        op.drop_index("ix_red_packet_tag_bindings_tag_id", table_name="red_packet_tag_bindings")
+    op.create_index("ix_red_packets_status_id", "red_packets", ["status", "id"], unique=False)
+    op.create_index(
+        "ix_red_packets_category_id_id", "red_packets", ["category_id", "id"], unique=False
+    )
+    op.create_index("ix_red_packets_level_id", "red_packets", ["level", "id"], unique=False)
+    op.create_index("ix_red_packets_amount", "red_packets", ["amount"], unique=False)
+    op.create_index(
+        "ix_red_packet_tag_bindings_tag_id_red_packet_id",
+        "red_packet_tag_bindings",
+        ["tag_id", "red_packet_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_red_packet_tag_bindings_tag_id_red_packet_id", table_name="red_packet_tag_bindings"
+    )
+    op.drop_index("ix_red_packets_amount", table_name="red_packets")
+    op.drop_index("ix_red_packets_level_id", table_name="red_packets")
+    op.drop_index("ix_red_packets_category_id_id", table_name="red_packets")
+    op.drop_index("ix_red_packets_status_id", table_name="red_packets")
+    op.create_index(
+        "ix_red_packet_tag_bindings_tag_id", "red_packet_tag_bindings", ["tag_id"], unique=False
+    )
+    op.create_index("ix_red_packets_category_id", "red_packets", ["category_id"], unique=False)
+    op.create_index("ix_red_packets_status", "red_packets", ["status"], unique=False)
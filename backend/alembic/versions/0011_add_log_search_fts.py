@@ -0,0 +1,86 @@
+"""add fts5 search tables for logs
+
+Revision ID: 0011_add_log_search_fts
+Revises: 0010_add_red_packet_list_indexes
+Create Date: 2026-10-17 14:00:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+
+revision: str = "0011_add_log_search_fts"
+down_revision: str | None = "0010_add_red_packet_list_indexes"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# 中文注释：日志表与其全文索引所覆盖的列，需与 app/repositories/log_repository.py 保持一致。
+FTS_TABLES = {
+    "access_logs": ("source", "path", "method", "ip", "status_code"),
+    "gift_claim_logs": (
+        "gift_qrcode_id",
+        "red_packet_id",
+        "dispatch_strategy",
+        "ip",
+        "result",
+        "reason",
+    ),
+    "operation_logs": ("user_id", "action", "detail"),
+}
+
+
+def _create_fts(table: str, columns: tuple[str, ...]) -> None:
+    fts = f"{table}_fts"
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    # 中文注释：外部内容表只存倒排索引，不重复存储日志正文；trigram 分词支持任意子串匹配。
+    op.execute(
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({column_list}, "
+        f"content='{table}', content_rowid='id', tokenize='trigram')"
+    )
+    op.execute(
+        f"CREATE TRIGGER {table}_fts_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values}); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {table}_fts_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); "
+        f"END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {table}_fts_au AFTER UPDATE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values}); END"
+    )
+    op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def upgrade() -> None:
+    op.create_index("ix_access_logs_ip", "access_logs", ["ip"], unique=False)
+    op.create_index("ix_access_logs_created_at", "access_logs", ["created_at"], unique=False)
+    op.create_index("ix_gift_claim_logs_ip", "gift_claim_logs", ["ip"], unique=False)
+    op.create_index(
+        "ix_gift_claim_logs_created_at", "gift_claim_logs", ["created_at"], unique=False
+    )
+    op.create_index("ix_operation_logs_created_at", "operation_logs", ["created_at"], unique=False)
+
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for table, columns in FTS_TABLES.items():
+        _create_fts(table, columns)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        for table in FTS_TABLES:
+            for suffix in ("ai", "ad", "au"):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {table}_fts")
+
+    op.drop_index("ix_operation_logs_created_at", table_name="operation_logs")
+    op.drop_index("ix_gift_claim_logs_created_at", table_name="gift_claim_logs")
+    op.drop_index("ix_gift_claim_logs_ip", table_name="gift_claim_logs")
+    op.drop_index("ix_access_logs_created_at", table_name="access_logs")
+    op.drop_index("ix_access_logs_ip", table_name="access_logs")
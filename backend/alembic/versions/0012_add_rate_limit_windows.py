@@ -0,0 +1,32 @@
+"""add rate limit windows table
+
+Revision ID: 0012_add_rate_limit_windows
+Revises: 0011_add_log_search_fts
+Create Date: 2026-10-17 15:00:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0012_add_rate_limit_windows"
+down_revision: str | None = "0011_add_log_search_fts"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rate_limit_windows",
+        sa.Column("bucket_key", sa.String(length=128), nullable=False),
+        sa.Column("window_start", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("previous_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("current_count", sa.Integer(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("bucket_key", name="pk_rate_limit_windows"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("rate_limit_windows")
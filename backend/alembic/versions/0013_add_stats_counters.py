@@ -0,0 +1,90 @@
+"""add stats counters table
+
+Revision ID: 0013_add_stats_counters
+Revises: 0012_add_rate_limit_windows
+Create Date: 2026-10-17 16:00:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0013_add_stats_counters"
+down_revision: str | None = "0012_add_rate_limit_windows"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+STATUS_TABLES = {
+    "gift_qrcodes": "gift_status",
+    "red_packets": "red_packet_status",
+    "gift_bindings": "binding_status",
+}
+
+
+def _bump(scope: str, bucket: str, name: str, delta: int) -> str:
+    return (
+        f"INSERT INTO stats_counters(scope, bucket, name, value) "
+        f"VALUES ('{scope}', {bucket}, {name}, {delta}) "
+        f"ON CONFLICT(scope, bucket, name) DO UPDATE SET value = value + excluded.value;"
+    )
+
+
+def _create_status_triggers(table: str, scope: str) -> None:
+    total = "''"
+    # 中文注释：计数随源表写入在同一事务内更新，批量插入、条件更新与级联删除都不会漏记。
+    op.execute(
+        f"CREATE TRIGGER {table}_stats_ai AFTER INSERT ON {table} BEGIN "
+        f"{_bump(scope, total, 'new.status', 1)} END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {table}_stats_ad AFTER DELETE ON {table} BEGIN "
+        f"{_bump(scope, total, 'old.status', -1)} END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {table}_stats_au AFTER UPDATE OF status ON {table} "
+        f"WHEN old.status IS NOT new.status BEGIN "
+        f"{_bump(scope, total, 'old.status', -1)} {_bump(scope, total, 'new.status', 1)} END"
+    )
+    op.execute(
+        f"INSERT INTO stats_counters(scope, bucket, name, value) "
+        f"SELECT '{scope}', '', status, COUNT(*) FROM {table} GROUP BY status"
+    )
+
+
+def upgrade() -> None:
+    op.create_table(
+        "stats_counters",
+        sa.Column("scope", sa.String(length=40), nullable=False),
+        sa.Column("bucket", sa.String(length=20), server_default="", nullable=False),
+        sa.Column("name", sa.String(length=40), nullable=False),
+        sa.Column("value", sa.Integer(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("scope", "bucket", "name", name="pk_stats_counters"),
+    )
+
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for table, scope in STATUS_TABLES.items():
+        _create_status_triggers(table, scope)
+
+    # 中文注释：领取结果按 UTC 自然日累计，只在插入时加一；日志归档或级联删除不回减历史统计。
+    day = "COALESCE(date(new.created_at), date('now'))"
+    op.execute(
+        "CREATE TRIGGER gift_claim_logs_stats_ai AFTER INSERT ON gift_claim_logs BEGIN "
+        f"{_bump('claim_day', day, 'new.result', 1)} END"
+    )
+    op.execute(
+        "INSERT INTO stats_counters(scope, bucket, name, value) "
+        "SELECT 'claim_day', date(created_at), result, COUNT(*) FROM gift_claim_logs "
+        "WHERE created_at IS NOT NULL GROUP BY date(created_at), result"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS gift_claim_logs_stats_ai")
+        for table in STATUS_TABLES:
+            for suffix in ("ai", "ad", "au"):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_stats_{suffix}")
+    op.drop_table("stats_counters")
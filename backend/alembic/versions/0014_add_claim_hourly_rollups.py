@@ -0,0 +1,44 @@
+"""add claim hourly rollups
+
+Revision ID: 0014_add_claim_hourly_rollups
+Revises: 0013_add_stats_counters
+Create Date: 2026-10-17 17:00:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0014_add_claim_hourly_rollups"
+down_revision: str | None = "0013_add_stats_counters"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "claim_hourly_rollups",
+        sa.Column("hour", sa.DateTime(), nullable=False),
+        sa.Column("result", sa.String(length=30), nullable=False),
+        sa.Column("reason", sa.String(length=255), server_default="", nullable=False),
+        sa.Column("dispatch_strategy", sa.String(length=20), server_default="", nullable=False),
+        sa.Column("claims", sa.Integer(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint(
+            "hour", "result", "reason", "dispatch_strategy", name="pk_claim_hourly_rollups"
+        ),
+    )
+    # 中文注释：汇总表由后台聚合任务从水位线之后增量回填，迁移时不扫描历史日志。
+    op.create_table(
+        "rollup_watermarks",
+        sa.Column("name", sa.String(length=40), nullable=False),
+        sa.Column("last_id", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("name", name="pk_rollup_watermarks"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("rollup_watermarks")
+    op.drop_table("claim_hourly_rollups")
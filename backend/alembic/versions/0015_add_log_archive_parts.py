@@ -0,0 +1,45 @@
+"""add log archive parts
+
+Revision ID: 0015_add_log_archive_parts
+Revises: 0014_add_claim_hourly_rollups
+Create Date: 2026-10-17 18:00:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0015_add_log_archive_parts"
+down_revision: str | None = "0014_add_claim_hourly_rollups"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "log_archive_parts",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("table_name", sa.String(length=40), nullable=False),
+        sa.Column("day", sa.String(length=10), nullable=False),
+        sa.Column("filename", sa.String(length=64), nullable=False),
+        sa.Column("first_id", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("last_id", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("row_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("byte_size", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP")
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP")
+        ),
+        sa.PrimaryKeyConstraint("id", name="pk_log_archive_parts"),
+        sa.UniqueConstraint("table_name", "day", "filename", name="uq_log_archive_parts_file"),
+    )
+    op.create_index("ix_log_archive_parts_table_day", "log_archive_parts", ["table_name", "day"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_log_archive_parts_table_day", table_name="log_archive_parts")
+    op.drop_table("log_archive_parts")
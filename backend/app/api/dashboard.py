@@ -1,56 +1,64 @@
-from datetime import date, timedelta
+from datetime import UTC, datetime, time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.core.response import ok
-from app.models.gift import GiftBinding, GiftClaimLog, GiftQrcode
-from app.models.red_packet import RedPacket
+from app.models.stats import ClaimHourlyRollup
 from app.models.user import User
+from app.repositories.claim_rollup_repository import (
+    CLAIM_ROLLUP_WATERMARK,
+    ClaimRollupRepository,
+)
+from app.repositories.stats_repository import (
+    SCOPE_BINDING_STATUS,
+    SCOPE_CLAIM_DAY,
+    SCOPE_GIFT_STATUS,
+    SCOPE_RED_PACKET_STATUS,
+    StatsRepository,
+)
+from app.repositories.watermark_repository import WatermarkRepository
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
+TREND_RANGES = {"7d": 7, "30d": 30, "90d": 90}
+
+
+def _utc_days(count: int) -> list[str]:
+    # 中文注释：领取日志以 UTC 写入，按日计数的桶也使用 UTC 日期，避免与服务器本地时区错位。
+    today = datetime.now(tz=UTC).date()
+    return [(today - timedelta(days=offset)).isoformat() for offset in range(count - 1, -1, -1)]
+
+
+def _resolve_zone(name: str) -> ZoneInfo:
+    try:
+        return ZoneInfo(name.strip() or "UTC")
+    except (ZoneInfoNotFoundError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail="无效时区") from exc
+
 
 @router.get("/overview")
 def overview(
     db: Session = Depends(get_db),
     _user: User = Depends(get_current_user),
 ) -> dict:
-    total_gifts = db.query(func.count(GiftQrcode.id)).scalar() or 0
-    total_red_packets = db.query(func.count(RedPacket.id)).scalar() or 0
-    total_bound = (
-        db.query(func.count(GiftBinding.id)).filter(GiftBinding.status == "active").scalar() or 0
-    )
-    total_claimed = (
-        db.query(func.count(GiftQrcode.id)).filter(GiftQrcode.status == "claimed").scalar() or 0
-    )
-    today_success = (
-        db.query(func.count(GiftClaimLog.id))
-        .filter(
-            GiftClaimLog.result == "success", func.date(GiftClaimLog.created_at) == date.today()
-        )
-        .scalar()
-        or 0
-    )
-    today_rejected = (
-        db.query(func.count(GiftClaimLog.id))
-        .filter(
-            GiftClaimLog.result == "rejected", func.date(GiftClaimLog.created_at) == date.today()
-        )
-        .scalar()
-        or 0
-    )
+    today = _utc_days(1)[0]
+    counters = StatsRepository(db).read([today])
+
+    def total(scope: str) -> int:
+        return sum(value for (item_scope, _, _), value in counters.items() if item_scope == scope)
+
     return ok(
         {
-            "total_gifts": total_gifts,
-            "total_red_packets": total_red_packets,
-            "total_bound": total_bound,
-            "total_claimed": total_claimed,
-            "today_success_claims": today_success,
-            "today_rejected_claims": today_rejected,
+            "total_gifts": total(SCOPE_GIFT_STATUS),
+            "total_red_packets": total(SCOPE_RED_PACKET_STATUS),
+            "total_bound": counters.get((SCOPE_BINDING_STATUS, "", "active"), 0),
+            "total_claimed": counters.get((SCOPE_GIFT_STATUS, "", "claimed"), 0),
+            "today_success_claims": counters.get((SCOPE_CLAIM_DAY, today, "success"), 0),
+            "today_rejected_claims": counters.get((SCOPE_CLAIM_DAY, today, "rejected"), 0),
         }
     )
 
@@ -60,37 +68,69 @@ def trend_7d(
     db: Session = Depends(get_db),
     _user: User = Depends(get_current_user),
 ) -> dict:
-    today = date.today()
-    start_date = today - timedelta(days=6)
-
-    rows = (
-        db.query(
-            func.date(GiftClaimLog.created_at).label("day"),
-            GiftClaimLog.result,
-            func.count(GiftClaimLog.id).label("count"),
-        )
-        .filter(func.date(GiftClaimLog.created_at) >= start_date)
-        .group_by(func.date(GiftClaimLog.created_at), GiftClaimLog.result)
-        .all()
+    days = _utc_days(7)
+    counters = StatsRepository(db).read(days)
+    return ok(
+        {
+            "days": days,
+            "success": [counters.get((SCOPE_CLAIM_DAY, day, "success"), 0) for day in days],
+            "rejected": [counters.get((SCOPE_CLAIM_DAY, day, "rejected"), 0) for day in days],
+        }
     )
 
-    days = [(start_date + timedelta(days=i)).isoformat() for i in range(7)]
-    success_map = {day: 0 for day in days}
-    rejected_map = {day: 0 for day in days}
 
-    for day, result, count in rows:
-        day_str = str(day)
-        if day_str not in success_map:
+@router.get("/trend")
+def trend(
+    range_: str = Query(default="7d", alias="range"),
+    tz: str = Query(default="UTC", max_length=64),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+) -> dict:
+    days = TREND_RANGES.get(range_)
+    if days is None:
+        raise HTTPException(status_code=400, detail="不支持的统计区间")
+    zone = _resolve_zone(tz)
+
+    first_day = datetime.now(tz=zone).date() - timedelta(days=days - 1)
+    start = datetime.combine(first_day, time.min, tzinfo=zone).astimezone(UTC)
+    # 中文注释：汇总表按 UTC 整点分桶，起点向下取整到小时；每个桶按其起点换算到本地日期归日，
+    # 夏令时切换自然生效，非整点偏移的时区在零点附近有半小时以内的归日误差。
+    since = start.replace(tzinfo=None, minute=0, second=0, microsecond=0)
+
+    repo = ClaimRollupRepository(db)
+    labels = [(first_day + timedelta(days=offset)).isoformat() for offset in range(days)]
+    series: dict[str, dict[str, int]] = {"success": {}, "rejected": {}}
+    for hour, result, claims in repo.hourly_totals(since):
+        if result not in series:
             continue
-        if result == "success":
-            success_map[day_str] = int(count)
-        elif result == "rejected":
-            rejected_map[day_str] = int(count)
+        day = hour.replace(tzinfo=UTC).astimezone(zone).date()
+        if day < first_day:
+            continue
+        label = day.isoformat()
+        series[result][label] = series[result].get(label, 0) + claims
 
+    watermark = WatermarkRepository(db).get(CLAIM_ROLLUP_WATERMARK)
     return ok(
         {
-            "days": days,
-            "success": [success_map[day] for day in days],
-            "rejected": [rejected_map[day] for day in days],
+            "range": range_,
+            "timezone": zone.key,
+            "days": labels,
+            "success": [series["success"].get(label, 0) for label in labels],
+            "rejected": [series["rejected"].get(label, 0) for label in labels],
+            "rejected_reasons": [
+                {"reason": reason, "count": count}
+                for reason, count in repo.totals_by(ClaimHourlyRollup.reason, "rejected", since)
+            ],
+            "dispatch_strategies": [
+                {"dispatch_strategy": strategy, "count": count}
+                for strategy, count in repo.totals_by(
+                    ClaimHourlyRollup.dispatch_strategy, "success", since
+                )
+            ],
+            "updated_at": (
+                watermark.updated_at.replace(tzinfo=UTC).isoformat()
+                if watermark is not None and watermark.updated_at is not None
+                else None
+            ),
         }
     )
@@ -1,5 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.responses import Response
+from dataclasses import asdict
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from urllib.parse import urlparse
 from sqlalchemy.orm import Session
 
@@ -9,13 +12,24 @@ from app.core.response import ok
 from app.models.user import User
 from app.repositories.gift_repository import GiftRepository
 from app.schemas.gift import (
+    CreateGiftBatchRequest,
     CreateGiftRequest,
     CreateGiftResponse,
     GiftDetail,
     GiftItem,
+    GiftListResponse,
     UpdateGiftRequest,
 )
-from app.services.gift_service import GiftService
+from app.services.gift_batch_service import GiftBatchParams, GiftBatchService
+from app.services.gift_export_service import EXPORT_FORMATS, GiftExportService
+from app.services.gift_service import (
+    GiftService,
+    build_qrcode_etag,
+    gift_qrcode_cache_key,
+    load_gift_qrcode_image,
+)
+from app.services.job_handlers import GIFT_BATCH_CREATE, GIFT_REGENERATE_QRCODE
+from app.services.job_runner import job_runner
 from app.services.system_config_service import get_runtime_storage_channels
 from app.storage.factory import create_storage_from_channel
 
@@ -51,6 +65,11 @@ def _resolve_public_web_base(request: Request) -> str:
     return str(request.base_url).rstrip("/")
 
 
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = {item.strip() for item in if_none_match.split(",") if item.strip()}
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
 @router.post("")
 def create_gift(
     payload: CreateGiftRequest,
@@ -78,14 +97,62 @@ def create_gift(
     )
 
 
+@router.post("/batch")
+def create_gift_batch(
+    payload: CreateGiftBatchRequest,
+    request: Request,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> dict:
+    params = GiftBatchParams(
+        count=payload.count,
+        title=payload.title,
+        activate_at=payload.activate_at,
+        expire_at=payload.expire_at,
+        binding_mode=payload.binding_mode,
+        dispatch_strategy=payload.dispatch_strategy,
+        style_type=payload.style_type,
+        host_base=_resolve_public_web_base(request),
+        user_id=user.id,
+    )
+    try:
+        GiftBatchService.validate(params)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"批量创建礼物二维码失败: {exc}") from exc
+
+    job_id = job_runner.submit(GIFT_BATCH_CREATE, asdict(params), user_id=user.id)
+    return ok(job_runner.describe_by_id(db, job_id).model_dump(), "批量任务已提交")
+
+
 @router.get("")
 def list_gifts(
     request: Request,
+    after_id: int | None = Query(default=None, ge=1),
+    limit: int = Query(default=50, ge=1, le=200),
+    status: str = "",
+    title: str = "",
+    activate_from: datetime | None = None,
+    activate_to: datetime | None = None,
+    expire_from: datetime | None = None,
+    expire_to: datetime | None = None,
     db: Session = Depends(get_db),
     _user: User = Depends(get_current_user),
 ) -> dict:
     repo = GiftRepository(db)
-    items = repo.list_gifts()
+    # 中文注释：多取一条用于判断是否还有下一页，避免额外的 COUNT 查询。
+    items = repo.list_gifts(
+        after_id=after_id,
+        limit=limit + 1,
+        status=status.strip(),
+        title_prefix=title.strip(),
+        activate_from=GiftService._to_utc(activate_from),
+        activate_to=GiftService._to_utc(activate_to),
+        expire_from=GiftService._to_utc(expire_from),
+        expire_to=GiftService._to_utc(expire_to),
+    )
+    has_more = len(items) > limit
+    items = items[:limit]
+    binding_counts = repo.count_active_bindings([item.id for item in items])
     host_base = _resolve_public_web_base(request)
     data = [
         GiftItem(
@@ -96,14 +163,51 @@ def list_gifts(
             expire_at=item.expire_at,
             binding_mode=item.binding_mode,
             dispatch_strategy=item.dispatch_strategy,
-            binding_count=len(repo.list_bindings(item.id)),
+            binding_count=binding_counts.get(item.id, 0),
             style_type=item.style_type,
             image_url=item.image_url,
             claim_url=f"{host_base}/r/{item.token_plain}" if item.token_plain else "",
-        ).model_dump()
+        )
         for item in items
     ]
-    return ok(data)
+    next_after_id = items[-1].id if has_more and items else None
+    return ok(GiftListResponse(items=data, next_after_id=next_after_id).model_dump())
+
+
+@router.get("/export")
+def export_gifts(
+    request: Request,
+    export_format: str = Query(default="zip", alias="format"),
+    status: str = "",
+    keyword: str = "",
+    ids: str = "",
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="导出格式仅支持 zip 或 pdf")
+    try:
+        gift_ids = [int(item) for item in ids.split(",") if item.strip()]
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="礼物 ID 列表格式错误") from exc
+
+    service = GiftExportService(db, _resolve_public_web_base(request))
+    try:
+        service.prepare(status=status, keyword=keyword, ids=gift_ids)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    # 中文注释：归档边生成边输出，图片按有界并发逐个取回，不在内存中拼出完整文件。
+    filename = f"gift-qrcodes-{datetime.now():%Y%m%d-%H%M%S}.{export_format}"
+    if export_format == "pdf":
+        body, media_type = service.iter_pdf(), "application/pdf"
+    else:
+        body, media_type = service.iter_zip(), "application/zip"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.get("/{gift_id}")
@@ -204,9 +308,20 @@ def delete_gift(
 def regenerate_gift_qrcode(
     gift_id: int,
     request: Request,
+    async_mode: bool = Query(default=False, alias="async"),
     db: Session = Depends(get_db),
-    _user: User = Depends(get_current_user),
+    user: User = Depends(get_current_user),
 ) -> dict:
+    if async_mode:
+        if not GiftRepository(db).get_gift(gift_id):
+            raise HTTPException(status_code=404, detail="礼物二维码不存在")
+        job_id = job_runner.submit(
+            GIFT_REGENERATE_QRCODE,
+            {"gift_id": gift_id, "host_base": _resolve_public_web_base(request)},
+            user_id=user.id,
+        )
+        return ok(job_runner.describe_by_id(db, job_id).model_dump(), "任务已提交")
+
     try:
         claim_url, _image_url = GiftService(db).regenerate_gift_qrcode(
             gift_id=gift_id,
@@ -228,22 +343,27 @@ def download_gift_qrcode(
     gift = GiftRepository(db).get_gift(gift_id)
     if not gift:
         raise HTTPException(status_code=404, detail="礼物二维码不存在")
-    if not gift.object_key:
-        raise HTTPException(status_code=400, detail="该礼物二维码缺少存储对象，请重新生成")
-
-    channels = get_runtime_storage_channels(db)
-    channel = next((item for item in channels if item.id == gift.storage_channel_id), None)
-    if not channel:
-        raise HTTPException(status_code=400, detail="当前二维码存储渠道不可用，请重新生成")
-    storage = create_storage_from_channel(channel)
+    host_base = _resolve_public_web_base(request)
     try:
-        image = storage.download_bytes(gift.object_key)
-    except Exception as exc:
-        raise HTTPException(status_code=400, detail=f"二维码下载失败: {exc}") from exc
+        cache_key = gift_qrcode_cache_key(gift, host_base)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    headers = {}
+    # 中文注释：对象 key 或领取链接随重新生成而变化，ETag 可直接由缓存 key 得出，
+    # 命中协商缓存时无需读取存储或渲染。
+    headers = {
+        "ETag": build_qrcode_etag(cache_key),
+        "Cache-Control": "private, no-cache",
+    }
     if download:
         headers["Content-Disposition"] = f'attachment; filename="gift-qrcode-{gift_id}.png"'
+    if _etag_matches(request.headers.get("if-none-match", ""), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    try:
+        image = load_gift_qrcode_image(db, gift, host_base)
+    except (ValueError, RuntimeError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     return Response(content=image, media_type="image/png", headers=headers)
 
 
@@ -258,7 +378,11 @@ def get_gift_qrcode_download_url(
     if not gift:
         raise HTTPException(status_code=404, detail="礼物二维码不存在")
     if not gift.object_key:
-        raise HTTPException(status_code=400, detail="该礼物二维码缺少存储对象，请重新生成")
+        if not gift.token_plain:
+            raise HTTPException(status_code=400, detail="该礼物二维码缺少存储对象，请重新生成")
+        # 中文注释：即时渲染的礼物没有存储对象，只能经由后端接口下载。
+        base = _resolve_public_web_base(request)
+        return ok({"url": f"{base}/api/gifts/{gift_id}/qrcode.png?download=1"})
 
     channels = get_runtime_storage_channels(db)
     channel = next((item for item in channels if item.id == gift.storage_channel_id), None)
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.dependencies import get_current_user
+from app.core.response import ok
+from app.models.user import User
+from app.repositories.job_repository import JobRepository
+from app.services.job_runner import job_runner
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+@router.get("")
+def list_jobs(
+    limit: int = Query(default=50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+) -> dict:
+    items = JobRepository(db).list_jobs(limit=limit)
+    return ok([job_runner.describe(item).model_dump() for item in items])
+
+
+@router.get("/{job_id}")
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_user),
+) -> dict:
+    item = job_runner.describe_by_id(db, job_id)
+    if not item:
+        raise HTTPException(status_code=404, detail="任务不存在")
+    return ok(item.model_dump())
@@ -1,45 +1,112 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import String, cast, or_, select
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from app.core.access_log import access_log_sink
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_admin, get_current_user
 from app.core.response import ok
-from app.models.gift import GiftClaimLog
-from app.models.log import AccessLog, OperationLog
+from app.models.log import LogArchivePart
 from app.models.user import User
-from app.schemas.logs import AccessLogItem, GiftClaimLogItem, OperationLogItem
+from app.repositories.log_repository import LogRepository
+from app.schemas.logs import (
+    AccessLogItem,
+    AccessLogListResponse,
+    GiftClaimLogItem,
+    GiftClaimLogListResponse,
+    OperationLogItem,
+    OperationLogListResponse,
+)
+from app.services.log_archive import log_archive_store
+from app.services.log_retention import RetentionPolicy, log_retention_worker
 
 router = APIRouter(prefix="/api/logs", tags=["logs"])
 
+# 中文注释：归档检索需要逐个解压分片，限制单次查询跨度，避免一次请求扫完整年的归档。
+ARCHIVE_QUERY_MAX_DAYS = 31
+
 
 def _normalize_keyword(q: str) -> str:
     return q.strip()
 
 
+def _encode_cursor(before_id: int) -> str:
+    # 中文注释：游标对前端不透明，后续要换成复合排序键时不必改动接口参数。
+    return _encode_token({"before_id": before_id})
+
+
+def _decode_cursor(cursor: str) -> int:
+    payload = _decode_token(cursor)
+    try:
+        before_id = int(payload["before_id"])
+    except (ValueError, TypeError, KeyError) as exc:
+        raise HTTPException(status_code=400, detail="分页游标无效") from exc
+    if before_id < 1:
+        raise HTTPException(status_code=400, detail="分页游标无效")
+    return before_id
+
+
+def _encode_token(payload: dict) -> str:
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_token(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, ValueError, UnicodeError) as exc:
+        raise HTTPException(status_code=400, detail="分页游标无效") from exc
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="分页游标无效")
+    return payload
+
+
+def _resolve_before_id(cursor: str, before_id: int | None) -> int | None:
+    cursor = cursor.strip()
+    if cursor:
+        return _decode_cursor(cursor)
+    return before_id
+
+
+def _next_cursor(rows: list, limit: int) -> str | None:
+    # 中文注释：查询时多取一条，只有确实还有下一页时才返回游标，省掉 COUNT 查询。
+    if len(rows) <= limit:
+        return None
+    return _encode_cursor(rows[limit - 1].id)
+
+
 @router.get("/access")
 def list_access_logs(
     limit: int = Query(default=50, ge=1, le=200),
-    offset: int = Query(default=0, ge=0),
+    cursor: str = "",
+    before_id: int | None = Query(default=None, ge=1),
     q: str = Query(default=""),
+    source: str = "",
+    ip: str = "",
+    status_code: int | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
     db: Session = Depends(get_db),
     _user: User = Depends(get_current_user),
 ) -> dict:
-    keyword = _normalize_keyword(q)
-    stmt = select(AccessLog)
-    if keyword:
-        pattern = f"%{keyword}%"
-        stmt = stmt.where(
-            or_(
-                AccessLog.source.ilike(pattern),
-                AccessLog.path.ilike(pattern),
-                AccessLog.method.ilike(pattern),
-                AccessLog.ip.ilike(pattern),
-                cast(AccessLog.status_code, String).ilike(pattern),
-            )
-        )
-
-    rows = list(db.scalars(stmt.order_by(AccessLog.id.desc()).offset(offset).limit(limit)).all())
+    rows = LogRepository(db).list_access_logs(
+        limit=limit + 1,
+        before_id=_resolve_before_id(cursor, before_id),
+        keyword=_normalize_keyword(q),
+        source=source.strip(),
+        ip=ip.strip(),
+        status_code=status_code,
+        created_from=created_from,
+        created_to=created_to,
+    )
     data = [
         AccessLogItem(
             id=row.id,
@@ -50,36 +117,37 @@ def list_access_logs(
             status_code=row.status_code,
             latency_ms=row.latency_ms,
             created_at=row.created_at,
-        ).model_dump()
-        for row in rows
+        )
+        for row in rows[:limit]
     ]
-    return ok(data)
+    next_cursor = _next_cursor(rows, limit)
+    return ok(AccessLogListResponse(items=data, next_cursor=next_cursor).model_dump())
 
 
 @router.get("/claims")
 def list_claim_logs(
     limit: int = Query(default=50, ge=1, le=200),
-    offset: int = Query(default=0, ge=0),
+    cursor: str = "",
+    before_id: int | None = Query(default=None, ge=1),
     q: str = Query(default=""),
+    gift_qrcode_id: int | None = None,
+    result: str = "",
+    ip: str = "",
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
     db: Session = Depends(get_db),
     _user: User = Depends(get_current_user),
 ) -> dict:
-    keyword = _normalize_keyword(q)
-    stmt = select(GiftClaimLog)
-    if keyword:
-        pattern = f"%{keyword}%"
-        stmt = stmt.where(
-            or_(
-                cast(GiftClaimLog.gift_qrcode_id, String).ilike(pattern),
-                cast(GiftClaimLog.red_packet_id, String).ilike(pattern),
-                GiftClaimLog.dispatch_strategy.ilike(pattern),
-                GiftClaimLog.ip.ilike(pattern),
-                GiftClaimLog.result.ilike(pattern),
-                GiftClaimLog.reason.ilike(pattern),
-            )
-        )
-
-    rows = list(db.scalars(stmt.order_by(GiftClaimLog.id.desc()).offset(offset).limit(limit)).all())
+    rows = LogRepository(db).list_claim_logs(
+        limit=limit + 1,
+        before_id=_resolve_before_id(cursor, before_id),
+        keyword=_normalize_keyword(q),
+        gift_qrcode_id=gift_qrcode_id,
+        result=result.strip(),
+        ip=ip.strip(),
+        created_from=created_from,
+        created_to=created_to,
+    )
     data = [
         GiftClaimLogItem(
             id=row.id,
@@ -90,33 +158,35 @@ def list_claim_logs(
             result=row.result,
             reason=row.reason,
             created_at=row.created_at,
-        ).model_dump()
-        for row in rows
+        )
+        for row in rows[:limit]
     ]
-    return ok(data)
+    next_cursor = _next_cursor(rows, limit)
+    return ok(GiftClaimLogListResponse(items=data, next_cursor=next_cursor).model_dump())
 
 
 @router.get("/operations")
 def list_operation_logs(
     limit: int = Query(default=50, ge=1, le=200),
-    offset: int = Query(default=0, ge=0),
+    cursor: str = "",
+    before_id: int | None = Query(default=None, ge=1),
     q: str = Query(default=""),
+    user_id: int | None = None,
+    action: str = "",
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
     db: Session = Depends(get_db),
     _user: User = Depends(get_current_user),
 ) -> dict:
-    keyword = _normalize_keyword(q)
-    stmt = select(OperationLog)
-    if keyword:
-        pattern = f"%{keyword}%"
-        stmt = stmt.where(
-            or_(
-                cast(OperationLog.user_id, String).ilike(pattern),
-                OperationLog.action.ilike(pattern),
-                OperationLog.detail.ilike(pattern),
-            )
-        )
-
-    rows = list(db.scalars(stmt.order_by(OperationLog.id.desc()).offset(offset).limit(limit)).all())
+    rows = LogRepository(db).list_operation_logs(
+        limit=limit + 1,
+        before_id=_resolve_before_id(cursor, before_id),
+        keyword=_normalize_keyword(q),
+        user_id=user_id,
+        action=action.strip(),
+        created_from=created_from,
+        created_to=created_to,
+    )
     data = [
         OperationLogItem(
             id=row.id,
@@ -124,7 +194,168 @@ def list_operation_logs(
             action=row.action,
             detail=row.detail,
             created_at=row.created_at,
-        ).model_dump()
-        for row in rows
+        )
+        for row in rows[:limit]
+    ]
+    next_cursor = _next_cursor(rows, limit)
+    return ok(OperationLogListResponse(items=data, next_cursor=next_cursor).model_dump())
+
+
+@router.get("/access/sink-stats")
+def get_access_log_sink_stats(_user: User = Depends(get_current_admin)) -> dict:
+    return ok(access_log_sink.snapshot())
+
+
+def _archive_policy(kind: str) -> RetentionPolicy:
+    policy = log_retention_worker.policies.get(kind.strip())
+    if policy is None:
+        raise HTTPException(status_code=400, detail="不支持的日志类型")
+    return policy
+
+
+def _archive_range(start: date, end: date) -> tuple[date, date]:
+    if start > end:
+        raise HTTPException(status_code=400, detail="开始日期不能晚于结束日期")
+    return start, end
+
+
+def _archive_parts(
+    db: Session, policy: RetentionPolicy, start: date, end: date
+) -> list[LogArchivePart]:
+    # 中文注释：只读取清单里登记过的分片，未提交的残留文件不会混进下载或查询结果。
+    return LogRepository(db).list_archive_parts(policy.table, start.isoformat(), end.isoformat())
+
+
+def _archive_paths(db: Session, policy: RetentionPolicy, start: date, end: date) -> list[Path]:
+    return [
+        log_archive_store.path_for(policy.table, item.day, item.filename)
+        for item in _archive_parts(db, policy, start, end)
     ]
-    return ok(data)
+
+
+def _decode_archive_cursor(cursor: str) -> tuple[str, str, int]:
+    payload = _decode_token(cursor)
+    try:
+        day, filename, offset = str(payload["day"]), str(payload["file"]), int(payload["offset"])
+    except (ValueError, TypeError, KeyError) as exc:
+        raise HTTPException(status_code=400, detail="分页游标无效") from exc
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="分页游标无效")
+    return day, filename, offset
+
+
+def _archive_record_matches(record: dict, keyword: str, ip: str) -> bool:
+    if ip and record.get("ip") != ip:
+        return False
+    if not keyword:
+        return True
+    # 中文注释：与在线日志检索保持一致：忽略大小写，状态码、id 等非字符串字段也参与匹配。
+    return any(keyword in str(value).casefold() for value in record.values() if value is not None)
+
+
+@router.get("/retention/stats")
+def get_log_retention_stats(_user: User = Depends(get_current_admin)) -> dict:
+    return ok(log_retention_worker.snapshot())
+
+
+@router.post("/retention/run")
+async def run_log_retention(_user: User = Depends(get_current_admin)) -> dict:
+    archived = await run_in_threadpool(log_retention_worker.run_once)
+    if archived is None:
+        raise HTTPException(status_code=409, detail="归档任务正在运行，请稍后再试")
+    return ok(archived, message="归档完成")
+
+
+@router.get("/archives")
+def list_log_archives(
+    kind: str,
+    start: date,
+    end: date,
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_admin),
+) -> dict:
+    policy = _archive_policy(kind)
+    start, end = _archive_range(start, end)
+    return ok(LogRepository(db).list_archive_days(policy.table, start.isoformat(), end.isoformat()))
+
+
+@router.get("/archives/download")
+def download_log_archives(
+    kind: str,
+    start: date,
+    end: date,
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_admin),
+) -> StreamingResponse:
+    policy = _archive_policy(kind)
+    start, end = _archive_range(start, end)
+    paths = _archive_paths(db, policy, start, end)
+    if not paths:
+        raise HTTPException(status_code=404, detail="所选日期范围内没有归档")
+    filename = f"{policy.table}-{start:%Y%m%d}-{end:%Y%m%d}.jsonl.gz"
+    return StreamingResponse(
+        log_archive_store.iter_bytes(paths),
+        media_type="application/gzip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/archives/records")
+def query_log_archives(
+    kind: str,
+    start: date,
+    end: date,
+    q: str = "",
+    ip: str = "",
+    cursor: str = "",
+    limit: int = Query(default=50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_admin),
+) -> dict:
+    policy = _archive_policy(kind)
+    start, end = _archive_range(start, end)
+    if (end - start).days >= ARCHIVE_QUERY_MAX_DAYS:
+        raise HTTPException(
+            status_code=400, detail=f"归档查询跨度不能超过 {ARCHIVE_QUERY_MAX_DAYS} 天"
+        )
+    keyword = _normalize_keyword(q).casefold()
+    ip = ip.strip()
+    parts = _archive_parts(db, policy, start, end)
+
+    # 中文注释：游标记录上一页最后一条命中所在的分片与行号，分片按日期、起始 id 固定排序，
+    # 翻页时直接从该位置继续解压，不依赖 id 在不同分片之间是否有序。
+    first_part, skip = 0, 0
+    cursor = cursor.strip()
+    if cursor:
+        day, filename, skip = _decode_archive_cursor(cursor)
+        matched = next(
+            (
+                index
+                for index, item in enumerate(parts)
+                if (item.day, item.filename) == (day, filename)
+            ),
+            None,
+        )
+        if matched is None:
+            raise HTTPException(status_code=400, detail="分页游标无效")
+        first_part = matched
+
+    items: list[dict] = []
+    last_position: dict = {}
+    next_cursor: str | None = None
+    for index in range(first_part, len(parts)):
+        part = parts[index]
+        path = log_archive_store.path_for(policy.table, part.day, part.filename)
+        offset = skip if index == first_part else 0
+        for line, record in enumerate(log_archive_store.iter_records([path])):
+            if line < offset or not _archive_record_matches(record, keyword, ip):
+                continue
+            if len(items) == limit:
+                # 中文注释：多读到一条命中才返回游标，末页不会多出一次空翻页。
+                next_cursor = _encode_token(last_position)
+                break
+            items.append(record)
+            last_position = {"day": part.day, "file": part.filename, "offset": line + 1}
+        if next_cursor is not None:
+            break
+    return ok({"items": items, "next_cursor": next_cursor})
@@ -1,10 +1,13 @@
 import json
+import shutil
+from datetime import datetime
+from pathlib import Path
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_admin, get_current_user
 from app.core.response import ok
 from app.models.user import User
 from app.repositories.red_packet_repository import RedPacketRepository
@@ -12,18 +15,31 @@ from app.schemas.red_packet import (
     BatchImportUrlsRequest,
     CreateCategoryRequest,
     CreateRedPacketRequest,
+    ImportRowError,
     ParseImageResult,
     ParseImagesResponse,
     RedPacketCategoryItem,
     RedPacketImportResponse,
     RedPacketItem,
+    RedPacketListResponse,
     UpdateRedPacketRequest,
 )
+from app.services.job_handlers import RED_PACKET_CSV_IMPORT, RED_PACKET_IMAGE_IMPORT
+from app.services.job_runner import job_runner
+from app.services.qr_decode import decode_stats
 from app.services.red_packet_service import RedPacketService
 
 router = APIRouter(prefix="/api/red-packets", tags=["red-packets"])
 
 
+def _save_upload(upload: UploadFile, target: Path) -> Path:
+    # 中文注释：异步任务的上传文件先流式落盘，请求结束后由任务线程读取，不在内存中整体缓存。
+    upload.file.seek(0)
+    with target.open("wb") as fh:
+        shutil.copyfileobj(upload.file, fh)
+    return target
+
+
 @router.get("/categories")
 def list_categories(
     db: Session = Depends(get_db),
@@ -101,22 +117,55 @@ def create_red_packet(
 
 
 @router.post("/batch-images")
-async def batch_import_images(
+def batch_import_images(
     files: list[UploadFile] = File(...),
     title_prefix: str = Form(default="支付宝红包"),
     amount: float = Form(default=0),
     level: int = Form(default=1),
     category_code: str | None = Form(default="alipay_red_packet"),
     tags: str = Form(default=""),
+    async_mode: bool = Query(default=False, alias="async"),
     db: Session = Depends(get_db),
-    _user: User = Depends(get_current_user),
+    user: User = Depends(get_current_user),
 ) -> dict:
     if not files:
         raise HTTPException(status_code=400, detail="请至少上传一张图片")
     tag_list = [item.strip() for item in tags.split(",") if item.strip()]
+    if async_mode:
+        temp_dir = job_runner.create_temp_dir()
+        saved = [
+            {
+                "filename": upload.filename or f"image-{index}.png",
+                "content_type": upload.content_type or "image/png",
+                "path": str(_save_upload(upload, temp_dir / f"{index:06d}.bin")),
+            }
+            for index, upload in enumerate(files, start=1)
+        ]
+        job_id = job_runner.submit(
+            RED_PACKET_IMAGE_IMPORT,
+            {
+                "files": saved,
+                "title_prefix": title_prefix,
+                "amount": amount,
+                "level": level,
+                "category_code": category_code,
+                "tags": tag_list,
+                "temp_dir": str(temp_dir),
+            },
+            user_id=user.id,
+        )
+        return ok(job_runner.describe_by_id(db, job_id).model_dump(), "导入任务已提交")
+
     try:
-        batch_no, imported_count = await RedPacketService(db).import_image_files(
-            files=files,
+        batch_no, imported_count = RedPacketService(db).import_images(
+            items=(
+                (
+                    upload.filename or f"image-{index}.png",
+                    upload.content_type or "image/png",
+                    upload.file.read(),
+                )
+                for index, upload in enumerate(files, start=1)
+            ),
             title_prefix=title_prefix,
             amount=amount,
             level=level,
@@ -134,15 +183,17 @@ async def batch_import_images(
 
 
 @router.post("/parse-images-to-urls")
-async def parse_images_to_urls(
+def parse_images_to_urls(
     files: list[UploadFile] = File(...),
     db: Session = Depends(get_db),
     _user: User = Depends(get_current_user),
 ) -> dict:
     if not files:
         raise HTTPException(status_code=400, detail="请至少上传一张图片")
-    success_count, failed_count, results = await RedPacketService(db).parse_image_files_to_urls(
-        files
+    # 中文注释：同步路由在线程池中执行，解码交给进程池，不再阻塞事件循环。
+    success_count, failed_count, results = RedPacketService(db).parse_images_to_urls(
+        (upload.filename or f"image-{index}.png", upload.file.read())
+        for index, upload in enumerate(files, start=1)
     )
     payload = ParseImagesResponse(
         success_count=success_count,
@@ -152,6 +203,11 @@ async def parse_images_to_urls(
     return ok(payload.model_dump(), "解析完成")
 
 
+@router.get("/decode-stats")
+def get_decode_stats(_admin: User = Depends(get_current_admin)) -> dict:
+    return ok(decode_stats.snapshot())
+
+
 @router.post("/batch-urls")
 def batch_import_urls(
     payload: BatchImportUrlsRequest,
@@ -184,37 +240,77 @@ def batch_import_urls(
 
 
 @router.post("/import")
-async def import_csv_compat(
+def import_csv_compat(
     file: UploadFile = File(...),
+    async_mode: bool = Query(default=False, alias="async"),
     db: Session = Depends(get_db),
-    _user: User = Depends(get_current_user),
+    user: User = Depends(get_current_user),
 ) -> dict:
     filename = file.filename or ""
     if not filename.lower().endswith(".csv"):
         raise HTTPException(status_code=400, detail="仅支持 CSV 文件")
-    content = await file.read()
-    batch_no, imported_count = RedPacketService(db).import_csv(content)
-    response = RedPacketImportResponse(batch_no=batch_no, imported_count=imported_count)
+    if async_mode:
+        temp_dir = job_runner.create_temp_dir()
+        file_path = _save_upload(file, temp_dir / "import.csv")
+        job_id = job_runner.submit(
+            RED_PACKET_CSV_IMPORT,
+            {"file_path": str(file_path), "temp_dir": str(temp_dir)},
+            user_id=user.id,
+        )
+        return ok(job_runner.describe_by_id(db, job_id).model_dump(), "导入任务已提交")
+
+    batch_no, imported_count, failed_count, errors = RedPacketService(db).import_csv(file.file)
+    response = RedPacketImportResponse(
+        batch_no=batch_no,
+        imported_count=imported_count,
+        failed_count=failed_count,
+        errors=[ImportRowError(**item) for item in errors],
+    )
     return ok(response.model_dump(), "导入成功")
 
 
 @router.get("")
 def list_red_packets(
+    after_id: int | None = Query(default=None, ge=1),
+    limit: int = Query(default=50, ge=1, le=200),
+    status: str = "",
+    ids: str = "",
+    category: str = "",
+    tag: str = "",
+    level: int | None = None,
+    amount_min: float | None = Query(default=None, ge=0),
+    amount_max: float | None = Query(default=None, ge=0),
+    available_at: datetime | None = None,
     db: Session = Depends(get_db),
     _user: User = Depends(get_current_user),
 ) -> dict:
+    try:
+        packet_ids = [int(item) for item in ids.split(",") if item.strip()]
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="红包 ID 列表格式错误") from exc
+
     service = RedPacketService(db)
     service.ensure_builtin_categories()
     repo = RedPacketRepository(db)
-    items = repo.list_items()
-
-    category_ids = {item.category_id for item in items if item.category_id is not None}
-    category_map = repo.get_categories_map({int(item_id) for item_id in category_ids})
-    tag_map = repo.get_tags_map({item.id for item in items})
+    rows = repo.list_items(
+        after_id=after_id,
+        limit=limit + 1,
+        status=status.strip(),
+        ids=packet_ids,
+        category_code=category.strip(),
+        tag=tag.strip(),
+        level=level,
+        amount_min=amount_min,
+        amount_max=amount_max,
+        available_at=available_at,
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    # 中文注释：分类已随分页查询连表取回，标签按整页 id 一次查询补齐。
+    tag_map = repo.get_tags_map({item.id for item, _category in rows})
 
     data = []
-    for item in items:
-        category = category_map.get(item.category_id or 0)
+    for item, category in rows:
         try:
             meta = json.loads(item.meta_json or "{}")
             if not isinstance(meta, dict):
@@ -237,9 +333,10 @@ def list_red_packets(
                 meta={str(k): str(v) for k, v in meta.items()},
                 available_from=item.available_from,
                 available_to=item.available_to,
-            ).model_dump()
+            )
         )
-    return ok(data)
+    next_after_id = rows[-1][0].id if has_more and rows else None
+    return ok(RedPacketListResponse(items=data, next_after_id=next_after_id).model_dump())
 
 
 @router.put("/{red_packet_id}")
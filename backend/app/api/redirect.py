@@ -5,10 +5,12 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.orm import Session
 
+from app.core.client_ip import get_client_ip
 from app.core.database import get_db
 from app.core.security import verify_claim_content_token
 from app.models.red_packet import RedPacket, RedPacketCategory
 from app.services.gift_service import GiftService
+from app.services.security_service import claim_access_guard
 from app.services.system_config_service import get_claim_contact_text
 
 router = APIRouter(tags=["redirect"])
@@ -16,10 +18,17 @@ router = APIRouter(tags=["redirect"])
 
 @router.get("/r/{gift_token}")
 def gift_redirect(gift_token: str, request: Request, db: Session = Depends(get_db)):
+    ip = get_client_ip(request)
+    decision = claim_access_guard.check(db, ip)
+    if not decision.allowed:
+        headers = {"Retry-After": str(decision.retry_after)} if decision.retry_after else None
+        raise HTTPException(
+            status_code=decision.status_code, detail=decision.message, headers=headers
+        )
     try:
         target_url = GiftService(db).claim_by_token(
             token=gift_token,
-            ip=request.client.host if request.client else "",
+            ip=ip,
             ua=request.headers.get("user-agent", ""),
             host_base=str(request.base_url),
         )
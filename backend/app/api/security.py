@@ -2,11 +2,11 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_admin, get_current_user
 from app.core.response import ok
 from app.models.user import User
 from app.schemas.security import SecurityRulePayload, SecurityRuleResponse
-from app.services.security_service import SecurityService
+from app.services.security_service import SecurityService, claim_access_guard
 
 router = APIRouter(prefix="/api/security", tags=["security"])
 
@@ -29,3 +29,8 @@ def update_rules(
     data = {k: v for k, v in payload.model_dump().items() if v is not None}
     rules = SecurityService(db).update_rules(data)
     return ok(SecurityRuleResponse(rules=rules).model_dump(), "更新成功")
+
+
+@router.get("/rate-limit-stats")
+def get_rate_limit_stats(_user: User = Depends(get_current_admin)) -> dict:
+    return ok(claim_access_guard.limiter.snapshot())
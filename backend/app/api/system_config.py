@@ -91,6 +91,15 @@ def list_storage_channels(
     return ok(data.model_dump())
 
 
+@router.get("/storage-channels/health")
+def get_storage_channels_health(
+    db: Session = Depends(get_db),
+    _user: User = Depends(get_current_admin),
+) -> dict:
+    data = SystemConfigService(db).list_storage_channel_health()
+    return ok(data.model_dump())
+
+
 @router.put("/storage-channels")
 def update_storage_channels(
     payload: StorageChannelsUpdateRequest,
@@ -0,0 +1,165 @@
+import asyncio
+import logging
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from sqlalchemy import insert
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.models.log import AccessLog
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_DROP = "drop"
+OVERFLOW_BLOCK = "block"
+
+
+@dataclass
+class AccessLogSinkStats:
+    queued: int = 0
+    flushed: int = 0
+    dropped: int = 0
+    failed: int = 0
+    batches: int = 0
+
+
+class AccessLogSink:
+    def __init__(
+        self,
+        *,
+        max_queue_size: int,
+        batch_size: int,
+        flush_interval_ms: int,
+        overflow_policy: str,
+    ) -> None:
+        self.max_queue_size = max(1, max_queue_size)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(10, flush_interval_ms) / 1000
+        self.overflow_policy = (
+            OVERFLOW_BLOCK if overflow_policy.strip().lower() == OVERFLOW_BLOCK else OVERFLOW_DROP
+        )
+        self.stats = AccessLogSinkStats()
+        self._queue: asyncio.Queue[dict[str, Any] | None] | None = None
+        self._writer: asyncio.Task[None] | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._writer is not None and not self._writer.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._writer = asyncio.create_task(self._run(), name="access-log-writer")
+
+    async def stop(self) -> None:
+        if not self.running or self._queue is None or self._writer is None:
+            return
+        # 中文注释：写入哨兵值后等待写入任务把队列中剩余记录全部落库再退出。
+        await self._queue.put(None)
+        await self._writer
+        self._writer = None
+        self._queue = None
+
+    async def submit(self, record: dict[str, Any]) -> None:
+        if not self.running or self._queue is None:
+            # 中文注释：未启动后台写入任务（如脚本或测试直接调用）时退化为同步写入，保证日志不丢。
+            self.stats.queued += 1
+            await run_in_threadpool(self._write_batch, [record])
+            return
+
+        if self.overflow_policy == OVERFLOW_BLOCK:
+            await self._queue.put(record)
+            self.stats.queued += 1
+            return
+
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self.stats.dropped += 1
+            return
+        self.stats.queued += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        data = asdict(self.stats)
+        data["pending"] = self._queue.qsize() if self._queue is not None else 0
+        data["max_queue_size"] = self.max_queue_size
+        data["batch_size"] = self.batch_size
+        data["flush_interval_ms"] = int(self.flush_interval * 1000)
+        data["overflow_policy"] = self.overflow_policy
+        data["running"] = self.running
+        return data
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await queue.get()
+            if first is None:
+                break
+
+            batch = [first]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=timeout)
+                except TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await run_in_threadpool(self._write_batch, batch)
+
+        leftover: list[dict[str, Any]] = []
+        while not queue.empty():
+            item = queue.get_nowait()
+            if item is not None:
+                leftover.append(item)
+        for start in range(0, len(leftover), self.batch_size):
+            await run_in_threadpool(self._write_batch, leftover[start : start + self.batch_size])
+
+    def _write_batch(self, rows: list[dict[str, Any]]) -> None:
+        if not rows:
+            return
+        db = SessionLocal()
+        try:
+            # 中文注释：按批次一次性多行插入，只占用一次 SQLite 写锁。
+            db.execute(insert(AccessLog), rows)
+            db.commit()
+            self.stats.flushed += len(rows)
+            self.stats.batches += 1
+            return
+        except Exception:
+            db.rollback()
+            logger.exception("access log batch write failed, rows=%s", len(rows))
+        finally:
+            db.close()
+
+        if len(rows) > 1:
+            # 中文注释：整批失败时逐条重试，避免单条异常记录（如已删除用户的外键）拖垮整批日志。
+            for row in rows:
+                self._write_batch([row])
+            return
+        self.stats.failed += 1
+
+
+def _build_access_log_sink() -> AccessLogSink:
+    settings = get_settings()
+    return AccessLogSink(
+        max_queue_size=settings.access_log_queue_size,
+        batch_size=settings.access_log_batch_size,
+        flush_interval_ms=settings.access_log_flush_interval_ms,
+        overflow_policy=settings.access_log_overflow,
+    )
+
+
+access_log_sink = _build_access_log_sink()
@@ -0,0 +1,49 @@
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import Request
+from jose import JWTError
+
+from app.core.security import decode_access_token
+
+
+@dataclass(frozen=True)
+class AuthContext:
+    token: str = ""
+    claims: dict[str, Any] | None = None
+
+    @property
+    def authenticated(self) -> bool:
+        return self.claims is not None
+
+    @property
+    def user_id(self) -> int | None:
+        if not self.claims:
+            return None
+        sub = self.claims.get("sub")
+        try:
+            return int(sub) if sub else None
+        except (TypeError, ValueError):
+            return None
+
+
+ANONYMOUS = AuthContext()
+
+
+def get_request_auth(request: Request) -> AuthContext:
+    # 中文注释：同一请求内只解析一次 Bearer 令牌，结果挂在 request.state 上供依赖与中间件复用。
+    cached = getattr(request.state, "auth_context", None)
+    if isinstance(cached, AuthContext):
+        return cached
+
+    context = ANONYMOUS
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    token = token.strip()
+    if scheme.lower() == "bearer" and token:
+        try:
+            context = AuthContext(token=token, claims=decode_access_token(token))
+        except JWTError:
+            context = AuthContext(token=token, claims=None)
+
+    request.state.auth_context = context
+    return context
@@ -0,0 +1,161 @@
+import hashlib
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from uuid import uuid4
+
+CacheKey = tuple[str, ...]
+
+
+@dataclass
+class ByteCacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class ByteLRUCache:
+    def __init__(self, memory_max_bytes: int, disk_dir: str = "", disk_max_bytes: int = 0) -> None:
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self.stats = ByteCacheStats()
+        self._memory: OrderedDict[CacheKey, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: OrderedDict[str, int] = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = Lock()
+        self._disk_dir = Path(disk_dir).resolve() if disk_dir and disk_max_bytes > 0 else None
+        if self._disk_dir is not None:
+            self._load_disk_index()
+
+    def get(self, key: CacheKey) -> bytes | None:
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.stats.memory_hits += 1
+                return data
+        data = self._read_disk(key)
+        with self._lock:
+            if data is None:
+                self.stats.misses += 1
+                return None
+            self.stats.disk_hits += 1
+        # 中文注释：磁盘命中后提升回内存层，热点对象后续直接从内存返回。
+        self._put_memory(key, data)
+        return data
+
+    def put(self, key: CacheKey, data: bytes) -> None:
+        self._put_memory(key, data)
+
+    def invalidate(self, key: CacheKey) -> None:
+        with self._lock:
+            data = self._memory.pop(key, None)
+            if data is not None:
+                self._memory_bytes -= len(data)
+        self._remove_disk(self._disk_name(key))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "memory_items": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_items": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+                "memory_hits": self.stats.memory_hits,
+                "disk_hits": self.stats.disk_hits,
+                "misses": self.stats.misses,
+                "evictions": self.stats.evictions,
+            }
+
+    def _put_memory(self, key: CacheKey, data: bytes) -> None:
+        if len(data) > self.memory_max_bytes:
+            self._write_disk(key, data)
+            return
+        demoted: list[tuple[CacheKey, bytes]] = []
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous)
+            self._memory[key] = data
+            self._memory_bytes += len(data)
+            while self._memory_bytes > self.memory_max_bytes:
+                old_key, old_data = self._memory.popitem(last=False)
+                self._memory_bytes -= len(old_data)
+                self.stats.evictions += 1
+                demoted.append((old_key, old_data))
+        # 中文注释：内存层淘汰的对象降级写入磁盘层，磁盘写入在锁外进行。
+        for old_key, old_data in demoted:
+            self._write_disk(old_key, old_data)
+
+    @staticmethod
+    def _disk_name(key: CacheKey) -> str:
+        return hashlib.sha256("\x00".join(key).encode("utf-8")).hexdigest()
+
+    def _read_disk(self, key: CacheKey) -> bytes | None:
+        if self._disk_dir is None:
+            return None
+        name = self._disk_name(key)
+        with self._lock:
+            if name not in self._disk:
+                return None
+            self._disk.move_to_end(name)
+        try:
+            return (self._disk_dir / name).read_bytes()
+        except OSError:
+            self._remove_disk(name)
+            return None
+
+    def _write_disk(self, key: CacheKey, data: bytes) -> None:
+        if self._disk_dir is None or len(data) > self.disk_max_bytes:
+            return
+        name = self._disk_name(key)
+        target = self._disk_dir / name
+        temp = self._disk_dir / f".{name}.{uuid4().hex}.tmp"
+        try:
+            temp.write_bytes(data)
+            os.replace(temp, target)
+        except OSError:
+            temp.unlink(missing_ok=True)
+            return
+        evicted: list[str] = []
+        with self._lock:
+            previous = self._disk.pop(name, None)
+            if previous is not None:
+                self._disk_bytes -= previous
+            self._disk[name] = len(data)
+            self._disk_bytes += len(data)
+            while self._disk_bytes > self.disk_max_bytes:
+                old_name, old_size = self._disk.popitem(last=False)
+                self._disk_bytes -= old_size
+                evicted.append(old_name)
+        for old_name in evicted:
+            (self._disk_dir / old_name).unlink(missing_ok=True)
+
+    def _remove_disk(self, name: str) -> None:
+        if self._disk_dir is None:
+            return
+        with self._lock:
+            size = self._disk.pop(name, None)
+            if size is not None:
+                self._disk_bytes -= size
+        (self._disk_dir / name).unlink(missing_ok=True)
+
+    def _load_disk_index(self) -> None:
+        self._disk_dir.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for path in self._disk_dir.iterdir():
+            if not path.is_file():
+                continue
+            if path.name.startswith("."):
+                path.unlink(missing_ok=True)
+                continue
+            stat = path.stat()
+            entries.append((stat.st_mtime, path.name, stat.st_size))
+        # 中文注释：重启后按文件修改时间恢复磁盘层的 LRU 顺序。
+        for _mtime, name, size in sorted(entries):
+            self._disk[name] = size
+            self._disk_bytes += size
@@ -0,0 +1,42 @@
+from fastapi import Request
+
+from app.core.config import get_settings
+from app.core.ip_matcher import IpRangeMatcher, is_ip_address
+
+trusted_proxies = IpRangeMatcher(
+    entry for entry in get_settings().trusted_proxy_ips.split(",") if entry.strip()
+)
+
+
+def get_client_ip(request: Request) -> str:
+    # 中文注释：同一请求内只解析一次，结果挂在 request.state 上供中间件与路由复用。
+    cached = getattr(request.state, "client_ip", None)
+    if isinstance(cached, str):
+        return cached
+    client_ip = resolve_client_ip(
+        request.client.host if request.client else "",
+        request.headers.get("x-forwarded-for", ""),
+        request.headers.get("x-real-ip", ""),
+    )
+    request.state.client_ip = client_ip
+    return client_ip
+
+
+def resolve_client_ip(peer: str, forwarded_for: str, real_ip: str) -> str:
+    # 中文注释：只有直连对端是受信代理时才采信转发头，否则任何人都能伪造来源 IP 绕过限流和黑名单。
+    if peer not in trusted_proxies:
+        return peer
+    # 中文注释：X-Forwarded-For 由各级代理依次追加，最左侧的内容可能是客户端自己填的；
+    # 从右往左跳过受信代理，遇到的第一个非受信地址才是真实客户端。
+    candidate = ""
+    for entry in reversed(forwarded_for.split(",")):
+        address = entry.strip()
+        if not is_ip_address(address):
+            break
+        candidate = address
+        if address not in trusted_proxies:
+            return address
+    if candidate:
+        return candidate
+    real_ip = real_ip.strip()
+    return real_ip if is_ip_address(real_ip) else peer
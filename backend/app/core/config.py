@@ -12,9 +12,49 @@ class Settings(BaseSettings):
     app_env: str = Field(default="dev", alias="APP_ENV")
     secret_key: str = Field(default="please-change-me", alias="SECRET_KEY")
     access_token_expire_minutes: int = Field(default=120, alias="ACCESS_TOKEN_EXPIRE_MINUTES")
+    auth_token_cache_size: int = Field(default=1024, alias="AUTH_TOKEN_CACHE_SIZE")
     frontend_base_url: str = Field(default="http://127.0.0.1:5173", alias="FRONTEND_BASE_URL")
+    trusted_proxy_ips: str = Field(default="127.0.0.1,::1", alias="TRUSTED_PROXY_IPS")
 
     sqlite_path: str = Field(default="./data/qrgift.db", alias="SQLITE_PATH")
+    sqlite_busy_timeout_seconds: float = Field(default=15, alias="SQLITE_BUSY_TIMEOUT_SECONDS")
+
+    access_log_queue_size: int = Field(default=10000, alias="ACCESS_LOG_QUEUE_SIZE")
+    access_log_batch_size: int = Field(default=200, alias="ACCESS_LOG_BATCH_SIZE")
+    access_log_flush_interval_ms: int = Field(default=1000, alias="ACCESS_LOG_FLUSH_INTERVAL_MS")
+    access_log_overflow: str = Field(default="drop", alias="ACCESS_LOG_OVERFLOW")
+
+    access_log_retention_days: int = Field(default=30, alias="ACCESS_LOG_RETENTION_DAYS")
+    claim_log_retention_days: int = Field(default=180, alias="CLAIM_LOG_RETENTION_DAYS")
+    log_retention_interval_seconds: float = Field(
+        default=3600, alias="LOG_RETENTION_INTERVAL_SECONDS"
+    )
+    log_retention_batch_size: int = Field(default=2000, alias="LOG_RETENTION_BATCH_SIZE")
+    log_archive_dir: str = Field(default="./data/log-archive", alias="LOG_ARCHIVE_DIR")
+
+    claim_rate_limit_max_keys: int = Field(default=100000, alias="CLAIM_RATE_LIMIT_MAX_KEYS")
+    claim_rate_limit_persist: bool = Field(default=False, alias="CLAIM_RATE_LIMIT_PERSIST")
+
+    claim_rollup_interval_seconds: float = Field(default=30, alias="CLAIM_ROLLUP_INTERVAL_SECONDS")
+    claim_rollup_batch_size: int = Field(default=20000, alias="CLAIM_ROLLUP_BATCH_SIZE")
+
+    job_workers: int = Field(default=2, alias="JOB_WORKERS")
+    job_temp_dir: str = Field(default="./data/job-tmp", alias="JOB_TEMP_DIR")
+
+    csv_import_chunk_size: int = Field(default=2000, alias="CSV_IMPORT_CHUNK_SIZE")
+    csv_import_max_errors: int = Field(default=200, alias="CSV_IMPORT_MAX_ERRORS")
+
+    qr_decode_workers: int = Field(default=2, alias="QR_DECODE_WORKERS")
+    qr_decode_timeout_seconds: float = Field(default=10, alias="QR_DECODE_TIMEOUT_SECONDS")
+
+    gift_batch_max_count: int = Field(default=10000, alias="GIFT_BATCH_MAX_COUNT")
+    gift_batch_chunk_size: int = Field(default=500, alias="GIFT_BATCH_CHUNK_SIZE")
+    gift_render_workers: int = Field(default=2, alias="GIFT_RENDER_WORKERS")
+    gift_upload_workers: int = Field(default=8, alias="GIFT_UPLOAD_WORKERS")
+    gift_export_max_count: int = Field(default=20000, alias="GIFT_EXPORT_MAX_COUNT")
+    gift_export_workers: int = Field(default=8, alias="GIFT_EXPORT_WORKERS")
+    gift_export_pdf_columns: int = Field(default=4, alias="GIFT_EXPORT_PDF_COLUMNS")
+    gift_export_pdf_rows: int = Field(default=5, alias="GIFT_EXPORT_PDF_ROWS")
 
     storage_provider: str = Field(default="local", alias="STORAGE_PROVIDER")
     storage_bucket: str = Field(default="qrgift", alias="STORAGE_BUCKET")
@@ -22,6 +62,22 @@ class Settings(BaseSettings):
     storage_prefix: str = Field(default="", alias="STORAGE_PREFIX")
     local_storage_dir: str = Field(default="./data/object-storage", alias="LOCAL_STORAGE_DIR")
 
+    qrcode_png_compress_level: int = Field(default=6, alias="QRCODE_PNG_COMPRESS_LEVEL")
+    qrcode_render_mode: str = Field(default="stored", alias="QRCODE_RENDER_MODE")
+    qrcode_cache_memory_bytes: int = Field(
+        default=64 * 1024 * 1024, alias="QRCODE_CACHE_MEMORY_BYTES"
+    )
+    qrcode_cache_disk_dir: str = Field(default="", alias="QRCODE_CACHE_DISK_DIR")
+    qrcode_cache_disk_bytes: int = Field(default=512 * 1024 * 1024, alias="QRCODE_CACHE_DISK_BYTES")
+
+    storage_breaker_failure_threshold: int = Field(
+        default=3, alias="STORAGE_BREAKER_FAILURE_THRESHOLD"
+    )
+    storage_breaker_cooldown_seconds: float = Field(
+        default=30, alias="STORAGE_BREAKER_COOLDOWN_SECONDS"
+    )
+    storage_latency_ewma_alpha: float = Field(default=0.2, alias="STORAGE_LATENCY_EWMA_ALPHA")
+
     minio_endpoint: str = Field(default="127.0.0.1:9000", alias="MINIO_ENDPOINT")
     minio_access_key: str = Field(default="minioadmin", alias="MINIO_ACCESS_KEY")
     minio_secret_key: str = Field(default="minioadmin", alias="MINIO_SECRET_KEY")
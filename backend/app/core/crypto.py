@@ -1,12 +1,15 @@
 import base64
 import hashlib
+from functools import lru_cache
 
 from cryptography.fernet import Fernet
 
 from app.core.config import get_settings
 
 
+@lru_cache(maxsize=1)
 def _build_fernet() -> Fernet:
+    # 中文注释：密钥只由进程内固定的 SECRET_KEY 派生，构造一次即可复用。
     settings = get_settings()
     digest = hashlib.sha256(settings.secret_key.encode("utf-8")).digest()
     key = base64.urlsafe_b64encode(digest)
@@ -11,7 +11,7 @@ settings = get_settings()
 
 engine = create_engine(
     settings.sqlite_url,
-    connect_args={"check_same_thread": False},
+    connect_args={"check_same_thread": False, "timeout": settings.sqlite_busy_timeout_seconds},
     pool_pre_ping=True,
 )
 
@@ -1,34 +1,29 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 
-from app.core.config import get_settings
+from app.core.auth_context import get_request_auth
 from app.core.database import get_db
 from app.models.user import User
 from app.repositories.user_repository import UserRepository
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
-settings = get_settings()
 
 
 def get_current_user(
-    token: str = Depends(oauth2_scheme),
+    request: Request,
+    _token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db),
 ) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="认证信息无效",
     )
-    try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
-        user_id: str | None = payload.get("sub")
-        if not user_id:
-            raise credentials_exception
-    except JWTError as exc:
-        raise credentials_exception from exc
+    user_id = get_request_auth(request).user_id
+    if user_id is None:
+        raise credentials_exception
 
-    user = UserRepository(db).get_by_id(int(user_id))
+    user = UserRepository(db).get_by_id(user_id)
     if not user:
         raise credentials_exception
     return user
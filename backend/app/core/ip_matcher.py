@@ -0,0 +1,106 @@
+import ipaddress
+import socket
+from bisect import bisect_right
+from collections.abc import Iterable
+
+_IPV4_MAPPED_PREFIX = b"\x00" * 10 + b"\xff\xff"
+
+
+class IpRangeMatcher:
+    def __init__(self, entries: Iterable[str] = ()) -> None:
+        ranges: dict[int, list[tuple[int, int]]] = {4: [], 6: []}
+        for entry in entries:
+            version, start, end = _parse_range(entry)
+            ranges[version].append((start, end))
+        # 中文注释：每个地址族编译成按起点排序、互不重叠的区间表，查询时二分定位，
+        # 十万条网段也只需约 17 次比较，且与规则条数几乎无关。
+        self._starts: dict[int, list[int]] = {}
+        self._ends: dict[int, list[int]] = {}
+        for version, items in ranges.items():
+            starts, ends = self._merge(items)
+            self._starts[version] = starts
+            self._ends[version] = ends
+        self.range_count = sum(len(starts) for starts in self._starts.values())
+
+    def __contains__(self, ip: str) -> bool:
+        return self.match(ip)
+
+    def __len__(self) -> int:
+        return self.range_count
+
+    def match(self, ip: str) -> bool:
+        if not self.range_count or not ip:
+            return False
+        parsed = _parse_address(ip)
+        if parsed is None:
+            return False
+        version, value = parsed
+        index = bisect_right(self._starts[version], value) - 1
+        return index >= 0 and value <= self._ends[version][index]
+
+    @staticmethod
+    def _merge(items: list[tuple[int, int]]) -> tuple[list[int], list[int]]:
+        starts: list[int] = []
+        ends: list[int] = []
+        for start, end in sorted(items):
+            # 中文注释：相交或首尾相接的网段合并为一个区间，保证二分结果唯一。
+            if ends and start <= ends[-1] + 1:
+                ends[-1] = max(ends[-1], end)
+                continue
+            starts.append(start)
+            ends.append(end)
+        return starts, ends
+
+
+def is_ip_address(value: str) -> bool:
+    return bool(value) and _parse_address(value) is not None
+
+
+def _parse_address(ip: str) -> tuple[int, int] | None:
+    # 中文注释：热路径用 inet_pton 直接得到字节，比 ipaddress 对象构造快一个数量级。
+    try:
+        return 4, int.from_bytes(socket.inet_pton(socket.AF_INET, ip), "big")
+    except OSError:
+        pass
+    try:
+        packed = socket.inet_pton(socket.AF_INET6, ip)
+    except OSError:
+        try:
+            address = ipaddress.ip_address(ip.strip())
+        except ValueError:
+            return None
+        packed = address.packed
+        if address.version == 4:
+            return 4, int.from_bytes(packed, "big")
+    if packed[:12] == _IPV4_MAPPED_PREFIX:
+        return 4, int.from_bytes(packed[12:], "big")
+    return 6, int.from_bytes(packed, "big")
+
+
+def _parse_range(entry: str) -> tuple[int, int, int]:
+    address, _, prefix = entry.strip().partition("/")
+    parsed = _parse_address(address)
+    if parsed is not None and (not prefix or prefix.isdigit()):
+        version, value = parsed
+        bits = 32 if version == 4 else 128
+        # 中文注释：映射地址已在解析时换算成 IPv4，前缀长度需同步扣掉 96 位。
+        length = int(prefix) if prefix else bits
+        if version == 4 and ":" in address:
+            length -= 96
+        if 0 <= length <= bits:
+            host_mask = (1 << (bits - length)) - 1
+            return version, value & ~host_mask, value | host_mask
+    # 中文注释：快速路径处理不了的写法交给 ipaddress 解析，格式错误时由它抛出 ValueError。
+    network = parse_ip_network(entry)
+    return network.version, int(network.network_address), int(network.broadcast_address)
+
+
+def parse_ip_network(value: str) -> ipaddress.IPv4Network | ipaddress.IPv6Network:
+    network = ipaddress.ip_network(value.strip(), strict=False)
+    if network.version == 6 and network.network_address.ipv4_mapped is not None:
+        # 中文注释：::ffff:a.b.c.d 形式的映射网段按 IPv4 处理，与查询时的地址换算保持一致。
+        if network.prefixlen >= 96:
+            return ipaddress.ip_network(
+                f"{network.network_address.ipv4_mapped}/{network.prefixlen - 96}"
+            )
+    return network
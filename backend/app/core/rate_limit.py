@@ -0,0 +1,122 @@
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+
+
+@dataclass
+class WindowCounter:
+    window_start: int
+    previous_count: int = 0
+    current_count: int = 0
+
+
+@dataclass
+class RateLimitStats:
+    allowed: int = 0
+    limited: int = 0
+    evictions: int = 0
+
+
+class SlidingWindowLimiter:
+    def __init__(self, window_seconds: int, max_keys: int) -> None:
+        self.window_seconds = max(1, window_seconds)
+        self.max_keys = max(1, max_keys)
+        self.stats = RateLimitStats()
+        self._counters: OrderedDict[str, WindowCounter] = OrderedDict()
+        self._lock = Lock()
+
+    def hit(self, key: str, limit: int, now: float | None = None) -> int:
+        # 中文注释：滑动窗口计数器，每个键只保存上一窗口与当前窗口两个计数，
+        # 按当前窗口已过去的比例折算上一窗口的请求数，判定为 O(1) 且内存固定。
+        # 返回 0 表示放行，否则返回建议的重试等待秒数；被拒绝的请求不计入窗口。
+        now = time.time() if now is None else now
+        window_start = int(now // self.window_seconds) * self.window_seconds
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                counter = WindowCounter(window_start=window_start)
+                self._counters[key] = counter
+                if len(self._counters) > self.max_keys:
+                    self._counters.popitem(last=False)
+                    self.stats.evictions += 1
+            else:
+                self._counters.move_to_end(key)
+                self._roll(counter, window_start)
+
+            elapsed = (now - window_start) / self.window_seconds
+            estimated = counter.previous_count * (1 - elapsed) + counter.current_count
+            if estimated + 1 <= limit:
+                counter.current_count += 1
+                self.stats.allowed += 1
+                return 0
+            self.stats.limited += 1
+            return self._retry_after(counter, limit, now, window_start)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "window_seconds": self.window_seconds,
+                "tracked_keys": len(self._counters),
+                "max_keys": self.max_keys,
+                "allowed": self.stats.allowed,
+                "limited": self.stats.limited,
+                "evictions": self.stats.evictions,
+            }
+
+    def export_state(self, now: float | None = None) -> list[tuple[str, int, int, int]]:
+        now = time.time() if now is None else now
+        window_start = int(now // self.window_seconds) * self.window_seconds
+        with self._lock:
+            rows = []
+            for key, counter in self._counters.items():
+                self._roll(counter, window_start)
+                if counter.previous_count or counter.current_count:
+                    rows.append(
+                        (key, counter.window_start, counter.previous_count, counter.current_count)
+                    )
+            return rows
+
+    def load_state(self, rows: list[tuple[str, int, int, int]], now: float | None = None) -> None:
+        now = time.time() if now is None else now
+        window_start = int(now // self.window_seconds) * self.window_seconds
+        with self._lock:
+            for key, row_window_start, previous_count, current_count in rows[-self.max_keys :]:
+                counter = WindowCounter(
+                    window_start=int(row_window_start),
+                    previous_count=int(previous_count),
+                    current_count=int(current_count),
+                )
+                self._roll(counter, window_start)
+                if counter.previous_count or counter.current_count:
+                    self._counters[key] = counter
+                    self._counters.move_to_end(key)
+            while len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+    def _roll(self, counter: WindowCounter, window_start: int) -> None:
+        if counter.window_start == window_start:
+            return
+        if counter.window_start == window_start - self.window_seconds:
+            counter.previous_count = counter.current_count
+        else:
+            counter.previous_count = 0
+        counter.current_count = 0
+        counter.window_start = window_start
+
+    def _retry_after(
+        self, counter: WindowCounter, limit: int, now: float, window_start: int
+    ) -> int:
+        window_end = window_start + self.window_seconds
+        if counter.previous_count and counter.current_count + 1 <= limit:
+            # 中文注释：当前窗口尚有余量时，等上一窗口的折算权重衰减到刚好放行即可。
+            ratio = 1 - (limit - 1 - counter.current_count) / counter.previous_count
+            wait = window_start + ratio * self.window_seconds - now
+        else:
+            wait = window_end - now
+        return max(1, math.ceil(wait))
@@ -1,7 +1,10 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 import hashlib
 import hmac
 import secrets
+from threading import Lock
+import time
 from typing import Any
 
 from jose import jwt
@@ -50,6 +53,60 @@ def create_access_token(subject: str, expires_minutes: int | None = None, **extr
     return jwt.encode(payload, settings.secret_key, algorithm="HS256")
 
 
+class TokenClaimsCache:
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max(0, max_entries)
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        if not self.max_entries:
+            return None
+        key = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, claims = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def put(self, token: str, claims: dict[str, Any]) -> None:
+        exp = claims.get("exp")
+        # 中文注释：缓存有效期以令牌自身的 exp 为上限，没有 exp 的令牌不缓存。
+        if not self.max_entries or not isinstance(exp, (int, float)):
+            return
+        key = self._digest(token)
+        with self._lock:
+            self._entries[key] = (float(exp), claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+access_token_cache = TokenClaimsCache(settings.auth_token_cache_size)
+
+
+def decode_access_token(token: str) -> dict[str, Any]:
+    cached = access_token_cache.get(token)
+    if cached is not None:
+        return cached
+    claims = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
+    access_token_cache.put(token, claims)
+    return claims
+
+
 def hash_gift_token(token: str) -> str:
     base = f"{settings.secret_key}:{token}"
     return hashlib.sha256(base.encode("utf-8")).hexdigest()
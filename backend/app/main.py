@@ -1,30 +1,86 @@
 import time
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
 from pathlib import Path
 
-from fastapi import FastAPI
-from fastapi import HTTPException
-from fastapi import Request
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
-from jose import JWTError, jwt
 
 from app.api.auth import router as auth_router
 from app.api.dashboard import router as dashboard_router
 from app.api.gift import router as gift_router
+from app.api.jobs import router as jobs_router
 from app.api.logs import router as logs_router
 from app.api.red_packet import router as red_packet_router
 from app.api.redirect import router as redirect_router
 from app.api.security import router as security_router
 from app.api.system_config import router as system_config_router
+from app.core.access_log import access_log_sink
+from app.core.auth_context import get_request_auth
+from app.core.client_ip import get_client_ip
 from app.core.config import get_settings
-from app.core.database import SessionLocal
 from app.core.response import ok
-from app.models.log import AccessLog
+from app.services.claim_rollup import claim_rollup_aggregator
+from app.services.job_runner import job_runner
+from app.services.log_retention import log_retention_worker
+from app.services.qr_decode import shutdown_decode_pool
+from app.services.qr_render import shutdown_render_pool
+from app.services.security_service import claim_access_guard, warm_security_rules
 
 settings = get_settings()
 
-app = FastAPI(title=settings.app_name)
+# 中文注释：前端静态资源由 SPA 兜底路由直接返回，不写访问日志，
+# 避免每次打开页面灌入几十条无意义记录。
+STATIC_ASSET_PREFIXES = ("/assets/",)
+STATIC_ASSET_SUFFIXES = (
+    ".js",
+    ".css",
+    ".map",
+    ".ico",
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".gif",
+    ".svg",
+    ".webp",
+    ".woff",
+    ".woff2",
+    ".ttf",
+    ".txt",
+    ".webmanifest",
+)
+
+
+def _is_static_asset(path: str) -> bool:
+    if path.startswith(("/api/", "/r/", "/claim/")):
+        return False
+    return path.startswith(STATIC_ASSET_PREFIXES) or path.lower().endswith(STATIC_ASSET_SUFFIXES)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    await access_log_sink.start()
+    job_runner.start()
+    warm_security_rules()
+    claim_access_guard.restore()
+    await claim_rollup_aggregator.start()
+    await log_retention_worker.start()
+    try:
+        yield
+    finally:
+        # 中文注释：进程退出前把队列里尚未落库的访问日志全部刷盘。
+        await access_log_sink.stop()
+        await claim_rollup_aggregator.stop()
+        await log_retention_worker.stop()
+        job_runner.shutdown()
+        claim_access_guard.persist()
+        shutdown_render_pool()
+        shutdown_decode_pool()
+
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -37,40 +93,31 @@ app.add_middleware(
 
 @app.middleware("http")
 async def access_log_middleware(request: Request, call_next):
+    if _is_static_asset(request.url.path):
+        return await call_next(request)
     start = time.perf_counter()
     response = await call_next(request)
     latency = int((time.perf_counter() - start) * 1000)
 
-    user_id = None
-    auth_header = request.headers.get("authorization", "")
-    if auth_header.startswith("Bearer "):
-        token = auth_header[7:]
-        try:
-            payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
-            sub = payload.get("sub")
-            user_id = int(sub) if sub else None
-        except (JWTError, ValueError):
-            user_id = None
+    user_id = get_request_auth(request).user_id
 
     source = "scan" if request.url.path.startswith("/r/") else "admin"
 
-    db = SessionLocal()
-    try:
-        db.add(
-            AccessLog(
-                user_id=user_id,
-                source=source,
-                path=request.url.path,
-                method=request.method,
-                ip=request.client.host if request.client else "",
-                ua=request.headers.get("user-agent", "")[:255],
-                status_code=response.status_code,
-                latency_ms=latency,
-            )
-        )
-        db.commit()
-    finally:
-        db.close()
+    now = datetime.now(tz=UTC)
+    await access_log_sink.submit(
+        {
+            "user_id": user_id,
+            "source": source,
+            "path": request.url.path[:255],
+            "method": request.method,
+            "ip": get_client_ip(request),
+            "ua": request.headers.get("user-agent", "")[:255],
+            "status_code": response.status_code,
+            "latency_ms": latency,
+            "created_at": now,
+            "updated_at": now,
+        }
+    )
 
     return response
 
@@ -87,6 +134,7 @@ app.include_router(security_router)
 app.include_router(system_config_router)
 app.include_router(logs_router)
 app.include_router(dashboard_router)
+app.include_router(jobs_router)
 app.include_router(redirect_router)
 
 
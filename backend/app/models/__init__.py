@@ -1,7 +1,15 @@
 from app.models.base import Base
 from app.models.binding import Binding
 from app.models.gift import GiftBinding, GiftClaimLog, GiftQrcode
-from app.models.log import AccessLog, ClaimLog, OperationLog, SecurityRule
+from app.models.job import Job
+from app.models.log import (
+    AccessLog,
+    ClaimLog,
+    LogArchivePart,
+    OperationLog,
+    RateLimitWindow,
+    SecurityRule,
+)
 from app.models.qrcode import Qrcode, QrcodeBatch
 from app.models.red_packet import (
     RedPacket,
@@ -10,6 +18,7 @@ from app.models.red_packet import (
     RedPacketTag,
     RedPacketTagBinding,
 )
+from app.models.stats import ClaimHourlyRollup, RollupWatermark, StatsCounter
 from app.models.system_config import SystemConfig
 from app.models.user import User
 
@@ -25,6 +34,9 @@ __all__ = [
     "RedPacketTagBinding",
     "Binding",
     "SystemConfig",
+    "StatsCounter",
+    "ClaimHourlyRollup",
+    "RollupWatermark",
     "GiftQrcode",
     "GiftBinding",
     "GiftClaimLog",
@@ -32,4 +44,7 @@ __all__ = [
     "ClaimLog",
     "OperationLog",
     "SecurityRule",
+    "RateLimitWindow",
+    "LogArchivePart",
+    "Job",
 ]
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, UniqueConstraint
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base, TimestampMixin
@@ -8,11 +8,14 @@ from app.models.base import Base, TimestampMixin
 
 class GiftQrcode(Base, TimestampMixin):
     __tablename__ = "gift_qrcodes"
-    __table_args__ = (UniqueConstraint("token_hash", name="uq_gift_qrcodes_token_hash"),)
+    __table_args__ = (
+        UniqueConstraint("token_hash", name="uq_gift_qrcodes_token_hash"),
+        Index("ix_gift_qrcodes_status_id", "status", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    title: Mapped[str] = mapped_column(String(100), default="")
-    status: Mapped[str] = mapped_column(String(20), index=True, default="draft")
+    title: Mapped[str] = mapped_column(String(100), default="", index=True)
+    status: Mapped[str] = mapped_column(String(20), default="draft")
     token_plain: Mapped[str] = mapped_column(String(128), default="", index=True)
     token_hash: Mapped[str] = mapped_column(String(128), index=True)
     activate_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -45,6 +48,7 @@ class GiftBinding(Base, TimestampMixin):
 
 class GiftClaimLog(Base, TimestampMixin):
     __tablename__ = "gift_claim_logs"
+    __table_args__ = (Index("ix_gift_claim_logs_created_at", "created_at"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     gift_qrcode_id: Mapped[int] = mapped_column(
@@ -54,7 +58,7 @@ class GiftClaimLog(Base, TimestampMixin):
         ForeignKey("red_packets.id", ondelete="SET NULL"), nullable=True, index=True
     )
     dispatch_strategy: Mapped[str] = mapped_column(String(20), default="")
-    ip: Mapped[str] = mapped_column(String(64), default="")
+    ip: Mapped[str] = mapped_column(String(64), default="", index=True)
     ua: Mapped[str] = mapped_column(String(255), default="")
     result: Mapped[str] = mapped_column(String(30), index=True)
     reason: Mapped[str] = mapped_column(String(255), default="")
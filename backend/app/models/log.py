@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, Index, String, Text
+from sqlalchemy import ForeignKey, Index, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base, TimestampMixin
@@ -18,6 +18,7 @@ class ClaimLog(Base, TimestampMixin):
 
 class OperationLog(Base, TimestampMixin):
     __tablename__ = "operation_logs"
+    __table_args__ = (Index("ix_operation_logs_created_at", "created_at"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_id: Mapped[int | None] = mapped_column(
@@ -35,8 +36,18 @@ class SecurityRule(Base, TimestampMixin):
     rule_value: Mapped[str] = mapped_column(Text, default="")
 
 
+class RateLimitWindow(Base):
+    __tablename__ = "rate_limit_windows"
+
+    bucket_key: Mapped[str] = mapped_column(String(128), primary_key=True)
+    window_start: Mapped[int] = mapped_column(default=0)
+    previous_count: Mapped[int] = mapped_column(default=0)
+    current_count: Mapped[int] = mapped_column(default=0)
+
+
 class AccessLog(Base, TimestampMixin):
     __tablename__ = "access_logs"
+    __table_args__ = (Index("ix_access_logs_created_at", "created_at"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_id: Mapped[int | None] = mapped_column(
@@ -45,7 +56,24 @@ class AccessLog(Base, TimestampMixin):
     source: Mapped[str] = mapped_column(String(20), index=True, default="admin")
     path: Mapped[str] = mapped_column(String(255), index=True)
     method: Mapped[str] = mapped_column(String(10), default="GET")
-    ip: Mapped[str] = mapped_column(String(64), default="")
+    ip: Mapped[str] = mapped_column(String(64), default="", index=True)
     ua: Mapped[str] = mapped_column(String(255), default="")
     status_code: Mapped[int] = mapped_column(index=True)
     latency_ms: Mapped[int] = mapped_column(default=0)
+
+
+class LogArchivePart(Base, TimestampMixin):
+    __tablename__ = "log_archive_parts"
+    __table_args__ = (
+        Index("ix_log_archive_parts_table_day", "table_name", "day"),
+        UniqueConstraint("table_name", "day", "filename", name="uq_log_archive_parts_file"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    table_name: Mapped[str] = mapped_column(String(40))
+    day: Mapped[str] = mapped_column(String(10))
+    filename: Mapped[str] = mapped_column(String(64))
+    first_id: Mapped[int] = mapped_column(default=0)
+    last_id: Mapped[int] = mapped_column(default=0)
+    row_count: Mapped[int] = mapped_column(default=0)
+    byte_size: Mapped[int] = mapped_column(default=0)
@@ -4,6 +4,7 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
@@ -25,11 +26,17 @@ class RedPacketBatch(Base, TimestampMixin):
 
 class RedPacket(Base, TimestampMixin):
     __tablename__ = "red_packets"
+    __table_args__ = (
+        Index("ix_red_packets_status_id", "status", "id"),
+        Index("ix_red_packets_category_id_id", "category_id", "id"),
+        Index("ix_red_packets_level_id", "level", "id"),
+        Index("ix_red_packets_amount", "amount"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     batch_id: Mapped[int] = mapped_column(ForeignKey("red_packet_batches.id", ondelete="CASCADE"))
     title: Mapped[str] = mapped_column(String(120), default="")
-    category_id: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)
+    category_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
     amount: Mapped[float] = mapped_column(Numeric(10, 2))
     level: Mapped[int] = mapped_column(Integer, default=1)
     content_type: Mapped[str] = mapped_column(String(20), default="url")
@@ -38,7 +45,7 @@ class RedPacket(Base, TimestampMixin):
     content_image_key: Mapped[str] = mapped_column(String(255), default="")
     meta_json: Mapped[str] = mapped_column(Text, default="{}")
     claim_url: Mapped[str] = mapped_column(String(800))
-    status: Mapped[str] = mapped_column(String(20), default="idle", index=True)
+    status: Mapped[str] = mapped_column(String(20), default="idle")
     available_from: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     available_to: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
@@ -62,12 +69,13 @@ class RedPacketTag(Base, TimestampMixin):
 
 class RedPacketTagBinding(Base, TimestampMixin):
     __tablename__ = "red_packet_tag_bindings"
-    __table_args__ = (UniqueConstraint("red_packet_id", "tag_id", name="uq_red_packet_tag_pair"),)
+    __table_args__ = (
+        UniqueConstraint("red_packet_id", "tag_id", name="uq_red_packet_tag_pair"),
+        Index("ix_red_packet_tag_bindings_tag_id_red_packet_id", "tag_id", "red_packet_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     red_packet_id: Mapped[int] = mapped_column(
         ForeignKey("red_packets.id", ondelete="CASCADE"), index=True
     )
-    tag_id: Mapped[int] = mapped_column(
-        ForeignKey("red_packet_tags.id", ondelete="CASCADE"), index=True
-    )
+    tag_id: Mapped[int] = mapped_column(ForeignKey("red_packet_tags.id", ondelete="CASCADE"))
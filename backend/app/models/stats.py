@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class StatsCounter(Base):
+    __tablename__ = "stats_counters"
+
+    scope: Mapped[str] = mapped_column(String(40), primary_key=True)
+    bucket: Mapped[str] = mapped_column(String(20), primary_key=True, default="")
+    name: Mapped[str] = mapped_column(String(40), primary_key=True)
+    value: Mapped[int] = mapped_column(default=0)
+
+
+class ClaimHourlyRollup(Base):
+    __tablename__ = "claim_hourly_rollups"
+
+    # 中文注释：小时桶以 UTC 整点表示，按时区出图时再换算到本地日期。
+    hour: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    result: Mapped[str] = mapped_column(String(30), primary_key=True)
+    reason: Mapped[str] = mapped_column(String(255), primary_key=True, default="")
+    dispatch_strategy: Mapped[str] = mapped_column(String(20), primary_key=True, default="")
+    claims: Mapped[int] = mapped_column(default=0)
+
+
+class RollupWatermark(Base):
+    __tablename__ = "rollup_watermarks"
+
+    name: Mapped[str] = mapped_column(String(40), primary_key=True)
+    last_id: Mapped[int] = mapped_column(default=0)
+    updated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
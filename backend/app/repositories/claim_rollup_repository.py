@@ -0,0 +1,71 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.gift import GiftClaimLog
+from app.models.stats import ClaimHourlyRollup
+
+CLAIM_ROLLUP_WATERMARK = "claim_hourly"
+
+# 中文注释：与 SQLAlchemy 在 SQLite 中存储 DateTime 的文本格式一致，
+# 汇总表可直接按 datetime 读写和比较。
+HOUR_FORMAT = "%Y-%m-%d %H:00:00.000000"
+
+ROLLUP_KEY_COLUMNS = ["hour", "result", "reason", "dispatch_strategy"]
+
+
+class ClaimRollupRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def next_batch_end(self, after_id: int, batch_size: int) -> int | None:
+        # 中文注释：沿主键取第 batch_size 条日志的 id 作为本批上界，不足一批时取当前最大 id。
+        batch_end = self.db.scalar(
+            select(GiftClaimLog.id)
+            .where(GiftClaimLog.id > after_id)
+            .order_by(GiftClaimLog.id)
+            .offset(batch_size - 1)
+            .limit(1)
+        )
+        if batch_end is not None:
+            return batch_end
+        return self.db.scalar(select(func.max(GiftClaimLog.id)).where(GiftClaimLog.id > after_id))
+
+    def rollup_range(self, after_id: int, upto_id: int) -> None:
+        hour = func.coalesce(
+            func.strftime(HOUR_FORMAT, GiftClaimLog.created_at), func.strftime(HOUR_FORMAT, "now")
+        )
+        keys = (hour, GiftClaimLog.result, GiftClaimLog.reason, GiftClaimLog.dispatch_strategy)
+        source = (
+            select(*keys, func.count())
+            .where(GiftClaimLog.id > after_id, GiftClaimLog.id <= upto_id)
+            .group_by(*keys)
+        )
+        stmt = sqlite_insert(ClaimHourlyRollup).from_select([*ROLLUP_KEY_COLUMNS, "claims"], source)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=ROLLUP_KEY_COLUMNS,
+            set_={"claims": ClaimHourlyRollup.claims + stmt.excluded.claims},
+        )
+        self.db.execute(stmt)
+
+    def hourly_totals(self, since: datetime) -> list[tuple[datetime, str, int]]:
+        total = func.sum(ClaimHourlyRollup.claims)
+        stmt = (
+            select(ClaimHourlyRollup.hour, ClaimHourlyRollup.result, total)
+            .where(ClaimHourlyRollup.hour >= since)
+            .group_by(ClaimHourlyRollup.hour, ClaimHourlyRollup.result)
+        )
+        return [(hour, result, int(count)) for hour, result, count in self.db.execute(stmt).all()]
+
+    def totals_by(self, column: Any, result: str, since: datetime) -> list[tuple[str, int]]:
+        total = func.sum(ClaimHourlyRollup.claims)
+        stmt = (
+            select(column, total)
+            .where(ClaimHourlyRollup.hour >= since, ClaimHourlyRollup.result == result)
+            .group_by(column)
+            .order_by(total.desc())
+        )
+        return [(value, int(count)) for value, count in self.db.execute(stmt).all()]
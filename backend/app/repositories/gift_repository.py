@@ -1,4 +1,7 @@
-from sqlalchemy import select
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import and_, func, insert, or_, select, update
 from sqlalchemy.orm import Session
 
 from app.models.gift import GiftBinding, GiftQrcode
@@ -43,10 +46,76 @@ class GiftRepository:
         self.db.flush()
         return gift
 
-    def list_gifts(self, limit: int = 100) -> list[GiftQrcode]:
-        stmt = select(GiftQrcode).order_by(GiftQrcode.id.desc()).limit(limit)
+    def bulk_create_gifts(self, rows: list[dict[str, Any]]) -> list[int]:
+        if not rows:
+            return []
+        stmt = insert(GiftQrcode).returning(GiftQrcode.id, sort_by_parameter_order=True)
+        return list(self.db.scalars(stmt, rows).all())
+
+    def list_gifts(
+        self,
+        *,
+        after_id: int | None = None,
+        limit: int = 50,
+        status: str = "",
+        title_prefix: str = "",
+        activate_from: datetime | None = None,
+        activate_to: datetime | None = None,
+        expire_from: datetime | None = None,
+        expire_to: datetime | None = None,
+    ) -> list[GiftQrcode]:
+        # 中文注释：按 id 倒序做游标分页，翻到多深都只扫描一页的数据，不再依赖 OFFSET。
+        stmt = select(GiftQrcode)
+        if after_id is not None:
+            stmt = stmt.where(GiftQrcode.id < after_id)
+        if status:
+            stmt = stmt.where(GiftQrcode.status == status)
+        if title_prefix:
+            # 中文注释：前缀用区间比较而非 LIKE，SQLite 的 LIKE 默认不区分大小写，无法走标题索引。
+            stmt = stmt.where(
+                GiftQrcode.title >= title_prefix, GiftQrcode.title < title_prefix + "\U0010ffff"
+            )
+        if activate_from is not None:
+            stmt = stmt.where(GiftQrcode.activate_at >= activate_from)
+        if activate_to is not None:
+            stmt = stmt.where(GiftQrcode.activate_at <= activate_to)
+        if expire_from is not None:
+            stmt = stmt.where(GiftQrcode.expire_at >= expire_from)
+        if expire_to is not None:
+            stmt = stmt.where(GiftQrcode.expire_at <= expire_to)
+        stmt = stmt.order_by(GiftQrcode.id.desc()).limit(limit)
         return list(self.db.scalars(stmt).all())
 
+    def count_active_bindings(self, gift_ids: list[int]) -> dict[int, int]:
+        if not gift_ids:
+            return {}
+        stmt = (
+            select(GiftBinding.gift_qrcode_id, func.count(GiftBinding.id))
+            .where(GiftBinding.gift_qrcode_id.in_(gift_ids), GiftBinding.status == "active")
+            .group_by(GiftBinding.gift_qrcode_id)
+        )
+        return {gift_id: count for gift_id, count in self.db.execute(stmt).all()}
+
+    def list_export_rows(
+        self, *, status: str = "", keyword: str = "", ids: list[int] | None = None, limit: int
+    ) -> list[Any]:
+        # 中文注释：导出只取生成图片所需的列，两万条记录也不必实例化完整 ORM 对象。
+        stmt = select(
+            GiftQrcode.id,
+            GiftQrcode.title,
+            GiftQrcode.token_plain,
+            GiftQrcode.storage_channel_id,
+            GiftQrcode.object_key,
+        )
+        if status:
+            stmt = stmt.where(GiftQrcode.status == status)
+        if keyword:
+            stmt = stmt.where(GiftQrcode.title.contains(keyword))
+        if ids:
+            stmt = stmt.where(GiftQrcode.id.in_(ids))
+        stmt = stmt.order_by(GiftQrcode.id.asc()).limit(limit)
+        return list(self.db.execute(stmt).all())
+
     def get_gift(self, gift_id: int) -> GiftQrcode | None:
         return self.db.get(GiftQrcode, gift_id)
 
@@ -61,6 +130,53 @@ class GiftRepository:
         stmt = select(GiftQrcode).where(GiftQrcode.token_plain == token_plain)
         return self.db.scalar(stmt)
 
+    def resolve_claim_rows(
+        self, token_plain: str, token_hash: str
+    ) -> list[tuple[GiftQrcode, GiftBinding | None, RedPacket | None]]:
+        # 中文注释：一次联表查询同时取出礼物、有效绑定与候选红包，避免领取链路上的 N+1 查询。
+        stmt = (
+            select(GiftQrcode, GiftBinding, RedPacket)
+            .outerjoin(
+                GiftBinding,
+                and_(
+                    GiftBinding.gift_qrcode_id == GiftQrcode.id,
+                    GiftBinding.status == "active",
+                ),
+            )
+            .outerjoin(RedPacket, RedPacket.id == GiftBinding.red_packet_id)
+            .where(or_(GiftQrcode.token_plain == token_plain, GiftQrcode.token_hash == token_hash))
+            .order_by(GiftQrcode.id.asc(), GiftBinding.id.asc())
+        )
+        return [(gift, binding, packet) for gift, binding, packet in self.db.execute(stmt).all()]
+
+    def try_mark_gift_claimed(self, gift_id: int) -> bool:
+        # 中文注释：条件更新即比较并交换，受影响行数为 1 才说明本次请求抢到了领取权。
+        stmt = (
+            update(GiftQrcode)
+            .where(GiftQrcode.id == gift_id, GiftQrcode.status.not_in(("claimed", "disabled")))
+            .values(status="claimed")
+            .execution_options(synchronize_session=False)
+        )
+        return self.db.execute(stmt).rowcount == 1
+
+    def try_mark_packet_claimed(self, red_packet_id: int) -> bool:
+        stmt = (
+            update(RedPacket)
+            .where(RedPacket.id == red_packet_id, RedPacket.status.in_(("idle", "bound")))
+            .values(status="claimed")
+            .execution_options(synchronize_session=False)
+        )
+        return self.db.execute(stmt).rowcount == 1
+
+    def mark_bindings_claimed(self, gift_qrcode_id: int) -> None:
+        stmt = (
+            update(GiftBinding)
+            .where(GiftBinding.gift_qrcode_id == gift_qrcode_id, GiftBinding.status == "active")
+            .values(status="claimed")
+            .execution_options(synchronize_session=False)
+        )
+        self.db.execute(stmt)
+
     def bind_red_packet(self, gift_qrcode_id: int, red_packet_id: int) -> GiftBinding:
         binding = GiftBinding(
             gift_qrcode_id=gift_qrcode_id, red_packet_id=red_packet_id, status="active"
@@ -89,6 +205,34 @@ class GiftRepository:
         stmt = select(RedPacket).where(RedPacket.status == "idle").order_by(RedPacket.id.asc())
         return self.db.scalar(stmt)
 
+    def reserve_idle_red_packets(self, limit: int) -> list[int]:
+        if limit <= 0:
+            return []
+        # 中文注释：用带 RETURNING 的条件更新一次性占用空闲红包，避免先查后改被并发抢占。
+        candidates = (
+            select(RedPacket.id)
+            .where(RedPacket.status == "idle")
+            .order_by(RedPacket.id.asc())
+            .limit(limit)
+        )
+        stmt = (
+            update(RedPacket)
+            .where(RedPacket.id.in_(candidates), RedPacket.status == "idle")
+            .values(status="bound")
+            .returning(RedPacket.id)
+            .execution_options(synchronize_session=False)
+        )
+        return sorted(self.db.scalars(stmt).all())
+
+    def bulk_bind_red_packets(self, pairs: list[tuple[int, int]]) -> None:
+        if not pairs:
+            return
+        rows = [
+            {"gift_qrcode_id": gift_id, "red_packet_id": packet_id, "status": "active"}
+            for gift_id, packet_id in pairs
+        ]
+        self.db.execute(insert(GiftBinding), rows)
+
     def list_idle_red_packets_by_ids(self, ids: list[int]) -> list[RedPacket]:
         if not ids:
             return []
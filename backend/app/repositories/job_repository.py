@@ -0,0 +1,65 @@
+from datetime import UTC, datetime
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models.job import Job
+
+
+class JobRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_job(self, kind: str, params_json: str, user_id: int | None) -> Job:
+        job = Job(kind=kind, status="queued", params_json=params_json, user_id=user_id)
+        self.db.add(job)
+        self.db.flush()
+        return job
+
+    def get_job(self, job_id: int) -> Job | None:
+        return self.db.get(Job, job_id)
+
+    def mark_running(self, job_id: int) -> bool:
+        stmt = (
+            update(Job)
+            .where(Job.id == job_id, Job.status == "queued")
+            .values(status="running", started_at=datetime.now(tz=UTC))
+            .execution_options(synchronize_session=False)
+        )
+        return self.db.execute(stmt).rowcount == 1
+
+    def update_progress(self, job_id: int, *, total: int, done: int, failed: int) -> None:
+        stmt = (
+            update(Job)
+            .where(Job.id == job_id)
+            .values(progress_total=total, progress_done=done, progress_failed=failed)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.execute(stmt)
+
+    def finish(self, job_id: int, *, status: str, result_json: str = "", error: str = "") -> None:
+        stmt = (
+            update(Job)
+            .where(Job.id == job_id)
+            .values(
+                status=status,
+                result_json=result_json,
+                error=error,
+                finished_at=datetime.now(tz=UTC),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.db.execute(stmt)
+
+    def fail_unfinished(self, error: str) -> int:
+        stmt = (
+            update(Job)
+            .where(Job.status.in_(("queued", "running")))
+            .values(status="failed", error=error, finished_at=datetime.now(tz=UTC))
+            .execution_options(synchronize_session=False)
+        )
+        return self.db.execute(stmt).rowcount
+
+    def list_jobs(self, limit: int = 50) -> list[Job]:
+        stmt = select(Job).order_by(Job.id.desc()).limit(limit)
+        return list(self.db.scalars(stmt).all())
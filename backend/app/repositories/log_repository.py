@@ -0,0 +1,244 @@
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import String, cast, column, delete, func, insert, or_, select, table, text
+from sqlalchemy.orm import Session
+
+from app.models.gift import GiftClaimLog
+from app.models.log import AccessLog, LogArchivePart, OperationLog
+
+# 中文注释：trigram 分词至少需要 3 个字符才能命中索引，更短的关键词退回 LIKE 匹配。
+FTS_MIN_KEYWORD_LENGTH = 3
+
+_fts_tables: dict[str, bool] = {}
+
+
+class LogRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def list_access_logs(
+        self,
+        *,
+        limit: int,
+        before_id: int | None = None,
+        keyword: str = "",
+        source: str = "",
+        ip: str = "",
+        status_code: int | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> list[AccessLog]:
+        stmt = select(AccessLog)
+        sort_key = AccessLog.id
+        if keyword:
+            stmt, sort_key = self._apply_keyword(
+                stmt,
+                AccessLog,
+                keyword,
+                [
+                    AccessLog.source,
+                    AccessLog.path,
+                    AccessLog.method,
+                    AccessLog.ip,
+                    cast(AccessLog.status_code, String),
+                ],
+            )
+        if source:
+            stmt = stmt.where(AccessLog.source == source)
+        if ip:
+            stmt = stmt.where(AccessLog.ip == ip)
+        if status_code is not None:
+            stmt = stmt.where(AccessLog.status_code == status_code)
+        stmt = self._created_range(stmt, AccessLog, created_from, created_to)
+        stmt = self._page(stmt, sort_key, before_id, limit)
+        return list(self.db.scalars(stmt).all())
+
+    def list_claim_logs(
+        self,
+        *,
+        limit: int,
+        before_id: int | None = None,
+        keyword: str = "",
+        gift_qrcode_id: int | None = None,
+        result: str = "",
+        ip: str = "",
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> list[GiftClaimLog]:
+        stmt = select(GiftClaimLog)
+        sort_key = GiftClaimLog.id
+        if keyword:
+            stmt, sort_key = self._apply_keyword(
+                stmt,
+                GiftClaimLog,
+                keyword,
+                [
+                    cast(GiftClaimLog.gift_qrcode_id, String),
+                    cast(GiftClaimLog.red_packet_id, String),
+                    GiftClaimLog.dispatch_strategy,
+                    GiftClaimLog.ip,
+                    GiftClaimLog.result,
+                    GiftClaimLog.reason,
+                ],
+            )
+        if gift_qrcode_id is not None:
+            stmt = stmt.where(GiftClaimLog.gift_qrcode_id == gift_qrcode_id)
+        if result:
+            stmt = stmt.where(GiftClaimLog.result == result)
+        if ip:
+            stmt = stmt.where(GiftClaimLog.ip == ip)
+        stmt = self._created_range(stmt, GiftClaimLog, created_from, created_to)
+        stmt = self._page(stmt, sort_key, before_id, limit)
+        return list(self.db.scalars(stmt).all())
+
+    def list_operation_logs(
+        self,
+        *,
+        limit: int,
+        before_id: int | None = None,
+        keyword: str = "",
+        user_id: int | None = None,
+        action: str = "",
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> list[OperationLog]:
+        stmt = select(OperationLog)
+        sort_key = OperationLog.id
+        if keyword:
+            stmt, sort_key = self._apply_keyword(
+                stmt,
+                OperationLog,
+                keyword,
+                [
+                    cast(OperationLog.user_id, String),
+                    OperationLog.action,
+                    OperationLog.detail,
+                ],
+            )
+        if user_id is not None:
+            stmt = stmt.where(OperationLog.user_id == user_id)
+        if action:
+            stmt = stmt.where(OperationLog.action == action)
+        stmt = self._created_range(stmt, OperationLog, created_from, created_to)
+        stmt = self._page(stmt, sort_key, before_id, limit)
+        return list(self.db.scalars(stmt).all())
+
+    def list_expired(
+        self, model: Any, *, cutoff: datetime, limit: int, max_id: int | None = None
+    ) -> list[dict[str, Any]]:
+        # 中文注释：沿 created_at 索引取最早的一批过期日志，写入时间与 id 偶有乱序也不影响清理进度。
+        stmt = (
+            select(model.__table__)
+            .where(model.created_at < _to_utc(cutoff))
+            .order_by(model.created_at)
+            .limit(limit)
+        )
+        if max_id is not None:
+            stmt = stmt.where(model.id <= max_id)
+        return [dict(row) for row in self.db.execute(stmt).mappings()]
+
+    def delete_by_ids(self, model: Any, ids: list[int]) -> int:
+        result = self.db.execute(
+            delete(model).where(model.id.in_(ids)).execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    def add_archive_parts(self, parts: list[dict[str, Any]]) -> None:
+        self.db.execute(insert(LogArchivePart), parts)
+
+    def list_archive_days(self, table_name: str, start: str, end: str) -> list[dict[str, Any]]:
+        stmt = (
+            select(
+                LogArchivePart.day,
+                func.count(),
+                func.sum(LogArchivePart.row_count),
+                func.sum(LogArchivePart.byte_size),
+            )
+            .where(
+                LogArchivePart.table_name == table_name,
+                LogArchivePart.day >= start,
+                LogArchivePart.day <= end,
+            )
+            .group_by(LogArchivePart.day)
+            .order_by(LogArchivePart.day)
+        )
+        return [
+            {"day": day, "parts": parts, "rows": int(rows), "bytes": int(size)}
+            for day, parts, rows, size in self.db.execute(stmt).all()
+        ]
+
+    def list_archive_parts(self, table_name: str, start: str, end: str) -> list[LogArchivePart]:
+        stmt = (
+            select(LogArchivePart)
+            .where(
+                LogArchivePart.table_name == table_name,
+                LogArchivePart.day >= start,
+                LogArchivePart.day <= end,
+            )
+            .order_by(LogArchivePart.day, LogArchivePart.first_id)
+        )
+        return list(self.db.scalars(stmt).all())
+
+    def list_archive_filenames(self, table_name: str) -> set[tuple[str, str]]:
+        stmt = select(LogArchivePart.day, LogArchivePart.filename).where(
+            LogArchivePart.table_name == table_name
+        )
+        return {(day, filename) for day, filename in self.db.execute(stmt).all()}
+
+    def _apply_keyword(self, stmt, model: Any, keyword: str, like_columns: list[Any]):
+        fts_name = f"{model.__tablename__}_fts"
+        if len(keyword) >= FTS_MIN_KEYWORD_LENGTH and self._has_fts_table(fts_name):
+            # 中文注释：关键词作为整体短语交给 FTS5，双引号转义后不会被解析成查询语法。
+            phrase = '"' + keyword.replace('"', '""') + '"'
+            fts = table(fts_name, column("rowid"))
+            stmt = stmt.join(fts, fts.c.rowid == model.id).where(
+                text(f"{fts_name} MATCH :fts_phrase").bindparams(fts_phrase=phrase)
+            )
+            # 中文注释：按全文表的 rowid 倒序排序，SQLite 会由 FTS5 倒序吐出命中行，
+            # 高频词也能凑满一页即停，不必先收集全部命中再排序。
+            return stmt, fts.c.rowid
+        pattern = f"%{keyword}%"
+        return stmt.where(or_(*(item.ilike(pattern) for item in like_columns))), model.id
+
+    def _has_fts_table(self, name: str) -> bool:
+        cached = _fts_tables.get(name)
+        if cached is not None:
+            return cached
+        bind = self.db.get_bind()
+        exists = False
+        if bind.dialect.name == "sqlite":
+            exists = (
+                self.db.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                    {"name": name},
+                ).first()
+                is not None
+            )
+        _fts_tables[name] = exists
+        return exists
+
+    @staticmethod
+    def _page(stmt, sort_key: Any, before_id: int | None, limit: int):
+        # 中文注释：按 id 倒序做游标分页，条件落在排序列上，普通查询走主键区间、
+        # 全文检索走 FTS5 的 rowid 区间，翻到多深都只扫描一页数据。
+        if before_id is not None:
+            stmt = stmt.where(sort_key < before_id)
+        return stmt.order_by(sort_key.desc()).limit(limit)
+
+    @staticmethod
+    def _created_range(
+        stmt, model: Any, created_from: datetime | None, created_to: datetime | None
+    ):
+        # 中文注释：created_at 由数据库以 UTC 写入，查询边界统一换算成 UTC 再比较。
+        if created_from is not None:
+            stmt = stmt.where(model.created_at >= _to_utc(created_from))
+        if created_to is not None:
+            stmt = stmt.where(model.created_at <= _to_utc(created_to))
+        return stmt
+
+
+def _to_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
@@ -1,4 +1,7 @@
-from sqlalchemy import Select, select
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Select, insert, or_, select
 from sqlalchemy.orm import Session
 
 from app.models.gift import GiftBinding
@@ -56,14 +59,60 @@ class RedPacketRepository:
         self.db.flush()
         return item
 
-    def list_items(self, limit: int = 100) -> list[RedPacket]:
-        stmt = (
-            select(RedPacket)
-            .where(RedPacket.status != "deleted")
-            .order_by(RedPacket.id.desc())
-            .limit(limit)
+    def bulk_create_items(self, rows: list[dict[str, Any]]) -> None:
+        if not rows:
+            return
+        # 中文注释：不需要回填主键，直接用 Core 层 executemany，跳过 ORM 逐行 flush 与属性处理。
+        self.db.execute(insert(RedPacket.__table__), rows)
+
+    def list_items(
+        self,
+        *,
+        after_id: int | None = None,
+        limit: int = 50,
+        status: str = "",
+        ids: list[int] | None = None,
+        category_code: str = "",
+        tag: str = "",
+        level: int | None = None,
+        amount_min: float | None = None,
+        amount_max: float | None = None,
+        available_at: datetime | None = None,
+    ) -> list[tuple[RedPacket, RedPacketCategory | None]]:
+        # 中文注释：分类随分页查询一并外连接取回，游标按 id 倒序推进，不再有固定 100 条上限。
+        stmt = select(RedPacket, RedPacketCategory).outerjoin(
+            RedPacketCategory, RedPacketCategory.id == RedPacket.category_id
         )
-        return list(self.db.scalars(stmt).all())
+        if after_id is not None:
+            stmt = stmt.where(RedPacket.id < after_id)
+        if status:
+            stmt = stmt.where(RedPacket.status == status)
+        else:
+            stmt = stmt.where(RedPacket.status != "deleted")
+        if ids:
+            stmt = stmt.where(RedPacket.id.in_(ids))
+        if category_code:
+            stmt = stmt.where(RedPacketCategory.code == category_code)
+        if tag:
+            tagged = (
+                select(RedPacketTagBinding.red_packet_id)
+                .join(RedPacketTag, RedPacketTag.id == RedPacketTagBinding.tag_id)
+                .where(RedPacketTag.name == tag)
+            )
+            stmt = stmt.where(RedPacket.id.in_(tagged))
+        if level is not None:
+            stmt = stmt.where(RedPacket.level == level)
+        if amount_min is not None:
+            stmt = stmt.where(RedPacket.amount >= amount_min)
+        if amount_max is not None:
+            stmt = stmt.where(RedPacket.amount <= amount_max)
+        if available_at is not None:
+            stmt = stmt.where(
+                or_(RedPacket.available_from.is_(None), RedPacket.available_from <= available_at),
+                or_(RedPacket.available_to.is_(None), RedPacket.available_to >= available_at),
+            )
+        stmt = stmt.order_by(RedPacket.id.desc()).limit(limit)
+        return [(packet, category) for packet, category in self.db.execute(stmt).all()]
 
     def get_item(self, red_packet_id: int) -> RedPacket | None:
         return self.db.get(RedPacket, red_packet_id)
@@ -120,13 +169,6 @@ class RedPacketRepository:
             return
         self.db.add(RedPacketTagBinding(red_packet_id=red_packet_id, tag_id=tag_id))
 
-    def get_categories_map(self, category_ids: set[int]) -> dict[int, RedPacketCategory]:
-        if not category_ids:
-            return {}
-        stmt = select(RedPacketCategory).where(RedPacketCategory.id.in_(category_ids))
-        categories = self.db.scalars(stmt).all()
-        return {item.id: item for item in categories}
-
     def get_tags_map(self, red_packet_ids: set[int]) -> dict[int, list[str]]:
         if not red_packet_ids:
             return {}
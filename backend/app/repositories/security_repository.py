@@ -1,7 +1,7 @@
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select
 from sqlalchemy.orm import Session
 
-from app.models.log import SecurityRule
+from app.models.log import RateLimitWindow, SecurityRule
 
 
 class SecurityRepository:
@@ -24,3 +24,29 @@ class SecurityRepository:
             return rule
         rule.rule_value = value
         return rule
+
+    def list_rate_limit_windows(self, since_window_start: int) -> list[tuple[str, int, int, int]]:
+        stmt = select(
+            RateLimitWindow.bucket_key,
+            RateLimitWindow.window_start,
+            RateLimitWindow.previous_count,
+            RateLimitWindow.current_count,
+        ).where(RateLimitWindow.window_start >= since_window_start)
+        return [tuple(row) for row in self.db.execute(stmt).all()]
+
+    def replace_rate_limit_windows(self, rows: list[tuple[str, int, int, int]]) -> None:
+        # 中文注释：镜像表只保存退出时仍在窗口内的计数，整表替换即可，不需要逐行合并。
+        self.db.execute(delete(RateLimitWindow))
+        if rows:
+            self.db.execute(
+                insert(RateLimitWindow),
+                [
+                    {
+                        "bucket_key": key,
+                        "window_start": window_start,
+                        "previous_count": previous_count,
+                        "current_count": current_count,
+                    }
+                    for key, window_start, previous_count, current_count in rows
+                ],
+            )
@@ -0,0 +1,112 @@
+from datetime import date, timedelta
+
+from sqlalchemy import and_, delete, func, insert, literal, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.gift import GiftBinding, GiftClaimLog, GiftQrcode
+from app.models.log import LogArchivePart
+from app.models.red_packet import RedPacket
+from app.models.stats import StatsCounter
+
+SCOPE_GIFT_STATUS = "gift_status"
+SCOPE_RED_PACKET_STATUS = "red_packet_status"
+SCOPE_BINDING_STATUS = "binding_status"
+SCOPE_CLAIM_DAY = "claim_day"
+
+STATUS_SOURCES = {
+    SCOPE_GIFT_STATUS: GiftQrcode,
+    SCOPE_RED_PACKET_STATUS: RedPacket,
+    SCOPE_BINDING_STATUS: GiftBinding,
+}
+
+CounterKey = tuple[str, str, str]
+
+
+class StatsRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def read(self, claim_days: list[str]) -> dict[CounterKey, int]:
+        # 中文注释：总量计数放在空桶里，按日计数以 UTC 日期为桶，概览只需读取十几行。
+        stmt = select(StatsCounter).where(
+            or_(
+                and_(StatsCounter.scope.in_(list(STATUS_SOURCES)), StatsCounter.bucket == ""),
+                and_(StatsCounter.scope == SCOPE_CLAIM_DAY, StatsCounter.bucket.in_(claim_days)),
+            )
+        )
+        return {(row.scope, row.bucket, row.name): row.value for row in self.db.scalars(stmt).all()}
+
+    def read_all(self) -> dict[CounterKey, int]:
+        rows = self.db.execute(
+            select(StatsCounter.scope, StatsCounter.bucket, StatsCounter.name, StatsCounter.value)
+        ).all()
+        return {(scope, bucket, name): value for scope, bucket, name, value in rows}
+
+    def compute_from_sources(
+        self, since_day: date | None, *, claim_days: bool = True
+    ) -> dict[CounterKey, int]:
+        counters: dict[CounterKey, int] = {}
+        for scope, model in STATUS_SOURCES.items():
+            stmt = select(model.status, func.count()).group_by(model.status)
+            for status, count in self.db.execute(stmt).all():
+                counters[(scope, "", status)] = count
+        if not claim_days:
+            return counters
+        day = func.date(GiftClaimLog.created_at)
+        stmt = select(day, GiftClaimLog.result, func.count()).where(
+            GiftClaimLog.created_at.is_not(None)
+        )
+        if since_day is not None:
+            stmt = stmt.where(day >= since_day.isoformat())
+        for bucket, result, count in self.db.execute(stmt.group_by(day, GiftClaimLog.result)).all():
+            counters[(SCOPE_CLAIM_DAY, bucket, result)] = count
+        return counters
+
+    def earliest_claim_day(self) -> date | None:
+        value = self.db.scalar(select(func.min(func.date(GiftClaimLog.created_at))))
+        return date.fromisoformat(value) if value else None
+
+    def first_complete_claim_day(self) -> date | None:
+        # 中文注释：归档按时间分批进行，最新一个已归档日期可能只搬走了一部分日志，
+        # 从它的下一天开始才是完整保留在源表里的日期，否则会用残缺数据覆盖正确的计数。
+        earliest = self.earliest_claim_day()
+        archived = self.db.scalar(
+            select(func.max(LogArchivePart.day)).where(
+                LogArchivePart.table_name == GiftClaimLog.__tablename__
+            )
+        )
+        if not archived:
+            return earliest
+        after_archived = date.fromisoformat(archived) + timedelta(days=1)
+        return max(after_archived, earliest) if earliest else after_archived
+
+    def rebuild(self, since_day: date | None, *, claim_days: bool = True) -> None:
+        # 中文注释：先删除再写入，第一条 DELETE 即取得 SQLite 写锁，重建期间触发器不会并发改动计数。
+        # 早于 since_day 的按日计数保留原值，日志归档后历史统计不会被清零。
+        self.db.execute(delete(StatsCounter).where(StatsCounter.scope.in_(list(STATUS_SOURCES))))
+        for scope, model in STATUS_SOURCES.items():
+            source = select(literal(scope), literal(""), model.status, func.count()).group_by(
+                model.status
+            )
+            self.db.execute(
+                insert(StatsCounter).from_select(["scope", "bucket", "name", "value"], source)
+            )
+        if not claim_days:
+            return
+
+        stale_days = delete(StatsCounter).where(StatsCounter.scope == SCOPE_CLAIM_DAY)
+        if since_day is not None:
+            stale_days = stale_days.where(StatsCounter.bucket >= since_day.isoformat())
+        self.db.execute(stale_days)
+
+        day = func.date(GiftClaimLog.created_at)
+        source = select(literal(SCOPE_CLAIM_DAY), day, GiftClaimLog.result, func.count()).where(
+            GiftClaimLog.created_at.is_not(None)
+        )
+        if since_day is not None:
+            source = source.where(day >= since_day.isoformat())
+        self.db.execute(
+            insert(StatsCounter).from_select(
+                ["scope", "bucket", "name", "value"], source.group_by(day, GiftClaimLog.result)
+            )
+        )
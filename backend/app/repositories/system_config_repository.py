@@ -16,6 +16,10 @@ class SystemConfigRepository:
         stmt = select(SystemConfig).where(SystemConfig.config_key == key)
         return self.db.scalar(stmt)
 
+    def get_value(self, key: str) -> str | None:
+        stmt = select(SystemConfig.config_value).where(SystemConfig.config_key == key)
+        return self.db.scalar(stmt)
+
     def upsert(self, key: str, value: str, is_secret: bool) -> SystemConfig:
         config = self.get_by_key(key)
         if not config:
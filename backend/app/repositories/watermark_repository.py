@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from sqlalchemy import update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.stats import RollupWatermark
+
+
+class WatermarkRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, name: str) -> RollupWatermark | None:
+        return self.db.get(RollupWatermark, name)
+
+    def last_id(self, name: str) -> int:
+        watermark = self.get(name)
+        return watermark.last_id if watermark is not None else 0
+
+    def ensure(self, name: str) -> None:
+        stmt = sqlite_insert(RollupWatermark).values(name=name, last_id=0)
+        self.db.execute(stmt.on_conflict_do_nothing(index_elements=["name"]))
+
+    def advance(self, name: str, after_id: int, upto_id: int, now: datetime) -> bool:
+        # 中文注释：以旧水位线为条件推进，相当于比较并交换；这条 UPDATE 同时取得写锁，
+        # 多个处理方并发时只有一方能认领同一段 id，不会重复处理。
+        result = self.db.execute(
+            update(RollupWatermark)
+            .where(RollupWatermark.name == name, RollupWatermark.last_id == after_id)
+            .values(last_id=upto_id, updated_at=now)
+        )
+        return result.rowcount == 1
@@ -37,6 +37,11 @@ class GiftItem(BaseModel):
     claim_url: str
 
 
+class GiftListResponse(BaseModel):
+    items: list[GiftItem]
+    next_after_id: int | None
+
+
 class CreateGiftResponse(BaseModel):
     id: int
     title: str
@@ -55,3 +60,13 @@ class GiftDetail(BaseModel):
     image_url: str
     claim_url: str
     red_packet_ids: list[int]
+
+
+class CreateGiftBatchRequest(BaseModel):
+    count: int = Field(ge=1)
+    title: str = Field(min_length=1, max_length=90)
+    activate_at: datetime | None = None
+    expire_at: datetime | None = None
+    binding_mode: str = Field(default="auto", pattern="^(manual|auto)$")
+    dispatch_strategy: str = Field(default="random", pattern="^(amount_desc|level_desc|random)$")
+    style_type: str = Field(default="festival", max_length=30)
@@ -0,0 +1,18 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class JobItem(BaseModel):
+    id: int
+    kind: str
+    status: str
+    progress_total: int
+    progress_done: int
+    progress_failed: int
+    result: dict[str, Any] | None
+    error: str
+    created_at: datetime | None
+    started_at: datetime | None
+    finished_at: datetime | None
@@ -31,3 +31,18 @@ class OperationLogItem(BaseModel):
     action: str
     detail: str
     created_at: datetime
+
+
+class AccessLogListResponse(BaseModel):
+    items: list[AccessLogItem]
+    next_cursor: str | None
+
+
+class GiftClaimLogListResponse(BaseModel):
+    items: list[GiftClaimLogItem]
+    next_cursor: str | None
+
+
+class OperationLogListResponse(BaseModel):
+    items: list[OperationLogItem]
+    next_cursor: str | None
@@ -55,9 +55,21 @@ class RedPacketItem(BaseModel):
     available_to: datetime | None
 
 
+class RedPacketListResponse(BaseModel):
+    items: list[RedPacketItem]
+    next_after_id: int | None
+
+
+class ImportRowError(BaseModel):
+    line: int
+    reason: str
+
+
 class RedPacketImportResponse(BaseModel):
     batch_no: str
     imported_count: int
+    failed_count: int = 0
+    errors: list[ImportRowError] = Field(default_factory=list)
 
 
 class ParseImageResult(BaseModel):
@@ -1,8 +1,9 @@
-import ipaddress
 from typing import Any
 
 from pydantic import BaseModel, Field, field_validator
 
+from app.core.ip_matcher import parse_ip_network
+
 
 class SecurityRulePayload(BaseModel):
     claim_enabled: bool | None = None
@@ -21,12 +22,16 @@ class SecurityRulePayload(BaseModel):
             raw = item.strip()
             if not raw:
                 continue
-            # 中文注释：安全策略仅接受标准 IPv4/IPv6 字符串，防止无效配置导致规则失效。
+            # 中文注释：安全策略接受 IPv4/IPv6 地址或 CIDR 网段，统一规范化后保存，
+            # 防止无效配置导致规则失效。
             try:
-                ipaddress.ip_address(raw)
+                network = parse_ip_network(raw)
             except ValueError as exc:
-                raise ValueError(f"无效 IP 地址: {raw}") from exc
-            normalized.append(raw)
+                raise ValueError(f"无效 IP 地址或网段: {raw}") from exc
+            if network.prefixlen == network.max_prefixlen:
+                normalized.append(str(network.network_address))
+            else:
+                normalized.append(str(network))
         return normalized
 
 
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from pydantic import BaseModel, Field, model_validator
 
 
@@ -108,3 +110,24 @@ class StorageChannelsUpdateRequest(BaseModel):
 
 class StorageChannelTestRequest(StorageChannelItem):
     pass
+
+
+class StorageChannelHealthItem(BaseModel):
+    id: str
+    name: str
+    provider: str
+    enabled: bool
+    priority: int
+    state: str
+    consecutive_failures: int
+    successes: int
+    failures: int
+    ewma_latency_ms: float | None
+    retry_in_seconds: float
+    last_error: str
+    last_success_at: datetime | None
+    last_failure_at: datetime | None
+
+
+class StorageChannelsHealthResponse(BaseModel):
+    channels: list[StorageChannelHealthItem]
@@ -0,0 +1,149 @@
+import random
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import NoReturn
+
+from sqlalchemy.orm import Session
+
+from app.core.security import create_claim_content_token, hash_gift_token
+from app.models.gift import GiftBinding, GiftClaimLog, GiftQrcode
+from app.models.red_packet import RedPacket
+from app.repositories.gift_repository import GiftRepository
+
+CLAIMABLE_PACKET_STATUSES = {"idle", "bound"}
+
+
+@dataclass
+class ClaimSnapshot:
+    gift: GiftQrcode
+    bindings: list[GiftBinding] = field(default_factory=list)
+    packets: list[RedPacket] = field(default_factory=list)
+
+
+class ClaimEngine:
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = GiftRepository(db)
+
+    def claim(self, token: str, ip: str, ua: str, host_base: str) -> str:
+        snapshot = self.resolve(token)
+        if not snapshot:
+            raise ValueError("礼物二维码不存在")
+
+        gift = snapshot.gift
+        gift_id = gift.id
+        strategy = gift.dispatch_strategy
+        now = datetime.now(tz=UTC)
+        activate_at = self._to_utc(gift.activate_at)
+        expire_at = self._to_utc(gift.expire_at)
+
+        if activate_at and now < activate_at:
+            self._reject(gift_id, ip, ua, "未到激活时间", "礼物尚未激活")
+        if expire_at and now > expire_at:
+            gift.status = "expired"
+            self._reject(gift_id, ip, ua, "已过期", "礼物已过期")
+        if gift.status == "claimed":
+            self._reject(gift_id, ip, ua, "该码已领取", "该礼物二维码已领取")
+        if gift.status == "disabled":
+            self._reject(gift_id, ip, ua, "二维码已停用", "该礼物二维码已停用")
+        if not snapshot.bindings:
+            self._reject(gift_id, ip, ua, "未绑定红包", "当前礼物未绑定红包")
+
+        candidates = self.rank_packets(strategy, snapshot.packets)
+        if not candidates:
+            if any(item.status == "disabled" for item in snapshot.packets):
+                self._reject(gift_id, ip, ua, "红包已停用", "该礼物已失效")
+            self._reject(gift_id, ip, ua, "红包不存在", "红包记录不存在")
+
+        # 中文注释：读取阶段不持有写事务；真正的领取由条件更新裁决，并发扫码时只有一个请求能成功。
+        if not self.repo.try_mark_gift_claimed(gift_id):
+            self.db.rollback()
+            self._reject(gift_id, ip, ua, "该码已领取", "该礼物二维码已领取")
+
+        packet: RedPacket | None = None
+        for candidate in candidates:
+            if self.repo.try_mark_packet_claimed(candidate.id):
+                packet = candidate
+                break
+        if packet is None:
+            # 中文注释：候选红包均已被并发停用或领取，回滚礼物状态，保持可再次领取。
+            self.db.rollback()
+            self._reject(gift_id, ip, ua, "红包不存在", "红包记录不存在")
+
+        self.repo.mark_bindings_claimed(gift_id)
+        self._write_log(gift_id, ip, ua, "success", "", packet.id, strategy)
+        # 中文注释：提交前先算好跳转地址，避免提交后访问过期属性触发额外的刷新查询。
+        target = self.resolve_target(packet, host_base)
+        self.db.commit()
+        return target
+
+    def resolve(self, token: str) -> ClaimSnapshot | None:
+        rows = self.repo.resolve_claim_rows(token, hash_gift_token(token))
+        if not rows:
+            return None
+
+        # 中文注释：明文令牌优先命中；同一查询中若哈希命中了其他礼物，仅作为兼容兜底。
+        gift = next((row[0] for row in rows if row[0].token_plain == token), rows[0][0])
+        snapshot = ClaimSnapshot(gift=gift)
+        for row_gift, binding, packet in rows:
+            if row_gift.id != gift.id or binding is None:
+                continue
+            snapshot.bindings.append(binding)
+            if packet is not None:
+                snapshot.packets.append(packet)
+        return snapshot
+
+    @staticmethod
+    def rank_packets(strategy: str, packets: list[RedPacket]) -> list[RedPacket]:
+        candidates = [item for item in packets if item.status in CLAIMABLE_PACKET_STATUSES]
+        if strategy == "amount_desc":
+            return sorted(candidates, key=lambda x: float(x.amount), reverse=True)
+        if strategy == "level_desc":
+            return sorted(candidates, key=lambda x: (x.level, float(x.amount)), reverse=True)
+        random.shuffle(candidates)
+        return candidates
+
+    @staticmethod
+    def resolve_target(packet: RedPacket, host_base: str) -> str:
+        content_type = (packet.content_type or "url").strip()
+        if content_type == "url":
+            return packet.content_value or packet.claim_url
+        ticket = create_claim_content_token(packet.id)
+        base = host_base.rstrip("/")
+        return f"{base}/claim/content?ticket={ticket}"
+
+    def _reject(self, gift_id: int, ip: str, ua: str, reason: str, message: str) -> NoReturn:
+        # 中文注释：拒绝记录与状态变更在同一次提交中落库，拒绝日志不再随会话关闭被丢弃。
+        self._write_log(gift_id, ip, ua, "rejected", reason)
+        self.db.commit()
+        raise ValueError(message)
+
+    def _write_log(
+        self,
+        gift_qrcode_id: int,
+        ip: str,
+        ua: str,
+        result: str,
+        reason: str,
+        red_packet_id: int | None = None,
+        dispatch_strategy: str = "",
+    ) -> None:
+        self.db.add(
+            GiftClaimLog(
+                gift_qrcode_id=gift_qrcode_id,
+                red_packet_id=red_packet_id,
+                dispatch_strategy=dispatch_strategy,
+                ip=ip,
+                ua=ua[:255],
+                result=result,
+                reason=reason,
+            )
+        )
+
+    @staticmethod
+    def _to_utc(dt):
+        if dt is None:
+            return None
+        if dt.tzinfo is None:
+            return dt.replace(tzinfo=UTC)
+        return dt.astimezone(UTC)
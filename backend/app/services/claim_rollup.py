@@ -0,0 +1,121 @@
+import asyncio
+import logging
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.repositories.claim_rollup_repository import (
+    CLAIM_ROLLUP_WATERMARK,
+    ClaimRollupRepository,
+)
+from app.repositories.watermark_repository import WatermarkRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ClaimRollupStats:
+    runs: int = 0
+    batches: int = 0
+    conflicts: int = 0
+    failed: int = 0
+    last_id: int = 0
+
+
+class ClaimRollupAggregator:
+    def __init__(self, *, interval_seconds: float, batch_size: int) -> None:
+        self.interval = max(1.0, interval_seconds)
+        self.batch_size = max(1, batch_size)
+        self.stats = ClaimRollupStats()
+        self._stopping: asyncio.Event | None = None
+        self._worker: asyncio.Task[None] | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._stopping = asyncio.Event()
+        self._worker = asyncio.create_task(self._run(), name="claim-rollup-aggregator")
+
+    async def stop(self) -> None:
+        if not self.running or self._stopping is None or self._worker is None:
+            return
+        self._stopping.set()
+        await self._worker
+        self._worker = None
+        self._stopping = None
+
+    def snapshot(self) -> dict[str, Any]:
+        data = asdict(self.stats)
+        data["interval_seconds"] = self.interval
+        data["batch_size"] = self.batch_size
+        data["running"] = self.running
+        return data
+
+    def catch_up(self) -> int:
+        db = SessionLocal()
+        try:
+            repo = ClaimRollupRepository(db)
+            watermarks = WatermarkRepository(db)
+            watermarks.ensure(CLAIM_ROLLUP_WATERMARK)
+            db.commit()
+            batches = 0
+            while True:
+                after_id = watermarks.last_id(CLAIM_ROLLUP_WATERMARK)
+                upto_id = repo.next_batch_end(after_id, self.batch_size)
+                if upto_id is None:
+                    db.rollback()
+                    break
+                # 中文注释：先推进水位线再写汇总，两者同一事务提交；SQLite 写事务串行，
+                # 已提交日志的 id 必然连续落在水位线之后，不会有晚提交的小 id 被跳过。
+                now = datetime.now(tz=UTC)
+                if not watermarks.advance(CLAIM_ROLLUP_WATERMARK, after_id, upto_id, now):
+                    db.rollback()
+                    self.stats.conflicts += 1
+                    db.expire_all()
+                    continue
+                repo.rollup_range(after_id, upto_id)
+                db.commit()
+                db.expire_all()
+                batches += 1
+                self.stats.batches += 1
+                self.stats.last_id = upto_id
+            self.stats.runs += 1
+            return batches
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def _run(self) -> None:
+        assert self._stopping is not None
+        stopping = self._stopping
+        while not stopping.is_set():
+            try:
+                await run_in_threadpool(self.catch_up)
+            except Exception:
+                self.stats.failed += 1
+                logger.exception("Failed to roll up claim logs")
+            try:
+                await asyncio.wait_for(stopping.wait(), timeout=self.interval)
+            except TimeoutError:
+                continue
+
+
+def _build_claim_rollup_aggregator() -> ClaimRollupAggregator:
+    settings = get_settings()
+    return ClaimRollupAggregator(
+        interval_seconds=settings.claim_rollup_interval_seconds,
+        batch_size=settings.claim_rollup_batch_size,
+    )
+
+
+claim_rollup_aggregator = _build_claim_rollup_aggregator()
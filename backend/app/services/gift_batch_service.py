@@ -0,0 +1,131 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from secrets import token_urlsafe
+from typing import Any
+
+from app.core.config import get_settings
+from app.core.security import hash_gift_token
+from app.models.log import OperationLog
+from app.repositories.gift_repository import GiftRepository
+from app.services.gift_service import (
+    GiftService,
+    is_on_demand_render,
+    upload_qrcode_with_failover,
+)
+from app.services.job_runner import JobContext
+from app.services.qr_render import get_render_pool, render_qrcode_png
+from app.services.system_config_service import get_runtime_storage_channels
+
+
+@dataclass
+class GiftBatchParams:
+    count: int
+    title: str
+    activate_at: datetime | None
+    expire_at: datetime | None
+    binding_mode: str
+    dispatch_strategy: str
+    style_type: str
+    host_base: str
+    user_id: int | None = None
+
+
+class GiftBatchService:
+    def __init__(self, ctx: JobContext):
+        self.ctx = ctx
+        self.db = ctx.db
+        self.created = 0
+        self.bound = 0
+        self.gift_ids: list[int] = []
+
+    @staticmethod
+    def validate(params: GiftBatchParams) -> None:
+        max_count = get_settings().gift_batch_max_count
+        if params.count < 1 or params.count > max_count:
+            raise ValueError(f"批量数量需在 1 到 {max_count} 之间")
+
+    def run(self, params: GiftBatchParams) -> dict[str, Any]:
+        settings = get_settings()
+        chunk_size = max(1, settings.gift_batch_chunk_size)
+        activate_at = GiftService._to_utc(params.activate_at)
+        expire_at = GiftService._to_utc(params.expire_at)
+        style_config = json.dumps({"style_type": params.style_type}, ensure_ascii=False)
+
+        self.ctx.set_total(params.count)
+        on_demand = is_on_demand_render()
+        channels = [] if on_demand else get_runtime_storage_channels(self.db)
+        with ThreadPoolExecutor(max_workers=max(1, settings.gift_upload_workers)) as uploader:
+            for offset in range(0, params.count, chunk_size):
+                size = min(chunk_size, params.count - offset)
+                tokens = [token_urlsafe(32) for _ in range(size)]
+                hashes = [hash_gift_token(token) for token in tokens]
+                claim_urls = [
+                    GiftService._build_claim_url(token, params.host_base) for token in tokens
+                ]
+
+                if on_demand:
+                    uploads = [("", "", "")] * size
+                else:
+                    # 中文注释：二维码渲染是纯 CPU 计算，放到进程池并行；
+                    # 上传是网络 IO，交给有界线程池。
+                    render_pool = get_render_pool(settings.gift_render_workers)
+                    images = list(render_pool.map(render_qrcode_png, claim_urls, chunksize=16))
+                    uploads = list(
+                        uploader.map(
+                            lambda pair: upload_qrcode_with_failover(channels, pair[0], pair[1]),
+                            zip(hashes, images, strict=True),
+                        )
+                    )
+
+                rows = [
+                    {
+                        "title": f"{params.title}-{offset + index + 1}"[:100],
+                        "status": "draft",
+                        "token_plain": tokens[index],
+                        "token_hash": hashes[index],
+                        "activate_at": activate_at,
+                        "expire_at": expire_at,
+                        "binding_mode": params.binding_mode,
+                        "dispatch_strategy": params.dispatch_strategy,
+                        "style_type": params.style_type,
+                        "style_config": style_config,
+                        "storage_channel_id": uploads[index][1],
+                        "image_url": uploads[index][0],
+                        "object_key": uploads[index][2],
+                    }
+                    for index in range(size)
+                ]
+                self._persist_chunk(rows, params.binding_mode)
+
+        self.db.add(
+            OperationLog(
+                user_id=params.user_id,
+                action="batch_create_gifts",
+                detail=f"job={self.ctx.job_id}, created={self.created}, bound={self.bound}",
+            )
+        )
+        self.db.commit()
+        return {"created": self.created, "bound": self.bound, "gift_ids": self.gift_ids[:200]}
+
+    def _persist_chunk(self, rows: list[dict[str, Any]], binding_mode: str) -> None:
+        repo = GiftRepository(self.db)
+        try:
+            gift_ids = repo.bulk_create_gifts(rows)
+            bound = 0
+            if binding_mode == "auto":
+                # 中文注释：每个分片内一次性占用空闲红包并批量写入绑定，
+                # 红包不足时剩余礼物保持未绑定。
+                packet_ids = repo.reserve_idle_red_packets(len(gift_ids))
+                pairs = list(zip(gift_ids[: len(packet_ids)], packet_ids, strict=True))
+                repo.bulk_bind_red_packets(pairs)
+                bound = len(pairs)
+            self.ctx.advance(len(gift_ids))
+            self.ctx.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        self.created += len(gift_ids)
+        self.bound += bound
+        self.gift_ids.extend(gift_ids)
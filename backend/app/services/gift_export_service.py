@@ -0,0 +1,257 @@
+import csv
+import re
+import zipfile
+import zlib
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from io import BytesIO, RawIOBase, StringIO
+from typing import Any
+
+from PIL import Image
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.repositories.gift_repository import GiftRepository
+from app.schemas.system_config import StorageChannelItem
+from app.services.gift_service import GiftService, gift_qrcode_cache_key, load_qrcode_image
+from app.services.system_config_service import get_runtime_storage_channels
+
+EXPORT_FORMATS = {"zip", "pdf"}
+PDF_PAGE_WIDTH = 595
+PDF_PAGE_HEIGHT = 842
+PDF_MARGIN = 36
+PDF_CAPTION_HEIGHT = 14
+PDF_CELL_PADDING = 4
+_UNSAFE_FILENAME = re.compile(r'[\\/:*?"<>|\s]+')
+
+
+@dataclass
+class ExportItem:
+    gift_id: int
+    title: str
+    claim_url: str
+    payload: Any = None
+    error: str = ""
+
+
+class _ChunkSink(RawIOBase):
+    # 中文注释：ZipFile 写入的字节先暂存在这里，每处理完一张图就取走，内存中只保留当前分片。
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class _PdfGridWriter:
+    CATALOG_ID = 1
+    PAGES_ID = 2
+    FONT_ID = 3
+
+    def __init__(self, columns: int, rows: int):
+        self.columns = max(1, columns)
+        self.rows = max(1, rows)
+        self.offsets: list[int] = [0, 0, 0]
+        self.position = 0
+        self.page_ids: list[int] = []
+        self.cells: list[tuple[int | None, str]] = []
+
+    def start(self) -> bytes:
+        header = self._emit(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        font = self._object(self.FONT_ID, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+        return header + font
+
+    def add(self, item: ExportItem) -> bytes:
+        output = b""
+        image_id = None
+        if item.payload is not None:
+            width, height, data = item.payload
+            image_id = self._reserve()
+            output += self._object(
+                image_id,
+                (
+                    f"<< /Type /XObject /Subtype /Image /Width {width} /Height {height} "
+                    f"/ColorSpace /DeviceGray /BitsPerComponent 1 /Filter /FlateDecode "
+                    f"/Length {len(data)} >>\nstream\n"
+                ).encode("ascii")
+                + data
+                + b"\nendstream",
+            )
+        caption = f"#{item.gift_id}" if item.payload is not None else f"#{item.gift_id} missing"
+        self.cells.append((image_id, caption))
+        if len(self.cells) >= self.columns * self.rows:
+            output += self._flush_page()
+        return output
+
+    def finish(self) -> bytes:
+        output = self._flush_page() if self.cells or not self.page_ids else b""
+        kids = " ".join(f"{page_id} 0 R" for page_id in self.page_ids)
+        output += self._object(
+            self.PAGES_ID,
+            f"<< /Type /Pages /Kids [{kids}] /Count {len(self.page_ids)} >>".encode("ascii"),
+        )
+        output += self._object(
+            self.CATALOG_ID, f"<< /Type /Catalog /Pages {self.PAGES_ID} 0 R >>".encode("ascii")
+        )
+        xref_position = self.position
+        lines = [f"xref\n0 {len(self.offsets) + 1}\n", "0000000000 65535 f \n"]
+        lines.extend(f"{offset:010d} 00000 n \n" for offset in self.offsets)
+        lines.append(
+            f"trailer\n<< /Size {len(self.offsets) + 1} /Root {self.CATALOG_ID} 0 R >>\n"
+            f"startxref\n{xref_position}\n%%EOF\n"
+        )
+        return output + self._emit("".join(lines).encode("ascii"))
+
+    def _flush_page(self) -> bytes:
+        cell_width = (PDF_PAGE_WIDTH - 2 * PDF_MARGIN) / self.columns
+        cell_height = (PDF_PAGE_HEIGHT - 2 * PDF_MARGIN) / self.rows
+        size = min(cell_width, cell_height - PDF_CAPTION_HEIGHT) - 2 * PDF_CELL_PADDING
+        commands: list[str] = []
+        images: list[str] = []
+        for index, (image_id, caption) in enumerate(self.cells):
+            column, row = index % self.columns, index // self.columns
+            x = PDF_MARGIN + column * cell_width + (cell_width - size) / 2
+            y = PDF_PAGE_HEIGHT - PDF_MARGIN - row * cell_height - PDF_CELL_PADDING - size
+            if image_id is not None:
+                images.append(f"/Im{image_id} {image_id} 0 R")
+                commands.append(
+                    f"q {size:.2f} 0 0 {size:.2f} {x:.2f} {y:.2f} cm /Im{image_id} Do Q"
+                )
+            commands.append(f"BT /F1 8 Tf {x:.2f} {y - 10:.2f} Td ({caption}) Tj ET")
+        self.cells = []
+
+        content = zlib.compress("\n".join(commands).encode("ascii"))
+        content_id = self._reserve()
+        page_id = self._reserve()
+        self.page_ids.append(page_id)
+        output = self._object(
+            content_id,
+            f"<< /Length {len(content)} /Filter /FlateDecode >>\nstream\n".encode("ascii")
+            + content
+            + b"\nendstream",
+        )
+        output += self._object(
+            page_id,
+            (
+                f"<< /Type /Page /Parent {self.PAGES_ID} 0 R "
+                f"/MediaBox [0 0 {PDF_PAGE_WIDTH} {PDF_PAGE_HEIGHT}] "
+                f"/Resources << /Font << /F1 {self.FONT_ID} 0 R >> "
+                f"/XObject << {' '.join(images)} >> >> /Contents {content_id} 0 R >>"
+            ).encode("ascii"),
+        )
+        return output
+
+    def _reserve(self) -> int:
+        self.offsets.append(0)
+        return len(self.offsets)
+
+    def _object(self, object_id: int, body: bytes) -> bytes:
+        self.offsets[object_id - 1] = self.position
+        return self._emit(f"{object_id} 0 obj\n".encode("ascii") + body + b"\nendobj\n")
+
+    def _emit(self, data: bytes) -> bytes:
+        self.position += len(data)
+        return data
+
+
+class GiftExportService:
+    def __init__(self, db: Session, host_base: str):
+        self.db = db
+        self.host_base = host_base
+        self.settings = get_settings()
+        self.rows: list[Any] = []
+        self.channels: list[StorageChannelItem] = []
+
+    def prepare(self, *, status: str = "", keyword: str = "", ids: list[int] | None = None) -> int:
+        max_count = max(1, self.settings.gift_export_max_count)
+        self.rows = GiftRepository(self.db).list_export_rows(
+            status=status, keyword=keyword.strip(), ids=ids, limit=max_count + 1
+        )
+        if not self.rows:
+            raise ValueError("没有符合条件的礼物二维码")
+        if len(self.rows) > max_count:
+            raise ValueError(f"单次最多导出 {max_count} 个礼物二维码，请缩小筛选范围")
+        # 中文注释：渠道列表在请求线程里一次取好，流式输出阶段不再使用数据库会话。
+        self.channels = get_runtime_storage_channels(self.db)
+        return len(self.rows)
+
+    def iter_zip(self) -> Iterator[bytes]:
+        sink = _ChunkSink()
+        manifest = StringIO()
+        writer = csv.writer(manifest)
+        writer.writerow(["id", "title", "file", "claim_url", "error"])
+        # 中文注释：PNG 本身已压缩，归档时直接存储，省去一次无意义的 deflate。
+        with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as archive:
+            for item in self._iter_items(lambda image: image):
+                filename = ""
+                if item.payload is not None:
+                    filename = f"{item.gift_id:06d}-{self._safe_filename(item.title)}.png"
+                    archive.writestr(filename, item.payload)
+                writer.writerow([item.gift_id, item.title, filename, item.claim_url, item.error])
+                chunk = sink.drain()
+                if chunk:
+                    yield chunk
+            archive.writestr("manifest.csv", "\ufeff" + manifest.getvalue())
+        yield sink.drain()
+
+    def iter_pdf(self) -> Iterator[bytes]:
+        pdf = _PdfGridWriter(
+            self.settings.gift_export_pdf_columns, self.settings.gift_export_pdf_rows
+        )
+        yield pdf.start()
+        for item in self._iter_items(self._to_pdf_image):
+            chunk = pdf.add(item)
+            if chunk:
+                yield chunk
+        yield pdf.finish()
+
+    def _iter_items(self, transform: Callable[[bytes], Any]) -> Iterator[ExportItem]:
+        workers = max(1, self.settings.gift_export_workers)
+        # 中文注释：最多只有 2 倍并发数的图片在途，按原顺序逐个产出，导出再多也不会整体堆在内存里。
+        window = workers * 2
+        pending: deque[Future] = deque()
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gift-export")
+        try:
+            for row in self.rows:
+                pending.append(executor.submit(self._fetch, row, transform))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _fetch(self, row: Any, transform: Callable[[bytes], Any]) -> ExportItem:
+        claim_url = ""
+        if row.token_plain:
+            claim_url = GiftService._build_claim_url(row.token_plain, self.host_base)
+        item = ExportItem(gift_id=row.id, title=row.title, claim_url=claim_url)
+        try:
+            cache_key = gift_qrcode_cache_key(row, self.host_base)
+            # 中文注释：导出是一次性的顺序读取，不回写缓存，避免把在线下载的热点图片挤出去。
+            image = load_qrcode_image(cache_key, lambda: self.channels, cache_result=False)
+            item.payload = transform(image)
+        except Exception as exc:
+            item.error = str(exc)
+        return item
+
+    @staticmethod
+    def _to_pdf_image(raw: bytes) -> tuple[int, int, bytes]:
+        with Image.open(BytesIO(raw)) as image:
+            bitmap = image.convert("L").convert("1", dither=Image.Dither.NONE)
+        return bitmap.width, bitmap.height, zlib.compress(bitmap.tobytes())
+
+    @staticmethod
+    def _safe_filename(title: str) -> str:
+        return _UNSAFE_FILENAME.sub("_", title).strip("._")[:60] or "gift"
@@ -1,19 +1,127 @@
+import hashlib
 import json
-from datetime import datetime, timezone
-from io import BytesIO
-import random
+import math
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
 from secrets import token_urlsafe
 
-import qrcode
 from sqlalchemy.orm import Session
 
+from app.core.byte_cache import ByteLRUCache
 from app.core.config import get_settings
-from app.core.security import create_claim_content_token, hash_gift_token
-from app.models.gift import GiftClaimLog
+from app.core.security import hash_gift_token
+from app.models.gift import GiftQrcode
 from app.models.red_packet import RedPacket
 from app.repositories.gift_repository import GiftRepository
+from app.schemas.system_config import StorageChannelItem
+from app.services.claim_engine import ClaimEngine
+from app.services.qr_render import render_qrcode_png
 from app.services.system_config_service import get_runtime_storage_channels
 from app.storage.factory import create_storage_from_channel
+from app.storage.health import storage_health
+
+settings = get_settings()
+
+RENDER_CACHE_CHANNEL = "__render__"
+
+# 中文注释：二维码对象在重新生成前内容不变，按 (渠道, 对象 key) 缓存原始字节，
+# 避免每次下载都回源对象存储。
+qrcode_image_cache = ByteLRUCache(
+    memory_max_bytes=settings.qrcode_cache_memory_bytes,
+    disk_dir=settings.qrcode_cache_disk_dir,
+    disk_max_bytes=settings.qrcode_cache_disk_bytes,
+)
+
+
+def build_qrcode_object_key(token_hash: str, prefix: str) -> str:
+    now = datetime.now()
+    relative = f"gifts/{now:%Y}/{now:%m}/{token_hash[:16]}.png"
+    normalized_prefix = prefix.strip().strip("/")
+    if not normalized_prefix:
+        return relative
+    return f"{normalized_prefix}/{relative}"
+
+
+def upload_qrcode_with_failover(
+    channels: list[StorageChannelItem], token_hash: str, image_data: bytes
+) -> tuple[str, str, str]:
+    errors: list[str] = []
+    attempted = False
+    for channel in channels:
+        # 中文注释：已熔断的渠道直接跳过，不再每次上传都等一次连接超时才切换。
+        if not storage_health.allow(channel.id):
+            errors.append(f"{channel.name}: 渠道已熔断，暂时跳过")
+            continue
+        attempted = True
+        object_key = build_qrcode_object_key(token_hash, channel.storage_prefix)
+        started = time.perf_counter()
+        try:
+            storage = create_storage_from_channel(channel)
+            image_url = storage.upload_bytes(object_key, image_data, "image/png")
+        except Exception as exc:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            storage_health.record_failure(channel.id, elapsed_ms, str(exc))
+            errors.append(f"{channel.name}: {exc}")
+            continue
+        storage_health.record_success(channel.id, (time.perf_counter() - started) * 1000)
+        return image_url, channel.id, object_key
+
+    if channels and not attempted:
+        # 中文注释：全部渠道熔断时直接失败，不绕过熔断器去等连接超时，只提示最快何时可重试。
+        retry_in = min(storage_health.retry_in(channel.id) for channel in channels)
+        errors.append(f"所有存储渠道均已熔断，约 {max(1, math.ceil(retry_in))} 秒后重试")
+    raise RuntimeError("二维码上传失败：" + " | ".join(errors))
+
+
+def is_on_demand_render() -> bool:
+    return get_settings().qrcode_render_mode.strip().lower() == "on_demand"
+
+
+def gift_qrcode_cache_key(gift: GiftQrcode, host_base: str) -> tuple[str, str]:
+    if gift.object_key:
+        return gift.storage_channel_id, gift.object_key
+    # 中文注释：未落存储的礼物按领取链接即时渲染，图片完全由链接决定，可用链接作为缓存 key。
+    if gift.token_plain:
+        return RENDER_CACHE_CHANNEL, GiftService._build_claim_url(gift.token_plain, host_base)
+    raise ValueError("该礼物二维码缺少存储对象，请重新生成")
+
+
+def build_qrcode_etag(cache_key: tuple[str, str]) -> str:
+    digest = hashlib.sha256(f"{cache_key[0]}:{cache_key[1]}".encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def load_gift_qrcode_image(db: Session, gift: GiftQrcode, host_base: str) -> bytes:
+    cache_key = gift_qrcode_cache_key(gift, host_base)
+    return load_qrcode_image(cache_key, lambda: get_runtime_storage_channels(db))
+
+
+def load_qrcode_image(
+    cache_key: tuple[str, str],
+    resolve_channels: Callable[[], list[StorageChannelItem]],
+    *,
+    cache_result: bool = True,
+) -> bytes:
+    cached = qrcode_image_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    channel_id, source = cache_key
+    if channel_id == RENDER_CACHE_CHANNEL:
+        image = render_qrcode_png(source)
+    else:
+        channel = next((item for item in resolve_channels() if item.id == channel_id), None)
+        if not channel:
+            raise ValueError("当前二维码存储渠道不可用，请重新生成")
+        storage = create_storage_from_channel(channel)
+        try:
+            image = storage.download_bytes(source)
+        except Exception as exc:
+            raise RuntimeError(f"二维码下载失败: {exc}") from exc
+    if cache_result:
+        qrcode_image_cache.put(cache_key, image)
+    return image
 
 
 class GiftService:
@@ -38,11 +146,7 @@ class GiftService:
         token = token_urlsafe(32)
         claim_url = self._build_claim_url(token, host_base)
         token_hash = hash_gift_token(token)
-        image_data = self._render_qrcode(claim_url)
-        image_url, channel_id, object_key = self._upload_qrcode_with_failover(
-            token_hash=token_hash,
-            image_data=image_data,
-        )
+        image_url, channel_id, object_key = self._store_qrcode(token_hash, claim_url)
 
         gift = self.repo.create_gift(
             title=title,
@@ -85,14 +189,12 @@ class GiftService:
         token = token_urlsafe(32)
         claim_url = self._build_claim_url(token, host_base)
         token_hash = hash_gift_token(token)
-        image_data = self._render_qrcode(claim_url)
-        image_url, channel_id, object_key = self._upload_qrcode_with_failover(
-            token_hash=token_hash,
-            image_data=image_data,
-        )
+        image_url, channel_id, object_key = self._store_qrcode(token_hash, claim_url)
 
         if gift.object_key and gift.storage_channel_id:
             self._try_delete_existing_object(gift.storage_channel_id, gift.object_key)
+        elif gift.token_plain:
+            qrcode_image_cache.invalidate(gift_qrcode_cache_key(gift, host_base))
 
         gift.token_plain = token
         gift.token_hash = token_hash
@@ -103,59 +205,7 @@ class GiftService:
         return claim_url, image_url
 
     def claim_by_token(self, token: str, ip: str, ua: str, host_base: str) -> str:
-        gift = self.repo.get_by_token_plain(token)
-        if not gift:
-            token_hash = hash_gift_token(token)
-            gift = self.repo.get_by_token_hash(token_hash)
-        if not gift:
-            raise ValueError("礼物二维码不存在")
-
-        now = datetime.now(tz=timezone.utc)
-        activate_at = self._to_utc(gift.activate_at)
-        expire_at = self._to_utc(gift.expire_at)
-
-        if activate_at and now < activate_at:
-            self._write_claim_log(gift.id, ip, ua, "rejected", "未到激活时间")
-            raise ValueError("礼物尚未激活")
-        if expire_at and now > expire_at:
-            gift.status = "expired"
-            self._write_claim_log(gift.id, ip, ua, "rejected", "已过期")
-            self.db.commit()
-            raise ValueError("礼物已过期")
-        if gift.status == "claimed":
-            self._write_claim_log(gift.id, ip, ua, "rejected", "该码已领取")
-            raise ValueError("该礼物二维码已领取")
-        if gift.status == "disabled":
-            self._write_claim_log(gift.id, ip, ua, "rejected", "二维码已停用")
-            raise ValueError("该礼物二维码已停用")
-
-        bindings = self.repo.list_bindings(gift.id)
-        if not bindings:
-            self._write_claim_log(gift.id, ip, ua, "rejected", "未绑定红包")
-            raise ValueError("当前礼物未绑定红包")
-
-        packet = self._select_packet(gift.dispatch_strategy, bindings)
-        if not packet:
-            disabled_exists = False
-            for binding in bindings:
-                candidate = self.db.get(RedPacket, binding.red_packet_id)
-                if candidate and candidate.status == "disabled":
-                    disabled_exists = True
-                    break
-            if disabled_exists:
-                self._write_claim_log(gift.id, ip, ua, "rejected", "红包已停用")
-                raise ValueError("该礼物已失效")
-            self._write_claim_log(gift.id, ip, ua, "rejected", "红包不存在")
-            raise ValueError("红包记录不存在")
-
-        # 中文注释：一经领取即写入已领取状态，确保每个码只能领取一次。
-        gift.status = "claimed"
-        for binding in bindings:
-            binding.status = "claimed"
-        packet.status = "claimed"
-        self._write_claim_log(gift.id, ip, ua, "success", "", packet.id, gift.dispatch_strategy)
-        self.db.commit()
-        return self._resolve_claim_target(packet, host_base)
+        return ClaimEngine(self.db).claim(token=token, ip=ip, ua=ua, host_base=host_base)
 
     def update_gift(
         self,
@@ -202,8 +252,10 @@ class GiftService:
                 packet.status = "idle"
             self.repo.remove_binding(binding)
 
+        cache_key = (gift.storage_channel_id, gift.object_key)
         self.repo.delete_gift(gift)
         self.db.commit()
+        qrcode_image_cache.invalidate(cache_key)
 
     def _sync_bindings(self, gift_id: int, binding_mode: str, red_packet_ids: list[int]) -> None:
         current_bindings = self.repo.list_bindings(gift_id)
@@ -261,67 +313,15 @@ class GiftService:
             self.repo.bind_red_packet(gift_id, packet_id)
             packet.status = "bound"
 
-    @staticmethod
-    def _resolve_claim_target(packet: RedPacket, host_base: str) -> str:
-        content_type = (packet.content_type or "url").strip()
-        if content_type == "url":
-            return packet.content_value or packet.claim_url
-        ticket = create_claim_content_token(packet.id)
-        base = host_base.rstrip("/")
-        return f"{base}/claim/content?ticket={ticket}"
-
     def _bind_packet(self, gift_id: int, packet: RedPacket) -> None:
         if packet.status != "idle":
             return
         self.repo.bind_red_packet(gift_id, packet.id)
         packet.status = "bound"
 
-    def _select_packet(self, strategy: str, bindings) -> RedPacket | None:
-        packet_list: list[RedPacket] = []
-        for binding in bindings:
-            packet = self.db.get(RedPacket, binding.red_packet_id)
-            if packet and packet.status in {"idle", "bound"}:
-                packet_list.append(packet)
-        if not packet_list:
-            return None
-
-        if strategy == "amount_desc":
-            return max(packet_list, key=lambda x: float(x.amount))
-        if strategy == "level_desc":
-            return max(packet_list, key=lambda x: (x.level, float(x.amount)))
-        return random.choice(packet_list)
-
-    def _write_claim_log(
-        self,
-        gift_qrcode_id: int,
-        ip: str,
-        ua: str,
-        result: str,
-        reason: str,
-        red_packet_id: int | None = None,
-        dispatch_strategy: str = "",
-    ) -> None:
-        self.db.add(
-            GiftClaimLog(
-                gift_qrcode_id=gift_qrcode_id,
-                red_packet_id=red_packet_id,
-                dispatch_strategy=dispatch_strategy,
-                ip=ip,
-                ua=ua,
-                result=result,
-                reason=reason,
-            )
-        )
-
     @staticmethod
     def _render_qrcode(content: str) -> bytes:
-        qr = qrcode.QRCode(border=2, box_size=10)
-        qr.add_data(content)
-        qr.make(fit=True)
-        image = qr.make_image(fill_color="black", back_color="white")
-        buffer = BytesIO()
-        image.save(buffer, "PNG")
-        return buffer.getvalue()
+        return render_qrcode_png(content)
 
     @staticmethod
     def _build_claim_url(token: str, fallback_base: str) -> str:
@@ -331,31 +331,20 @@ class GiftService:
         base = preferred_base or configured_base
         return f"{base}/r/{token}"
 
-    def _build_object_key(self, token_hash: str, prefix: str) -> str:
-        now = datetime.now()
-        relative = f"gifts/{now:%Y}/{now:%m}/{token_hash[:16]}.png"
-        normalized_prefix = prefix.strip().strip("/")
-        if not normalized_prefix:
-            return relative
-        return f"{normalized_prefix}/{relative}"
-
-    def _upload_qrcode_with_failover(
-        self, token_hash: str, image_data: bytes
-    ) -> tuple[str, str, str]:
+    def _store_qrcode(self, token_hash: str, claim_url: str) -> tuple[str, str, str]:
+        # 中文注释：即时渲染模式下不上传图片，下载时再按领取链接渲染，存储字段保持为空。
+        if is_on_demand_render():
+            return "", "", ""
+        image_data = self._render_qrcode(claim_url)
         channels = get_runtime_storage_channels(self.db)
-        errors: list[str] = []
-        for channel in channels:
-            object_key = self._build_object_key(token_hash, channel.storage_prefix)
-            try:
-                storage = create_storage_from_channel(channel)
-                image_url = storage.upload_bytes(object_key, image_data, "image/png")
-                return image_url, channel.id, object_key
-            except Exception as exc:
-                errors.append(f"{channel.name}: {exc}")
-
-        raise RuntimeError("二维码上传失败：" + " | ".join(errors))
+        image_url, channel_id, object_key = upload_qrcode_with_failover(
+            channels, token_hash, image_data
+        )
+        qrcode_image_cache.put((channel_id, object_key), image_data)
+        return image_url, channel_id, object_key
 
     def _try_delete_existing_object(self, channel_id: str, object_key: str) -> None:
+        qrcode_image_cache.invalidate((channel_id, object_key))
         channels = get_runtime_storage_channels(self.db)
         target = next((item for item in channels if item.id == channel_id), None)
         if not target:
@@ -371,5 +360,5 @@ class GiftService:
         if dt is None:
             return None
         if dt.tzinfo is None:
-            return dt.replace(tzinfo=timezone.utc)
-        return dt.astimezone(timezone.utc)
+            return dt.replace(tzinfo=UTC)
+        return dt.astimezone(UTC)
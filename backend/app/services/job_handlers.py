@@ -0,0 +1,71 @@
+from pathlib import Path
+from typing import Any
+
+from app.services.gift_batch_service import GiftBatchParams, GiftBatchService
+from app.services.gift_service import GiftService
+from app.services.job_runner import JobContext, job_runner
+from app.services.red_packet_service import RedPacketService
+
+GIFT_BATCH_CREATE = "gift_batch_create"
+GIFT_REGENERATE_QRCODE = "gift_regenerate_qrcode"
+RED_PACKET_CSV_IMPORT = "red_packet_csv_import"
+RED_PACKET_IMAGE_IMPORT = "red_packet_image_import"
+
+
+def run_gift_batch_create(ctx: JobContext, params: dict[str, Any]) -> dict[str, Any]:
+    return GiftBatchService(ctx).run(GiftBatchParams(**params))
+
+
+def run_gift_regenerate_qrcode(ctx: JobContext, params: dict[str, Any]) -> dict[str, Any]:
+    ctx.set_total(1)
+    claim_url, _image_url = GiftService(ctx.db).regenerate_gift_qrcode(
+        gift_id=params["gift_id"], host_base=params["host_base"]
+    )
+    ctx.advance()
+    return {"gift_id": params["gift_id"], "claim_url": claim_url}
+
+
+def run_red_packet_csv_import(ctx: JobContext, params: dict[str, Any]) -> dict[str, Any]:
+    def on_chunk(imported: int, failed: int) -> None:
+        ctx.done, ctx.failed = imported, failed
+        ctx.commit()
+
+    with Path(params["file_path"]).open("rb") as stream:
+        batch_no, imported_count, failed_count, errors = RedPacketService(ctx.db).import_csv(
+            stream, on_chunk=on_chunk
+        )
+    return {
+        "batch_no": batch_no,
+        "imported_count": imported_count,
+        "failed_count": failed_count,
+        "errors": errors,
+    }
+
+
+def run_red_packet_image_import(ctx: JobContext, params: dict[str, Any]) -> dict[str, Any]:
+    files: list[dict[str, str]] = params["files"]
+    ctx.set_total(len(files))
+
+    def on_item(imported: bool) -> None:
+        ctx.advance(done=1 if imported else 0, failed=0 if imported else 1)
+
+    # 中文注释：按需逐个读取临时文件，避免一次性把全部图片载入内存。
+    items = (
+        (item["filename"], item["content_type"], Path(item["path"]).read_bytes()) for item in files
+    )
+    batch_no, imported_count = RedPacketService(ctx.db).import_images(
+        items=items,
+        title_prefix=params["title_prefix"],
+        amount=params["amount"],
+        level=params["level"],
+        category_code=params["category_code"],
+        tags=params["tags"],
+        on_item=on_item,
+    )
+    return {"batch_no": batch_no, "imported_count": imported_count}
+
+
+job_runner.register(GIFT_BATCH_CREATE, run_gift_batch_create)
+job_runner.register(GIFT_REGENERATE_QRCODE, run_gift_regenerate_qrcode)
+job_runner.register(RED_PACKET_CSV_IMPORT, run_red_packet_csv_import)
+job_runner.register(RED_PACKET_IMAGE_IMPORT, run_red_packet_image_import)
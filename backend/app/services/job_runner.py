@@ -0,0 +1,164 @@
+import json
+import shutil
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Lock
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.models.job import Job
+from app.repositories.job_repository import JobRepository
+from app.schemas.job import JobItem
+
+JobHandler = Callable[["JobContext", dict[str, Any]], dict[str, Any] | None]
+
+TEMP_DIR_PARAM = "temp_dir"
+
+
+class JobContext:
+    def __init__(self, job_id: int, db: Session):
+        self.job_id = job_id
+        self.db = db
+        self.total = 0
+        self.done = 0
+        self.failed = 0
+
+    def set_total(self, total: int) -> None:
+        self.total = total
+
+    def advance(self, done: int = 1, failed: int = 0) -> None:
+        self.done += done
+        self.failed += failed
+
+    def commit(self) -> None:
+        # 中文注释：进度与业务数据在同一事务提交，避免另开写连接与任务自身的写事务争抢 SQLite 写锁。
+        JobRepository(self.db).update_progress(
+            self.job_id, total=self.total, done=self.done, failed=self.failed
+        )
+        self.db.commit()
+
+
+class JobRunner:
+    def __init__(self) -> None:
+        self._handlers: dict[str, JobHandler] = {}
+        self._live: dict[int, JobContext] = {}
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = Lock()
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        self._handlers[kind] = handler
+
+    def start(self) -> None:
+        settings = get_settings()
+        db = SessionLocal()
+        try:
+            # 中文注释：进程重启后上次未完成的任务不会再被执行，统一标记失败，避免前端一直轮询。
+            JobRepository(db).fail_unfinished("服务重启，任务已中断")
+            db.commit()
+        finally:
+            db.close()
+        shutil.rmtree(Path(settings.job_temp_dir), ignore_errors=True)
+        self._ensure_executor()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def create_temp_dir(self) -> Path:
+        path = Path(get_settings().job_temp_dir) / uuid4().hex
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def submit(self, kind: str, params: dict[str, Any], user_id: int | None = None) -> int:
+        if kind not in self._handlers:
+            raise ValueError(f"未知的任务类型: {kind}")
+        db = SessionLocal()
+        try:
+            job = JobRepository(db).create_job(
+                kind=kind,
+                params_json=json.dumps(params, ensure_ascii=False, default=str),
+                user_id=user_id,
+            )
+            db.commit()
+            job_id = job.id
+        finally:
+            db.close()
+        self._ensure_executor().submit(self._execute, job_id, kind, params)
+        return job_id
+
+    def describe_by_id(self, db: Session, job_id: int) -> JobItem | None:
+        job = JobRepository(db).get_job(job_id)
+        return self.describe(job) if job else None
+
+    def describe(self, job: Job) -> JobItem:
+        total, done, failed = job.progress_total, job.progress_done, job.progress_failed
+        ctx = self._live.get(job.id)
+        if ctx is not None:
+            # 中文注释：运行中的任务优先返回内存里的实时进度，数据库中的进度只在分片提交时更新。
+            total, done, failed = ctx.total, ctx.done, ctx.failed
+        return JobItem(
+            id=job.id,
+            kind=job.kind,
+            status=job.status,
+            progress_total=total,
+            progress_done=done,
+            progress_failed=failed,
+            result=json.loads(job.result_json) if job.result_json else None,
+            error=job.error,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+        )
+
+    def _ensure_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max(1, get_settings().job_workers), thread_name_prefix="job"
+                )
+            return self._executor
+
+    def _execute(self, job_id: int, kind: str, params: dict[str, Any]) -> None:
+        handler = self._handlers[kind]
+        db = SessionLocal()
+        repo = JobRepository(db)
+        ctx = JobContext(job_id, db)
+        try:
+            if not repo.mark_running(job_id):
+                db.commit()
+                return
+            db.commit()
+            self._live[job_id] = ctx
+            started = time.perf_counter()
+            try:
+                result = handler(ctx, params) or {}
+                result.setdefault("elapsed_ms", int((time.perf_counter() - started) * 1000))
+                repo.update_progress(job_id, total=ctx.total, done=ctx.done, failed=ctx.failed)
+                repo.finish(
+                    job_id,
+                    status="done",
+                    result_json=json.dumps(result, ensure_ascii=False, default=str),
+                )
+                db.commit()
+            except Exception as exc:
+                db.rollback()
+                repo.update_progress(job_id, total=ctx.total, done=ctx.done, failed=ctx.failed)
+                repo.finish(job_id, status="failed", error=str(exc) or type(exc).__name__)
+                db.commit()
+        finally:
+            self._live.pop(job_id, None)
+            db.close()
+            temp_dir = params.get(TEMP_DIR_PARAM)
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+job_runner = JobRunner()
@@ -0,0 +1,100 @@
+import gzip
+import json
+import os
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+from app.core.config import get_settings
+
+PART_SUFFIX = ".jsonl.gz"
+TEMP_SUFFIX = ".tmp"
+READ_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class ArchivePartFile:
+    filename: str
+    first_id: int
+    last_id: int
+    row_count: int
+    byte_size: int
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+class LogArchiveStore:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def path_for(self, table: str, day: str, filename: str) -> Path:
+        return self.root / table / day / filename
+
+    def write_part(self, table: str, day: str, rows: list[dict[str, Any]]) -> ArchivePartFile:
+        # 中文注释：按表和 UTC 日期分目录，每批一个分片，文件名带本批最小与最大 id，
+        # 同一批重试时覆盖同名文件。
+        ids = [row["id"] for row in rows]
+        first_id, last_id = min(ids), max(ids)
+        filename = f"{first_id:012d}-{last_id:012d}{PART_SUFFIX}"
+        target = self.path_for(table, day, filename)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp = target.with_name(filename + TEMP_SUFFIX)
+        with temp.open("wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as stream:
+                for row in rows:
+                    line = json.dumps(row, ensure_ascii=False, default=_json_default)
+                    stream.write(line.encode("utf-8") + b"\n")
+            raw.flush()
+            os.fsync(raw.fileno())
+        # 中文注释：写完并刷盘后再原子改名，归档目录里不会出现写了一半的分片。
+        os.replace(temp, target)
+        return ArchivePartFile(
+            filename=filename,
+            first_id=first_id,
+            last_id=last_id,
+            row_count=len(rows),
+            byte_size=target.stat().st_size,
+        )
+
+    def sweep_orphans(self, table: str, known: set[tuple[str, str]], older_than: float) -> int:
+        # 中文注释：分片只有登记进清单才算归档成功；写完文件但删除事务没提交时留下的孤儿文件
+        # 读取时本就被忽略，这里按修改时间延后清理，避免误删另一进程刚写出、尚未提交的分片。
+        table_dir = self.root / table
+        if not table_dir.is_dir():
+            return 0
+        deadline = time.time() - older_than
+        removed = 0
+        for day_dir in table_dir.iterdir():
+            if not day_dir.is_dir():
+                continue
+            for path in day_dir.iterdir():
+                if (day_dir.name, path.name) in known or path.stat().st_mtime > deadline:
+                    continue
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def iter_bytes(self, paths: Iterable[Path]) -> Iterator[bytes]:
+        # 中文注释：多个 gzip 分片首尾相接仍是合法的 gzip 流，下载时直接拼接原始字节，
+        # 不解压也不占内存。
+        for path in paths:
+            with path.open("rb") as handle:
+                while chunk := handle.read(READ_CHUNK_SIZE):
+                    yield chunk
+
+    def iter_records(self, paths: Iterable[Path]) -> Iterator[dict[str, Any]]:
+        for path in paths:
+            with gzip.open(path, "rt", encoding="utf-8") as stream:
+                for line in stream:
+                    if line.strip():
+                        yield json.loads(line)
+
+
+log_archive_store = LogArchiveStore(Path(get_settings().log_archive_dir))
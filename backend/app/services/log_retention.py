@@ -0,0 +1,209 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime, timedelta
+from threading import Event, Lock
+from typing import Any
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.models.gift import GiftClaimLog
+from app.models.log import AccessLog
+from app.repositories.claim_rollup_repository import CLAIM_ROLLUP_WATERMARK
+from app.repositories.log_repository import LogRepository
+from app.repositories.watermark_repository import WatermarkRepository
+from app.services.log_archive import LogArchiveStore, log_archive_store
+
+logger = logging.getLogger(__name__)
+
+# 中文注释：批次之间稍作停顿，让等待写锁的请求有机会插入，不被连续的删除事务饿死。
+BATCH_PAUSE_SECONDS = 0.02
+# 中文注释：未登记进清单的分片文件超过该时长才清理。
+ORPHAN_GRACE_SECONDS = 3600
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    kind: str
+    model: Any
+    retention_days: int
+    # 中文注释：非空时只归档该水位线已处理过的日志，保证小时汇总先于删除完成。
+    guard_watermark: str | None = None
+
+    @property
+    def table(self) -> str:
+        return self.model.__tablename__
+
+
+@dataclass
+class LogRetentionStats:
+    runs: int = 0
+    batches: int = 0
+    conflicts: int = 0
+    failed: int = 0
+    archived: dict[str, int] = field(default_factory=dict)
+    last_run_at: str | None = None
+
+
+class LogRetentionWorker:
+    def __init__(
+        self,
+        *,
+        store: LogArchiveStore,
+        policies: list[RetentionPolicy],
+        interval_seconds: float,
+        batch_size: int,
+    ) -> None:
+        self.store = store
+        self.policies = {policy.kind: policy for policy in policies}
+        self.interval = max(60.0, interval_seconds)
+        self.batch_size = max(1, batch_size)
+        self.stats = LogRetentionStats()
+        self._lock = Lock()
+        self._halt = Event()
+        self._stopping: asyncio.Event | None = None
+        self._worker: asyncio.Task[None] | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._halt.clear()
+        self._stopping = asyncio.Event()
+        self._worker = asyncio.create_task(self._run(), name="log-retention")
+
+    async def stop(self) -> None:
+        if not self.running or self._stopping is None or self._worker is None:
+            return
+        # 中文注释：通知线程池里正在执行的归档在当前批次结束后退出，不必等整轮跑完。
+        self._halt.set()
+        self._stopping.set()
+        await self._worker
+        self._worker = None
+        self._stopping = None
+
+    def snapshot(self) -> dict[str, Any]:
+        data = asdict(self.stats)
+        data["policies"] = [
+            {"kind": policy.kind, "table": policy.table, "retention_days": policy.retention_days}
+            for policy in self.policies.values()
+        ]
+        data["interval_seconds"] = self.interval
+        data["batch_size"] = self.batch_size
+        data["running"] = self.running
+        return data
+
+    def run_once(self) -> dict[str, int] | None:
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            now = datetime.now(tz=UTC)
+            archived: dict[str, int] = {}
+            for policy in self.policies.values():
+                if policy.retention_days <= 0 or self._halt.is_set():
+                    continue
+                archived[policy.kind] = self._enforce(policy, now)
+                self.stats.archived[policy.kind] = (
+                    self.stats.archived.get(policy.kind, 0) + archived[policy.kind]
+                )
+            self.stats.runs += 1
+            self.stats.last_run_at = now.isoformat()
+            return archived
+        finally:
+            self._lock.release()
+
+    def _enforce(self, policy: RetentionPolicy, now: datetime) -> int:
+        cutoff = now - timedelta(days=policy.retention_days)
+        db = SessionLocal()
+        try:
+            repo = LogRepository(db)
+            self.store.sweep_orphans(
+                policy.table, repo.list_archive_filenames(policy.table), ORPHAN_GRACE_SECONDS
+            )
+            max_id = (
+                WatermarkRepository(db).last_id(policy.guard_watermark)
+                if policy.guard_watermark
+                else None
+            )
+            total = 0
+            while not self._halt.is_set():
+                rows = repo.list_expired(
+                    policy.model, cutoff=cutoff, limit=self.batch_size, max_id=max_id
+                )
+                if not rows:
+                    db.rollback()
+                    break
+                parts: list[dict[str, Any]] = []
+                for day, chunk in _group_by_day(rows).items():
+                    part = self.store.write_part(policy.table, day, chunk)
+                    parts.append({"table_name": policy.table, "day": day, **asdict(part)})
+                # 中文注释：删除原始行与登记分片清单在同一事务提交，清单是归档成功的唯一凭据；
+                # 删除行数对不上说明有并发删除，整批回滚重来，
+                # 已写出的文件不在清单里，读取时会被忽略。
+                if repo.delete_by_ids(policy.model, [row["id"] for row in rows]) != len(rows):
+                    db.rollback()
+                    self.stats.conflicts += 1
+                    continue
+                repo.add_archive_parts(parts)
+                db.commit()
+                total += len(rows)
+                self.stats.batches += 1
+                time.sleep(BATCH_PAUSE_SECONDS)
+            return total
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def _run(self) -> None:
+        assert self._stopping is not None
+        stopping = self._stopping
+        while not stopping.is_set():
+            try:
+                await run_in_threadpool(self.run_once)
+            except Exception:
+                self.stats.failed += 1
+                logger.exception("Failed to enforce log retention")
+            try:
+                await asyncio.wait_for(stopping.wait(), timeout=self.interval)
+            except TimeoutError:
+                continue
+
+
+def _group_by_day(rows: list[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+    groups: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    for row in rows:
+        created_at = row["created_at"]
+        if created_at.tzinfo is not None:
+            created_at = created_at.astimezone(UTC)
+        groups[created_at.date().isoformat()].append(row)
+    return groups
+
+
+def _build_log_retention_worker() -> LogRetentionWorker:
+    settings = get_settings()
+    return LogRetentionWorker(
+        store=log_archive_store,
+        policies=[
+            RetentionPolicy("access", AccessLog, settings.access_log_retention_days),
+            RetentionPolicy(
+                "claims",
+                GiftClaimLog,
+                settings.claim_log_retention_days,
+                guard_watermark=CLAIM_ROLLUP_WATERMARK,
+            ),
+        ],
+        interval_seconds=settings.log_retention_interval_seconds,
+        batch_size=settings.log_retention_batch_size,
+    )
+
+
+log_retention_worker = _build_log_retention_worker()
@@ -0,0 +1,294 @@
+import multiprocessing
+import time
+from collections.abc import Hashable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any
+from urllib.parse import urlparse
+
+import cv2
+import numpy as np
+
+_pool: ProcessPoolExecutor | None = None
+_pool_workers = 0
+_pool_lock = Lock()
+
+POLL_INTERVAL_SECONDS = 0.05
+FAST_MAX_SIDE = 800
+CROP_MARGIN_RATIO = 0.15
+DECODE_STAGES = ("fast", "crop", "threshold", "multi")
+
+
+@dataclass
+class DecodeOutcome:
+    url: str | None = None
+    stage: str = ""
+    timings_ms: dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class DecodeResult:
+    key: Hashable
+    url: str | None
+    error: str = ""
+    stage: str = ""
+
+
+@dataclass
+class DecodeStageStats:
+    attempts: int = 0
+    successes: int = 0
+    total_ms: float = 0.0
+
+
+class DecodeStats:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.images = 0
+        self.decoded = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.stages = {stage: DecodeStageStats() for stage in DECODE_STAGES}
+
+    def record(self, outcome: DecodeOutcome) -> None:
+        with self._lock:
+            self.images += 1
+            if outcome.url:
+                self.decoded += 1
+            for stage, elapsed in outcome.timings_ms.items():
+                item = self.stages[stage]
+                item.attempts += 1
+                item.total_ms += elapsed
+            if outcome.stage:
+                self.stages[outcome.stage].successes += 1
+
+    def record_failure(self, *, timeout: bool) -> None:
+        with self._lock:
+            self.images += 1
+            if timeout:
+                self.timeouts += 1
+            else:
+                self.errors += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "images": self.images,
+                "decoded": self.decoded,
+                "timeouts": self.timeouts,
+                "errors": self.errors,
+                "stages": [
+                    {
+                        "stage": stage,
+                        "attempts": item.attempts,
+                        "successes": item.successes,
+                        "avg_ms": round(item.total_ms / item.attempts, 2) if item.attempts else 0,
+                    }
+                    for stage, item in self.stages.items()
+                ],
+            }
+
+
+decode_stats = DecodeStats()
+
+
+def is_valid_claim_url(value: str) -> bool:
+    try:
+        parsed = urlparse(value)
+    except Exception:
+        return False
+    if parsed.scheme not in {"http", "https", "alipays"}:
+        return False
+    if parsed.scheme in {"http", "https"} and not parsed.netloc:
+        return False
+    return True
+
+
+def decode_qrcode(raw: bytes) -> DecodeOutcome:
+    outcome = DecodeOutcome()
+    matrix = np.frombuffer(raw, dtype=np.uint8)
+    image = cv2.imdecode(matrix, cv2.IMREAD_GRAYSCALE)
+    if image is None:
+        return outcome
+
+    detector = cv2.QRCodeDetector()
+    # 中文注释：各阶段按成本从低到高排列，任一阶段拿到文本即停止；
+    # 大多数截图在缩小后的灰度图上即可识别。
+    small, scale = _downscale(image, FAST_MAX_SIDE)
+    region: np.ndarray | None = None
+
+    text, points = _run_stage(outcome, "fast", lambda: _detect_and_decode(detector, small))
+    if not text:
+        located = points / scale if points is not None else None
+        text, region = _run_stage(outcome, "crop", lambda: _decode_crop(detector, image, located))
+    if not text:
+        target = region if region is not None and region.size else image
+        text, _ = _run_stage(outcome, "threshold", lambda: _decode_variants(detector, target))
+    if not text:
+        text, _ = _run_stage(outcome, "multi", lambda: _detect_and_decode_multi(detector, image))
+
+    candidate = text.strip()
+    if candidate and is_valid_claim_url(candidate):
+        outcome.url = candidate
+    return outcome
+
+
+def decode_qrcode_url(raw: bytes) -> str | None:
+    return decode_qrcode(raw).url
+
+
+def _run_stage(outcome: DecodeOutcome, stage: str, func) -> tuple[str, np.ndarray | None]:
+    started = time.perf_counter()
+    try:
+        text, points = func()
+    except cv2.error:
+        text, points = "", None
+    outcome.timings_ms[stage] = (time.perf_counter() - started) * 1000
+    text = text.strip() if isinstance(text, str) else ""
+    if text:
+        outcome.stage = stage
+    return text, points
+
+
+def _downscale(image: np.ndarray, max_side: int) -> tuple[np.ndarray, float]:
+    height, width = image.shape[:2]
+    longest = max(height, width)
+    if longest <= max_side:
+        return image, 1.0
+    scale = max_side / longest
+    size = (max(1, int(width * scale)), max(1, int(height * scale)))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA), scale
+
+
+def _crop_region(image: np.ndarray, points: np.ndarray) -> np.ndarray:
+    corners = points.reshape(-1, 2)
+    x0, y0 = corners.min(axis=0)
+    x1, y1 = corners.max(axis=0)
+    margin = max(x1 - x0, y1 - y0) * CROP_MARGIN_RATIO
+    height, width = image.shape[:2]
+    left = int(max(0, x0 - margin))
+    top = int(max(0, y0 - margin))
+    right = int(min(width, x1 + margin))
+    bottom = int(min(height, y1 + margin))
+    return image[top:bottom, left:right]
+
+
+def _decode_crop(
+    detector, image: np.ndarray, points: np.ndarray | None
+) -> tuple[str, np.ndarray | None]:
+    if points is None:
+        # 中文注释：缩小图上连定位都失败时，在全分辨率图上重新定位一次。
+        found, points = detector.detect(image)
+        if not found or points is None:
+            return "", None
+    region = _crop_region(image, points)
+    if not region.size:
+        return "", None
+    text, _ = _detect_and_decode(detector, region)
+    return text, region
+
+
+def _detect_and_decode(detector, image: np.ndarray) -> tuple[str, np.ndarray | None]:
+    text, points, _ = detector.detectAndDecode(image)
+    return text, points
+
+
+def _decode_variants(detector, image: np.ndarray) -> tuple[str, None]:
+    binary = cv2.adaptiveThreshold(
+        image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 5
+    )
+    blurred = cv2.GaussianBlur(image, (0, 0), 3)
+    sharpened = cv2.addWeighted(image, 1.5, blurred, -0.5, 0)
+    for variant in (binary, sharpened):
+        text, _ = _detect_and_decode(detector, variant)
+        if text:
+            return text, None
+    return "", None
+
+
+def _detect_and_decode_multi(detector, image: np.ndarray) -> tuple[str, None]:
+    if not hasattr(detector, "detectAndDecodeMulti"):
+        return "", None
+    ok, decoded_info, _, _ = detector.detectAndDecodeMulti(image)
+    if ok and decoded_info:
+        for item in decoded_info:
+            if (item or "").strip():
+                return item, None
+    return "", None
+
+
+def get_decode_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None:
+            # 中文注释：使用 spawn 启动子进程，避免在多线程的 Web 进程里 fork 继承锁状态。
+            _pool_workers = max(1, workers)
+            _pool = ProcessPoolExecutor(
+                max_workers=_pool_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def shutdown_decode_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def decode_images(
+    items: Iterable[tuple[Hashable, bytes]], *, workers: int, timeout: float | None = None
+) -> Iterator[DecodeResult]:
+    # 中文注释：按完成先后逐个产出结果；在途图片数限制为进程数的两倍，
+    # 输入可以是惰性读取文件的生成器。
+    pool = get_decode_pool(workers)
+    window = max(1, _pool_workers) * 2
+    source = iter(items)
+    pending: dict[Future, Hashable] = {}
+    started_at: dict[Future, float] = {}
+    exhausted = False
+
+    while pending or not exhausted:
+        while not exhausted and len(pending) < window:
+            try:
+                key, raw = next(source)
+            except StopIteration:
+                exhausted = True
+                break
+            if not raw:
+                yield DecodeResult(key=key, url=None, error="空文件")
+                continue
+            pending[pool.submit(decode_qrcode, raw)] = key
+        if not pending:
+            continue
+
+        done, _ = wait(pending, timeout=POLL_INTERVAL_SECONDS, return_when=FIRST_COMPLETED)
+        for future in done:
+            key = pending.pop(future)
+            started_at.pop(future, None)
+            try:
+                outcome = future.result()
+            except Exception as exc:
+                decode_stats.record_failure(timeout=False)
+                yield DecodeResult(key=key, url=None, error=f"解码失败: {exc}")
+                continue
+            decode_stats.record(outcome)
+            yield DecodeResult(key=key, url=outcome.url, stage=outcome.stage)
+
+        if timeout is None:
+            continue
+        # 中文注释：单张图片从开始执行起超时即放弃等待；子进程无法中途打断，会继续占用到自行结束。
+        now = time.monotonic()
+        for future in list(pending):
+            if future not in started_at:
+                if future.running():
+                    started_at[future] = now
+                continue
+            if now - started_at[future] > timeout:
+                key = pending.pop(future)
+                started_at.pop(future)
+                future.cancel()
+                decode_stats.record_failure(timeout=True)
+                yield DecodeResult(key=key, url=None, error="解码超时")
@@ -0,0 +1,58 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from threading import Lock
+
+import numpy as np
+import qrcode
+from PIL import Image
+
+from app.core.config import get_settings
+
+QR_BOX_SIZE = 10
+QR_BORDER = 2
+# 中文注释：调色板索引 0 为白色、1 为黑色，与模块矩阵中 True 表示深色模块一致。
+_PALETTE = [255, 255, 255, 0, 0, 0]
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = Lock()
+
+
+def render_qrcode_png(content: str) -> bytes:
+    qr = qrcode.QRCode(border=QR_BORDER, box_size=QR_BOX_SIZE)
+    qr.add_data(content)
+    qr.make(fit=True)
+    return render_matrix_png(qr.get_matrix())
+
+
+def render_matrix_png(matrix: list[list[bool]]) -> bytes:
+    # 中文注释：直接取含边框的模块矩阵，用 NumPy 整体放大并按位打包，绕开 PIL 逐模块绘制。
+    modules = np.asarray(matrix, dtype=bool)
+    pixels = modules.repeat(QR_BOX_SIZE, axis=0).repeat(QR_BOX_SIZE, axis=1)
+    height, width = pixels.shape
+    packed = np.packbits(pixels, axis=1).tobytes()
+    image = Image.frombytes("P", (width, height), packed, "raw", "P;1")
+    image.putpalette(_PALETTE)
+    compress_level = max(0, min(9, get_settings().qrcode_png_compress_level))
+    buffer = BytesIO()
+    image.save(buffer, "PNG", bits=1, compress_level=compress_level)
+    return buffer.getvalue()
+
+
+def get_render_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # 中文注释：使用 spawn 启动子进程，避免在多线程的 Web 进程里 fork 继承锁状态。
+            _pool = ProcessPoolExecutor(
+                max_workers=max(1, workers), mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def shutdown_render_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
@@ -1,11 +1,10 @@
 from datetime import datetime
-from io import BytesIO
 from secrets import token_urlsafe
 
-import qrcode
 from sqlalchemy.orm import Session
 
 from app.repositories.qrcode_repository import QrcodeRepository
+from app.services.qr_render import render_qrcode_png
 from app.services.system_config_service import get_runtime_storage_config
 from app.storage.factory import get_storage
 
@@ -38,13 +37,7 @@ class QrcodeService:
         return batch_no
 
     def _render_qrcode(self, content: str) -> bytes:
-        qr = qrcode.QRCode(border=2, box_size=10)
-        qr.add_data(content)
-        qr.make(fit=True)
-        image = qr.make_image(fill_color="black", back_color="white")
-        buffer = BytesIO()
-        image.save(buffer, "PNG")
-        return buffer.getvalue()
+        return render_qrcode_png(content)
 
     def _build_object_key(self, batch_no: str, short_code: str) -> str:
         now = datetime.now()
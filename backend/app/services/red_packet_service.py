@@ -1,17 +1,16 @@
 import csv
-from datetime import datetime
-from io import StringIO
+import io
 import json
 import re
-from typing import Any
-from urllib.parse import urlparse
+from collections.abc import Callable, Iterable, Iterator
+from datetime import datetime
+from typing import Any, BinaryIO
 
-import cv2
-from fastapi import UploadFile
-import numpy as np
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
 from app.repositories.red_packet_repository import RedPacketRepository
+from app.services.qr_decode import DecodeResult, decode_images, is_valid_claim_url
 from app.services.system_config_service import get_runtime_storage_config
 from app.storage.factory import get_storage
 
@@ -119,9 +118,15 @@ class RedPacketService:
         self._bind_tags(item.id, tags)
         self.db.commit()
 
-    def import_csv(self, content: bytes) -> tuple[str, int]:
-        text = content.decode("utf-8-sig")
-        reader = csv.DictReader(StringIO(text))
+    def import_csv(
+        self,
+        stream: BinaryIO,
+        on_chunk: Callable[[int, int], None] | None = None,
+    ) -> tuple[str, int, int, list[dict[str, Any]]]:
+        settings = get_settings()
+        chunk_size = max(1, settings.csv_import_chunk_size)
+        max_errors = max(0, settings.csv_import_max_errors)
+
         self.ensure_builtin_categories()
         misc = self.repo.get_category_by_code("misc")
         if not misc:
@@ -129,43 +134,107 @@ class RedPacketService:
 
         batch_no = f"RP{datetime.now().strftime('%Y%m%d%H%M%S')}"
         batch = self.repo.create_batch(batch_no=batch_no, source="csv")
+        batch_id = batch.id
+        self.db.commit()
 
-        count = 0
-        for row in reader:
-            claim_url = (row.get("claim_url") or row.get("content_value") or "").strip()
+        imported = 0
+        failed = 0
+        errors: list[dict[str, Any]] = []
+        chunk: list[dict[str, Any]] = []
+
+        def flush_chunk() -> None:
+            nonlocal imported
+            if chunk:
+                self.repo.bulk_create_items(chunk)
+                self.db.commit()
+                imported += len(chunk)
+            if on_chunk:
+                on_chunk(imported, failed)
+            chunk.clear()
+
+        def record_error(line_no: int, reason: str) -> None:
+            nonlocal failed
+            failed += 1
+            if len(errors) < max_errors:
+                errors.append({"line": line_no, "reason": reason})
+
+        # 中文注释：逐行解析、按分片批量写入并提交，内存占用与文件大小无关，只与分片大小有关。
+        last_line = 1
+        try:
+            for line_no, row in self._iter_csv_rows(stream):
+                last_line = line_no
+                try:
+                    chunk.append(
+                        self._csv_row_to_item(row, batch_id, misc.id, imported + len(chunk))
+                    )
+                except ValueError as exc:
+                    record_error(line_no, str(exc))
+                    continue
+                if len(chunk) >= chunk_size:
+                    flush_chunk()
+        except UnicodeDecodeError:
+            # 中文注释：此前的分片已经提交，不能整体报失败；解码或格式错误之后的内容无法可靠续读，
+            # 记为一条行级错误并停止读取，已导入的部分按部分成功返回，避免管理员重传造成重复。
+            record_error(last_line + 1, "文件编码不是 UTF-8，该行及之后的内容未导入")
+        except csv.Error as exc:
+            record_error(last_line + 1, f"CSV 格式错误，该行及之后的内容未导入：{exc}")
+        flush_chunk()
+
+        return batch_no, imported, failed, errors
+
+    @staticmethod
+    def _iter_csv_rows(stream: BinaryIO) -> Iterator[tuple[int, dict[str, str]]]:
+        text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+        try:
+            reader = csv.DictReader(text)
+            for row in reader:
+                yield reader.line_num, row
+        finally:
+            # 中文注释：解除包装，避免 TextIOWrapper 被回收时顺带关闭调用方持有的底层文件。
+            text.detach()
+
+    def _csv_row_to_item(
+        self, row: dict[str, str], batch_id: int, category_id: int, position: int
+    ) -> dict[str, Any]:
+        claim_url = (row.get("claim_url") or row.get("content_value") or "").strip()
+        if not claim_url:
+            raise ValueError("缺少领取链接")
+        try:
             amount = float((row.get("amount") or "0").strip())
+        except ValueError as exc:
+            raise ValueError("金额格式错误") from exc
+        try:
             level = int((row.get("level") or "1").strip())
-            title = (row.get("title") or f"红包{count + 1}").strip()
-            available_from = self._parse_dt(row.get("available_from"))
-            available_to = self._parse_dt(row.get("available_to"))
-            if not claim_url:
-                continue
-            self.repo.create_item(
-                batch_id=batch.id,
-                title=title,
-                amount=amount,
-                level=level,
-                content_type="url",
-                content_value=claim_url,
-                category_id=misc.id,
-                meta_json="{}",
-                available_from=available_from,
-                available_to=available_to,
-            )
-            count += 1
-
-        self.db.commit()
-        return batch_no, count
+        except ValueError as exc:
+            raise ValueError("等级格式错误") from exc
+        title = (row.get("title") or f"红包{position + 1}").strip()
+        return {
+            "batch_id": batch_id,
+            "title": title[:120],
+            "category_id": category_id,
+            "amount": amount,
+            "level": level,
+            "content_type": "url",
+            "content_value": claim_url,
+            "content_image_url": "",
+            "content_image_key": "",
+            "meta_json": "{}",
+            "claim_url": claim_url,
+            "status": "idle",
+            "available_from": self._parse_dt(row.get("available_from")),
+            "available_to": self._parse_dt(row.get("available_to")),
+        }
 
-    async def import_image_files(
+    def import_images(
         self,
         *,
-        files: list[UploadFile],
+        items: Iterable[tuple[str, str, bytes]],
         title_prefix: str,
         amount: float,
         level: int,
         category_code: str | None,
         tags: list[str],
+        on_item: Callable[[bool], None] | None = None,
     ) -> tuple[str, int]:
         self.ensure_builtin_categories()
         category = self._resolve_category(category_code, None, "qr_image")
@@ -173,74 +242,97 @@ class RedPacketService:
         batch = self.repo.create_batch(batch_no=batch_no, source="image")
 
         count = 0
-        for index, upload in enumerate(files, start=1):
-            filename = upload.filename or f"image-{index}.png"
-            raw = await upload.read()
-            if not raw:
-                continue
-            title = f"{title_prefix}-{index}" if title_prefix else f"支付宝红包-{index}"
+        if category.code == "alipay_red_packet":
+            decoded = self._decode_images(
+                (index, raw) for index, (_filename, _type, raw) in enumerate(items, start=1)
+            )
+            for result in decoded:
+                imported = bool(result.url)
+                if imported:
+                    item = self.repo.create_item(
+                        batch_id=batch.id,
+                        title=self._image_title(title_prefix, result.key),
+                        amount=float(amount),
+                        level=level,
+                        content_type="url",
+                        content_value=result.url,
+                        content_image_url="",
+                        content_image_key="",
+                        category_id=category.id,
+                        meta_json="{}",
+                    )
+                    self._bind_tags(item.id, tags)
+                    count += 1
+                if on_item:
+                    on_item(imported)
+            self.db.commit()
+            return batch_no, count
 
-            if category.code == "alipay_red_packet":
-                decoded_url = self._decode_qrcode_url(raw)
-                if not decoded_url:
-                    continue
+        for index, (filename, content_type, raw) in enumerate(items, start=1):
+            imported = bool(raw)
+            if imported:
+                key = self._build_object_key(filename)
+                image_url = self.storage.upload_bytes(key, raw, content_type or "image/png")
                 item = self.repo.create_item(
                     batch_id=batch.id,
-                    title=title,
+                    title=self._image_title(title_prefix, index),
                     amount=float(amount),
                     level=level,
-                    content_type="url",
-                    content_value=decoded_url,
-                    content_image_url="",
-                    content_image_key="",
+                    content_type="qr_image",
+                    content_value="",
+                    content_image_url=image_url,
+                    content_image_key=key,
                     category_id=category.id,
                     meta_json="{}",
                 )
                 self._bind_tags(item.id, tags)
                 count += 1
-                continue
-
-            key = self._build_object_key(filename)
-            image_url = self.storage.upload_bytes(key, raw, upload.content_type or "image/png")
-            item = self.repo.create_item(
-                batch_id=batch.id,
-                title=title,
-                amount=float(amount),
-                level=level,
-                content_type="qr_image",
-                content_value="",
-                content_image_url=image_url,
-                content_image_key=key,
-                category_id=category.id,
-                meta_json="{}",
-            )
-            self._bind_tags(item.id, tags)
-            count += 1
+            if on_item:
+                on_item(imported)
 
         self.db.commit()
         return batch_no, count
 
-    async def parse_image_files_to_urls(
-        self, files: list[UploadFile]
+    def parse_images_to_urls(
+        self, items: Iterable[tuple[str, bytes]]
     ) -> tuple[int, int, list[dict[str, str]]]:
-        results: list[dict[str, str]] = []
+        filenames: dict[int, str] = {}
+
+        def indexed() -> Iterator[tuple[int, bytes]]:
+            for index, (filename, raw) in enumerate(items, start=1):
+                filenames[index] = filename
+                yield index, raw
+
+        results: dict[int, dict[str, str]] = {}
         success = 0
         failed = 0
-        for index, upload in enumerate(files, start=1):
-            filename = upload.filename or f"image-{index}.png"
-            raw = await upload.read()
-            if not raw:
-                failed += 1
-                results.append({"filename": filename, "status": "failed", "decoded_url": ""})
-                continue
-            decoded_url = self._decode_qrcode_url(raw)
-            if not decoded_url:
+        for result in self._decode_images(indexed()):
+            filename = filenames[result.key]
+            if not result.url:
                 failed += 1
-                results.append({"filename": filename, "status": "failed", "decoded_url": ""})
+                results[result.key] = {"filename": filename, "status": "failed", "decoded_url": ""}
                 continue
             success += 1
-            results.append({"filename": filename, "status": "success", "decoded_url": decoded_url})
-        return success, failed, results
+            results[result.key] = {
+                "filename": filename,
+                "status": "success",
+                "decoded_url": result.url,
+            }
+        # 中文注释：解码按完成先后返回，响应仍按上传顺序排列，方便前端逐行对照。
+        return success, failed, [results[index] for index in sorted(results)]
+
+    @staticmethod
+    def _decode_images(items: Iterable[tuple[int, bytes]]) -> Iterator[DecodeResult]:
+        settings = get_settings()
+        return decode_images(
+            items,
+            workers=settings.qr_decode_workers,
+            timeout=settings.qr_decode_timeout_seconds or None,
+        )
+
+    @staticmethod
+    def _image_title(title_prefix: str, index: int) -> str:
+        return f"{title_prefix}-{index}" if title_prefix else f"支付宝红包-{index}"
 
     def import_urls(
         self,
@@ -262,7 +354,7 @@ class RedPacketService:
         count = 0
         for index, row in enumerate(urls, start=1):
             candidate_url = (row.get("url") or "").strip()
-            if not candidate_url or not self._is_valid_url(candidate_url):
+            if not candidate_url or not is_valid_claim_url(candidate_url):
                 continue
             source_name = (row.get("filename") or "").strip()
             title = f"{title_prefix}-{index}" if title_prefix else f"支付宝红包-{index}"
@@ -288,48 +380,6 @@ class RedPacketService:
         self.db.commit()
         return batch_no, count
 
-    @staticmethod
-    def _decode_qrcode_url(raw: bytes) -> str | None:
-        matrix = np.frombuffer(raw, dtype=np.uint8)
-        image = cv2.imdecode(matrix, cv2.IMREAD_COLOR)
-        if image is None:
-            return None
-
-        detector = cv2.QRCodeDetector()
-        text, _, _ = detector.detectAndDecode(image)
-        candidate = text.strip() if isinstance(text, str) else ""
-
-        if not candidate and hasattr(detector, "detectAndDecodeMulti"):
-            try:
-                ok, decoded_info, _, _ = detector.detectAndDecodeMulti(image)
-            except Exception:
-                ok = False
-                decoded_info = []
-            if ok and decoded_info:
-                for item in decoded_info:
-                    next_candidate = (item or "").strip()
-                    if next_candidate:
-                        candidate = next_candidate
-                        break
-
-        if not candidate:
-            return None
-        if not RedPacketService._is_valid_url(candidate):
-            return None
-        return candidate
-
-    @staticmethod
-    def _is_valid_url(value: str) -> bool:
-        try:
-            parsed = urlparse(value)
-        except Exception:
-            return False
-        if parsed.scheme not in {"http", "https", "alipays"}:
-            return False
-        if parsed.scheme in {"http", "https"} and not parsed.netloc:
-            return False
-        return True
-
     def _resolve_category(
         self, category_code: str | None, custom_category_name: str | None, content_type: str
     ):
@@ -1,16 +1,43 @@
 import json
+import logging
+import time
+from dataclasses import dataclass
+from threading import Lock
 from typing import Any
 
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.core.ip_matcher import IpRangeMatcher, parse_ip_network
+from app.core.rate_limit import SlidingWindowLimiter
 from app.repositories.security_repository import SecurityRepository
 
+logger = logging.getLogger(__name__)
+
 DEFAULT_RULES: dict[str, Any] = {
     "claim_enabled": True,
     "ip_whitelist": [],
     "ip_blacklist": [],
     "max_per_ip_per_hour": 5,
 }
+CLAIM_RATE_WINDOW_SECONDS = 3600
+
+
+@dataclass(frozen=True)
+class SecurityRulesSnapshot:
+    claim_enabled: bool
+    ip_whitelist: IpRangeMatcher
+    ip_blacklist: IpRangeMatcher
+    max_per_ip_per_hour: int
+
+
+@dataclass
+class ClaimAccessDecision:
+    allowed: bool
+    status_code: int = 200
+    message: str = ""
+    retry_after: int = 0
 
 
 class SecurityService:
@@ -35,6 +62,7 @@ class SecurityService:
             self.repo.upsert_rule(key, json.dumps(value, ensure_ascii=False))
 
         self.db.commit()
+        security_rules_cache.replace(current)
         return current
 
     @staticmethod
@@ -43,3 +71,126 @@ class SecurityService:
             return json.loads(raw)
         except json.JSONDecodeError:
             return raw
+
+
+class SecurityRulesCache:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._snapshot: SecurityRulesSnapshot | None = None
+
+    def get(self, db: Session) -> SecurityRulesSnapshot:
+        # 中文注释：领取链路只读内存中的规则快照，规则更新提交后再失效重载，扫码时不再查询规则表。
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = self._compile(SecurityService(db).get_rules())
+            return self._snapshot
+
+    def replace(self, rules: dict[str, Any]) -> None:
+        # 中文注释：先在锁外编译好新快照再整体替换，编译大名单期间扫码请求继续使用旧快照，
+        # 不会读到半成品。
+        snapshot = self._compile(rules)
+        with self._lock:
+            self._snapshot = snapshot
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+
+    @staticmethod
+    def _compile(rules: dict[str, Any]) -> SecurityRulesSnapshot:
+        try:
+            max_per_hour = int(rules.get("max_per_ip_per_hour"))
+        except (TypeError, ValueError):
+            max_per_hour = DEFAULT_RULES["max_per_ip_per_hour"]
+        return SecurityRulesSnapshot(
+            claim_enabled=bool(rules.get("claim_enabled", True)),
+            ip_whitelist=IpRangeMatcher(_as_ip_list(rules.get("ip_whitelist"))),
+            ip_blacklist=IpRangeMatcher(_as_ip_list(rules.get("ip_blacklist"))),
+            max_per_ip_per_hour=max(1, max_per_hour),
+        )
+
+
+class ClaimAccessGuard:
+    def __init__(self, limiter: SlidingWindowLimiter) -> None:
+        self.limiter = limiter
+
+    def check(self, db: Session, ip: str) -> ClaimAccessDecision:
+        rules = security_rules_cache.get(db)
+        if not rules.claim_enabled:
+            return ClaimAccessDecision(False, 403, "领取功能已暂停")
+        if ip in rules.ip_blacklist:
+            return ClaimAccessDecision(False, 403, "当前 IP 已被禁止领取")
+        if ip in rules.ip_whitelist:
+            return ClaimAccessDecision(True)
+        # 中文注释：频率判定只依赖内存计数，不再对领取日志做 COUNT；被限流的请求也不写领取日志。
+        retry_after = self.limiter.hit(ip, rules.max_per_ip_per_hour)
+        if retry_after:
+            return ClaimAccessDecision(False, 429, "领取过于频繁，请稍后再试", retry_after)
+        return ClaimAccessDecision(True)
+
+    def restore(self) -> None:
+        if not get_settings().claim_rate_limit_persist:
+            return
+        db = SessionLocal()
+        try:
+            # 中文注释：只需恢复上一窗口及之后的计数，更早的窗口对滑动估算已无影响。
+            rows = SecurityRepository(db).list_rate_limit_windows(
+                self._current_window_start() - self.limiter.window_seconds
+            )
+            self.limiter.load_state(rows)
+        except Exception:
+            logger.exception("claim rate limit restore failed")
+        finally:
+            db.close()
+
+    def persist(self) -> None:
+        if not get_settings().claim_rate_limit_persist:
+            return
+        db = SessionLocal()
+        try:
+            SecurityRepository(db).replace_rate_limit_windows(self.limiter.export_state())
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("claim rate limit persist failed")
+        finally:
+            db.close()
+
+    def _current_window_start(self) -> int:
+        window = self.limiter.window_seconds
+        return int(time.time() // window) * window
+
+
+def warm_security_rules() -> None:
+    # 中文注释：启动时预先编译规则快照，首个扫码请求不必承担大名单的编译耗时。
+    db = SessionLocal()
+    try:
+        security_rules_cache.get(db)
+    except Exception:
+        logger.exception("security rules warm-up failed")
+    finally:
+        db.close()
+
+
+def _as_ip_list(value: Any) -> list[str]:
+    if not isinstance(value, list):
+        return []
+    entries: list[str] = []
+    for item in value:
+        raw = str(item).strip()
+        try:
+            parse_ip_network(raw)
+        except ValueError:
+            # 中文注释：历史数据里的无效条目直接跳过，不能让一条脏数据拖垮整张名单。
+            continue
+        entries.append(raw)
+    return entries
+
+
+security_rules_cache = SecurityRulesCache()
+claim_access_guard = ClaimAccessGuard(
+    SlidingWindowLimiter(CLAIM_RATE_WINDOW_SECONDS, get_settings().claim_rate_limit_max_keys)
+)
@@ -1,5 +1,6 @@
-from dataclasses import dataclass
 import json
+from dataclasses import dataclass, replace
+from threading import Lock
 from typing import Any
 from uuid import uuid4
 
@@ -11,7 +12,9 @@ from app.models.log import OperationLog
 from app.repositories.system_config_repository import SystemConfigRepository
 from app.schemas.system_config import (
     ClaimContactResponse,
+    StorageChannelHealthItem,
     StorageChannelItem,
+    StorageChannelsHealthResponse,
     StorageChannelsResponse,
     StorageChannelsUpdateRequest,
     StorageChannelTestRequest,
@@ -20,8 +23,10 @@ from app.schemas.system_config import (
     StorageConfigUpdateRequest,
 )
 from app.storage.aliyun_oss_storage import AliyunOssStorage
+from app.storage.health import storage_health
 from app.storage.local_storage import LocalFileStorage
 from app.storage.minio_storage import MinioStorage
+from app.storage.registry import config_fingerprint, storage_registry
 
 SECRET_KEYS = {
     "minio_access_key",
@@ -48,6 +53,7 @@ STRIP_KEYS = {
 CLAIM_CONTACT_KEY = "claim_contact_text"
 DEFAULT_CLAIM_CONTACT = "当前礼物未到达激活时间、已兑换或者失效，请联系xxxxxxxxxxx"
 STORAGE_CHANNELS_KEY = "storage_channels_v1"
+STORAGE_CONFIG_VERSION_KEY = "storage_config_version"
 
 
 @dataclass
@@ -67,6 +73,46 @@ class StorageRuntimeConfig:
     aliyun_oss_access_key_secret: str
 
 
+@dataclass
+class StorageConfigSnapshot:
+    version: str
+    runtime: StorageRuntimeConfig
+    channels: list[StorageChannelItem]
+
+
+class StorageConfigCache:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._snapshot: StorageConfigSnapshot | None = None
+
+    def get(self, db: Session) -> StorageConfigSnapshot:
+        # 中文注释：每次只读取一行版本号；版本未变时直接复用已解密、已校验的配置，
+        # 多进程部署下也能及时感知更新。
+        version = SystemConfigRepository(db).get_value(STORAGE_CONFIG_VERSION_KEY) or "0"
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.version == version:
+                return snapshot
+            service = SystemConfigService(db)
+            snapshot = StorageConfigSnapshot(
+                version=version,
+                runtime=service._resolve_runtime_config(),
+                channels=service._load_storage_channels_runtime(),
+            )
+            self._snapshot = snapshot
+            return snapshot
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+
+
+storage_config_cache = StorageConfigCache()
+
+
 class SystemConfigService:
     def __init__(self, db: Session):
         self.db = db
@@ -94,6 +140,22 @@ class SystemConfigService:
         channels = self._load_storage_channels_runtime()
         return StorageChannelsResponse(channels=channels)
 
+    def list_storage_channel_health(self) -> StorageChannelsHealthResponse:
+        channels = storage_config_cache.get(self.db).channels
+        return StorageChannelsHealthResponse(
+            channels=[
+                StorageChannelHealthItem(
+                    id=item.id,
+                    name=item.name,
+                    provider=item.provider,
+                    enabled=item.enabled,
+                    priority=item.priority,
+                    **storage_health.snapshot(item.id),
+                )
+                for item in channels
+            ]
+        )
+
     def update_storage_channels(
         self, payload: StorageChannelsUpdateRequest, user_id: int
     ) -> StorageChannelsResponse:
@@ -115,6 +177,7 @@ class SystemConfigService:
             self._validate_provider_credentials(row)
             normalized.append(row)
 
+        changed_ids = self._changed_channel_ids(self._load_storage_channels_runtime(), channels)
         encrypted = encrypt_text(json.dumps(normalized, ensure_ascii=False))
         self.repo.upsert(STORAGE_CHANNELS_KEY, encrypted, is_secret=True)
         self.db.add(
@@ -124,9 +187,27 @@ class SystemConfigService:
                 detail=f"count={len(normalized)}",
             )
         )
+        self._bump_storage_config_version()
         self.db.commit()
+        storage_config_cache.invalidate()
+        # 中文注释：改过连接配置或已删除的渠道，旧的熔断状态不再代表新配置，清零后立即重新放行；
+        # 对应的旧客户端也一并释放，不必等 LRU 挤出。
+        for channel_id in changed_ids:
+            storage_health.reset(channel_id)
+            storage_registry.invalidate(channel_id)
         return self.list_storage_channels()
 
+    @staticmethod
+    def _changed_channel_ids(
+        previous: list[StorageChannelItem], channels: list[StorageChannelItem]
+    ) -> set[str]:
+        current = {item.id: config_fingerprint(item.model_dump()) for item in channels}
+        return {
+            item.id
+            for item in previous
+            if current.get(item.id) != config_fingerprint(item.model_dump())
+        }
+
     def test_storage_channel(self, payload: StorageChannelTestRequest) -> None:
         merged = payload.model_dump()
         self._validate_provider_credentials(merged)
@@ -186,7 +267,9 @@ class SystemConfigService:
                 detail=f"provider={merged['provider']}, bucket={merged['bucket']}",
             )
         )
+        self._bump_storage_config_version()
         self.db.commit()
+        storage_config_cache.invalidate()
         return self.get_storage_config()
 
     def test_storage_config(self, payload: StorageConfigTestRequest) -> None:
@@ -220,6 +303,11 @@ class SystemConfigService:
         storage.upload_bytes(key=key, data=data, content_type="text/plain")
         storage.delete(key)
 
+    def _bump_storage_config_version(self) -> None:
+        current = self.repo.get_value(STORAGE_CONFIG_VERSION_KEY) or "0"
+        next_version = int(current) + 1 if current.isdigit() else 1
+        self.repo.upsert(STORAGE_CONFIG_VERSION_KEY, str(next_version), is_secret=False)
+
     def _resolve_runtime_config(self) -> StorageRuntimeConfig:
         channels = self._load_storage_channels_runtime()
         for channel in channels:
@@ -387,12 +475,13 @@ class SystemConfigService:
 
 
 def get_runtime_storage_config(db: Session) -> StorageRuntimeConfig:
-    return SystemConfigService(db)._resolve_runtime_config()
+    return replace(storage_config_cache.get(db).runtime)
 
 
 def get_runtime_storage_channels(db: Session) -> list[StorageChannelItem]:
-    channels = SystemConfigService(db).list_storage_channels().channels
-    return [item for item in channels if item.enabled]
+    channels = storage_config_cache.get(db).channels
+    # 中文注释：与 get_runtime_storage_config 一样返回副本，调用方改动渠道不会污染进程级缓存。
+    return [item.model_copy() for item in channels if item.enabled]
 
 
 def get_claim_contact_text(db: Session) -> str:
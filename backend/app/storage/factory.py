@@ -10,6 +10,9 @@ from app.storage.aliyun_oss_storage import AliyunOssStorage
 from app.storage.base import ObjectStorage
 from app.storage.local_storage import LocalFileStorage
 from app.storage.minio_storage import MinioStorage
+from app.storage.registry import storage_registry
+
+RUNTIME_CHANNEL_ID = "__runtime__"
 
 
 def get_storage(db: Session | None = None) -> ObjectStorage:
@@ -24,12 +27,12 @@ def get_storage(db: Session | None = None) -> ObjectStorage:
 
     runtime = get_runtime_storage_config(db)
     runtime_dict = runtime.__dict__
-    return create_storage_from_config(runtime_dict)
+    return storage_registry.get(RUNTIME_CHANNEL_ID, runtime_dict, create_storage_from_config)
 
 
 def create_storage_from_channel(channel: StorageChannelItem) -> ObjectStorage:
     payload = channel.model_dump()
-    return create_storage_from_config(payload)
+    return storage_registry.get(channel.id, payload, create_storage_from_config)
 
 
 def create_storage_from_config(config: dict) -> ObjectStorage:
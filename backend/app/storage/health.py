@@ -0,0 +1,128 @@
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from threading import Lock
+
+from app.core.config import get_settings
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+@dataclass
+class ChannelHealth:
+    state: str = STATE_CLOSED
+    consecutive_failures: int = 0
+    successes: int = 0
+    failures: int = 0
+    ewma_latency_ms: float | None = None
+    opened_at: float = 0.0
+    probe_in_flight: bool = False
+    last_error: str = ""
+    last_success_at: datetime | None = None
+    last_failure_at: datetime | None = None
+
+
+class StorageHealthTracker:
+    def __init__(self, failure_threshold: int, cooldown_seconds: float, ewma_alpha: float) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = cooldown_seconds
+        self.ewma_alpha = ewma_alpha
+        self._channels: dict[str, ChannelHealth] = {}
+        self._lock = Lock()
+
+    def allow(self, channel_id: str) -> bool:
+        with self._lock:
+            health = self._channels.setdefault(channel_id, ChannelHealth())
+            if health.state == STATE_CLOSED:
+                return True
+            if health.state == STATE_OPEN:
+                if time.monotonic() - health.opened_at < self.cooldown_seconds:
+                    return False
+                # 中文注释：冷却结束后进入半开状态，只放行一个探测请求，成功则恢复，失败则重新熔断。
+                health.state = STATE_HALF_OPEN
+                health.probe_in_flight = True
+                return True
+            if health.probe_in_flight:
+                return False
+            health.probe_in_flight = True
+            return True
+
+    def record_success(self, channel_id: str, latency_ms: float) -> None:
+        with self._lock:
+            health = self._channels.setdefault(channel_id, ChannelHealth())
+            self._observe_latency(health, latency_ms)
+            health.successes += 1
+            health.consecutive_failures = 0
+            health.state = STATE_CLOSED
+            health.probe_in_flight = False
+            health.last_success_at = datetime.now(tz=UTC)
+
+    def record_failure(self, channel_id: str, latency_ms: float, error: str) -> None:
+        with self._lock:
+            health = self._channels.setdefault(channel_id, ChannelHealth())
+            self._observe_latency(health, latency_ms)
+            health.failures += 1
+            health.consecutive_failures += 1
+            health.probe_in_flight = False
+            health.last_error = error[:500]
+            health.last_failure_at = datetime.now(tz=UTC)
+            if (
+                health.state == STATE_HALF_OPEN
+                or health.consecutive_failures >= self.failure_threshold
+            ):
+                health.state = STATE_OPEN
+                health.opened_at = time.monotonic()
+
+    def retry_in(self, channel_id: str) -> float:
+        with self._lock:
+            return self._retry_in(self._channels.get(channel_id) or ChannelHealth())
+
+    def snapshot(self, channel_id: str) -> dict:
+        with self._lock:
+            health = self._channels.get(channel_id) or ChannelHealth()
+            retry_in = self._retry_in(health)
+            return {
+                "state": health.state,
+                "consecutive_failures": health.consecutive_failures,
+                "successes": health.successes,
+                "failures": health.failures,
+                "ewma_latency_ms": (
+                    round(health.ewma_latency_ms, 2) if health.ewma_latency_ms is not None else None
+                ),
+                "retry_in_seconds": round(retry_in, 1),
+                "last_error": health.last_error,
+                "last_success_at": health.last_success_at,
+                "last_failure_at": health.last_failure_at,
+            }
+
+    def reset(self, channel_id: str | None = None) -> None:
+        with self._lock:
+            if channel_id is None:
+                self._channels.clear()
+            else:
+                self._channels.pop(channel_id, None)
+
+    def _retry_in(self, health: ChannelHealth) -> float:
+        if health.state != STATE_OPEN:
+            return 0.0
+        return max(0.0, self.cooldown_seconds - (time.monotonic() - health.opened_at))
+
+    def _observe_latency(self, health: ChannelHealth, latency_ms: float) -> None:
+        if health.ewma_latency_ms is None:
+            health.ewma_latency_ms = latency_ms
+            return
+        health.ewma_latency_ms += self.ewma_alpha * (latency_ms - health.ewma_latency_ms)
+
+
+def _build_tracker() -> StorageHealthTracker:
+    settings = get_settings()
+    return StorageHealthTracker(
+        failure_threshold=settings.storage_breaker_failure_threshold,
+        cooldown_seconds=settings.storage_breaker_cooldown_seconds,
+        ewma_alpha=settings.storage_latency_ewma_alpha,
+    )
+
+
+storage_health = _build_tracker()
@@ -0,0 +1,71 @@
+import hashlib
+import json
+from collections import OrderedDict
+from threading import Lock
+from typing import Any
+
+from app.storage.base import ObjectStorage
+
+# 中文注释：这些字段只影响渠道展示与调度顺序，不影响客户端连接，变更时无需重建客户端。
+NON_CLIENT_KEYS = {"name", "enabled", "priority", "order"}
+
+
+def config_fingerprint(config: dict[str, Any]) -> str:
+    relevant = {key: value for key, value in config.items() if key not in NON_CLIENT_KEYS}
+    raw = json.dumps(relevant, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class StorageRegistry:
+    def __init__(self, max_size: int = 32) -> None:
+        self.max_size = max_size
+        self._clients: OrderedDict[tuple[str, str], ObjectStorage] = OrderedDict()
+        self._build_locks: dict[tuple[str, str], Lock] = {}
+        self._lock = Lock()
+
+    def get(self, channel_id: str, config: dict[str, Any], factory) -> ObjectStorage:
+        key = (channel_id, config_fingerprint(config))
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                return client
+            build_lock = self._build_locks.setdefault(key, Lock())
+
+        # 中文注释：同一渠道只允许一个线程构造客户端，构造时会做一次桶校验等网络请求，
+        # 其余线程等待复用结果。
+        with build_lock:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is not None:
+                    return client
+            try:
+                client = factory(config)
+                with self._lock:
+                    # 中文注释：同一渠道配置变更后，旧指纹对应的客户端不再使用，直接移除。
+                    for stale in [item for item in self._clients if item[0] == channel_id]:
+                        self._clients.pop(stale)
+                    self._clients[key] = client
+                    while len(self._clients) > self.max_size:
+                        self._clients.popitem(last=False)
+            finally:
+                # 中文注释：构造失败（如凭据错误）也要回收构造锁，否则每个失败的指纹都会残留一把锁。
+                with self._lock:
+                    if self._build_locks.get(key) is build_lock:
+                        self._build_locks.pop(key)
+            return client
+
+    def invalidate(self, channel_id: str | None = None) -> None:
+        with self._lock:
+            if channel_id is None:
+                self._clients.clear()
+                return
+            for stale in [item for item in self._clients if item[0] == channel_id]:
+                self._clients.pop(stale)
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+
+storage_registry = StorageRegistry()
@@ -0,0 +1,127 @@
+"""统计领取链路每次领取的 SQL 语句数与耗时，对比旧的逐条查询与联表解析。"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="领取链路查询数基准")
+    parser.add_argument("--gifts", type=int, default=200, help="参与测试的礼物数量")
+    parser.add_argument("--bindings", type=int, default=5, help="每个礼物绑定的红包数量")
+    return parser.parse_args()
+
+
+def run(gift_count: int, bindings_per_gift: int) -> None:
+    workdir = Path(tempfile.mkdtemp(prefix="qrgift-bench-"))
+    # 中文注释：必须在导入 app 之前切换数据库路径，避免污染真实数据。
+    os.environ["SQLITE_PATH"] = str(workdir / "bench.db")
+
+    from secrets import token_urlsafe
+
+    from sqlalchemy import event
+
+    from app.core.database import SessionLocal, engine
+    from app.core.security import hash_gift_token
+    from app.models import Base
+    from app.models.gift import GiftBinding, GiftQrcode
+    from app.models.red_packet import RedPacket, RedPacketBatch
+    from app.repositories.gift_repository import GiftRepository
+    from app.services.claim_engine import ClaimEngine
+
+    Base.metadata.create_all(engine)
+
+    tokens: list[str] = []
+    db = SessionLocal()
+    try:
+        batch = RedPacketBatch(batch_no="BENCH", source="bench")
+        db.add(batch)
+        db.flush()
+        for index in range(gift_count):
+            token = token_urlsafe(32)
+            gift = GiftQrcode(
+                title=f"bench-{index}",
+                status="active",
+                token_plain=token,
+                token_hash=hash_gift_token(token),
+                dispatch_strategy="amount_desc",
+            )
+            db.add(gift)
+            db.flush()
+            for offset in range(bindings_per_gift):
+                packet = RedPacket(
+                    batch_id=batch.id,
+                    title=f"bench-{index}-{offset}",
+                    amount=offset + 1,
+                    level=1,
+                    content_type="url",
+                    content_value="https://example.com/bench",
+                    claim_url="https://example.com/bench",
+                    status="bound",
+                )
+                db.add(packet)
+                db.flush()
+                db.add(GiftBinding(gift_qrcode_id=gift.id, red_packet_id=packet.id))
+            tokens.append(token)
+        db.commit()
+    finally:
+        db.close()
+
+    counter = {"statements": 0, "selects": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(_conn, _cursor, statement, *_args) -> None:
+        counter["statements"] += 1
+        if statement.lstrip().upper().startswith("SELECT"):
+            counter["selects"] += 1
+
+    def legacy_resolve(token: str) -> None:
+        session = SessionLocal()
+        try:
+            repo = GiftRepository(session)
+            gift = repo.get_by_token_plain(token)
+            if not gift:
+                gift = repo.get_by_token_hash(hash_gift_token(token))
+            bindings = repo.list_bindings(gift.id)
+            for binding in bindings:
+                session.get(RedPacket, binding.red_packet_id)
+        finally:
+            session.close()
+
+    def engine_claim(token: str) -> None:
+        session = SessionLocal()
+        try:
+            ClaimEngine(session).claim(token, "127.0.0.1", "bench", "http://127.0.0.1")
+        finally:
+            session.close()
+
+    def measure(label: str, func) -> None:
+        per_call: list[int] = []
+        per_call_selects: list[int] = []
+        started = time.perf_counter()
+        for token in tokens:
+            before = counter["statements"]
+            before_selects = counter["selects"]
+            func(token)
+            per_call.append(counter["statements"] - before)
+            per_call_selects.append(counter["selects"] - before_selects)
+        elapsed = time.perf_counter() - started
+        print(
+            f"{label:<28} 平均语句数={statistics.mean(per_call):6.2f} "
+            f"其中查询={statistics.mean(per_call_selects):6.2f} "
+            f"平均耗时={elapsed / len(tokens) * 1000:7.3f}ms"
+        )
+
+    print(f"礼物={gift_count} 每礼物绑定={bindings_per_gift} 数据库={workdir / 'bench.db'}")
+    measure("旧链路(仅解析，不含写入)", legacy_resolve)
+    measure("ClaimEngine(含写入与提交)", engine_claim)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    run(args.gifts, args.bindings)
@@ -0,0 +1,88 @@
+"""IP 名单匹配基准：对比逐条遍历网段与编译后的区间二分匹配的构建及查询耗时，并校验结果一致。"""
+
+from __future__ import annotations
+
+import argparse
+import ipaddress
+import random
+import sys
+import time
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="IP 名单匹配基准")
+    parser.add_argument("--ranges", type=int, default=100000, help="名单网段条数")
+    parser.add_argument("--lookups", type=int, default=200000, help="编译匹配器的查询次数")
+    parser.add_argument("--linear-lookups", type=int, default=200, help="逐条遍历的查询次数")
+    return parser.parse_args()
+
+
+def build_entries(count: int, rng: random.Random) -> list[str]:
+    # 中文注释：约九成 IPv4、一成 IPv6，前缀长度覆盖单个地址到 /16，模拟导入的滥用网段名单。
+    entries: list[str] = []
+    for _ in range(count):
+        if rng.random() < 0.9:
+            prefix = rng.choice([16, 20, 24, 24, 28, 32, 32, 32])
+            address = ipaddress.IPv4Address(rng.getrandbits(32))
+            entries.append(str(ipaddress.ip_network(f"{address}/{prefix}", strict=False)))
+        else:
+            prefix = rng.choice([32, 48, 64, 128])
+            address = ipaddress.IPv6Address(rng.getrandbits(128))
+            entries.append(str(ipaddress.ip_network(f"{address}/{prefix}", strict=False)))
+    return entries
+
+
+def build_probes(count: int, entries: list[str], rng: random.Random) -> list[str]:
+    # 中文注释：一半探测地址取自名单网段内部，另一半随机生成，命中与未命中两条路径都会覆盖。
+    probes: list[str] = []
+    for index in range(count):
+        if index % 2 == 0:
+            network = ipaddress.ip_network(rng.choice(entries))
+            offset = rng.randrange(network.num_addresses)
+            probes.append(str(network.network_address + offset))
+        elif rng.random() < 0.9:
+            probes.append(str(ipaddress.IPv4Address(rng.getrandbits(32))))
+        else:
+            probes.append(str(ipaddress.IPv6Address(rng.getrandbits(128))))
+    return probes
+
+
+def run(range_count: int, lookup_count: int, linear_count: int) -> int:
+    from app.core.ip_matcher import IpRangeMatcher
+
+    rng = random.Random(20261017)
+    entries = build_entries(range_count, rng)
+    probes = build_probes(lookup_count, entries, rng)
+
+    started = time.perf_counter()
+    matcher = IpRangeMatcher(entries)
+    build_ms = (time.perf_counter() - started) * 1000
+    print(f"编译 {range_count} 条网段 -> {len(matcher)} 个合并区间，耗时 {build_ms:.0f}ms")
+
+    started = time.perf_counter()
+    compiled = [matcher.match(ip) for ip in probes]
+    compiled_us = (time.perf_counter() - started) / lookup_count * 1_000_000
+    print(f"区间二分: {compiled_us:.2f}us/次 命中 {sum(compiled)}/{lookup_count}")
+
+    networks = [ipaddress.ip_network(item) for item in entries]
+    linear_probes = probes[:linear_count]
+    started = time.perf_counter()
+    linear = [
+        any(address in network for network in networks)
+        for address in map(ipaddress.ip_address, linear_probes)
+    ]
+    linear_us = (time.perf_counter() - started) / len(linear_probes) * 1_000_000
+    print(f"逐条遍历: {linear_us:.0f}us/次 加速={linear_us / compiled_us:.0f}x")
+
+    checked = zip(linear_probes, linear, compiled[: len(linear_probes)], strict=True)
+    mismatched = [ip for ip, expected, got in checked if expected != got]
+    if mismatched:
+        print(f"校验失败: {len(mismatched)} 个地址结果不一致，例如 {mismatched[0]}")
+        return 1
+    print(f"校验通过: 前 {len(linear_probes)} 个地址与逐条遍历结果一致")
+    return 0
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    sys.exit(run(args.ranges, args.lookups, args.linear_lookups))
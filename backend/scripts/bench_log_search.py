@@ -0,0 +1,127 @@
+"""日志检索基准：对比旧的多列 ilike 全表扫描与 FTS5 trigram 索引、结构化索引参数的查询耗时。"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="日志检索基准")
+    parser.add_argument("--rows", type=int, default=300000, help="访问日志条数")
+    parser.add_argument("--repeat", type=int, default=5, help="每个查询重复次数")
+    return parser.parse_args()
+
+
+def run(row_count: int, repeat: int) -> int:
+    workdir = Path(tempfile.mkdtemp(prefix="qrgift-bench-"))
+    # 中文注释：必须在导入 app 之前切换数据库路径，避免污染真实数据。
+    os.environ["SQLITE_PATH"] = str(workdir / "bench.db")
+
+    from db_upgrade import build_alembic_config
+    from sqlalchemy import String, cast, insert, or_, select
+
+    from alembic import command
+    from app.core.database import SessionLocal
+    from app.models.log import AccessLog
+    from app.repositories.log_repository import LogRepository
+
+    # 中文注释：全文索引表与触发器只由迁移创建，这里走完整迁移而不是 create_all。
+    command.upgrade(build_alembic_config(), "head")
+
+    paths = ["/api/gifts", "/api/red-packets", "/api/logs/access", "/r/{token}", "/claim/content"]
+    rng = random.Random(7)
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        for offset in range(0, row_count, 10000):
+            rows = [
+                {
+                    "source": rng.choice(["admin", "public"]),
+                    "path": rng.choice(paths).replace("{token}", f"tok{rng.randrange(10**9):09d}"),
+                    "method": rng.choice(["GET", "POST"]),
+                    "ip": f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(256)}",
+                    "ua": "bench",
+                    "status_code": rng.choice([200, 200, 200, 302, 404, 429, 500]),
+                    "latency_ms": rng.randrange(200),
+                }
+                for _ in range(min(10000, row_count - offset))
+            ]
+            db.execute(insert(AccessLog), rows)
+            db.commit()
+        elapsed = time.perf_counter() - started
+        print(f"写入 {row_count} 条访问日志（含触发器维护索引）耗时 {elapsed:.1f}s")
+
+        probe_ip = db.scalar(select(AccessLog.ip).where(AccessLog.id == row_count // 2))
+        probe_token = db.scalar(
+            select(AccessLog.path).where(AccessLog.path.like("/r/%")).limit(1)
+        ).split("/")[-1][:9]
+
+        def legacy(keyword: str) -> list[int]:
+            pattern = f"%{keyword}%"
+            stmt = (
+                select(AccessLog.id)
+                .where(
+                    or_(
+                        AccessLog.source.ilike(pattern),
+                        AccessLog.path.ilike(pattern),
+                        AccessLog.method.ilike(pattern),
+                        AccessLog.ip.ilike(pattern),
+                        cast(AccessLog.status_code, String).ilike(pattern),
+                    )
+                )
+                .order_by(AccessLog.id.desc())
+                .limit(50)
+            )
+            return list(db.scalars(stmt).all())
+
+        def measure(func) -> tuple[float, list[int]]:
+            timings = []
+            result: list[int] = []
+            for _ in range(repeat):
+                begin = time.perf_counter()
+                result = func()
+                timings.append((time.perf_counter() - begin) * 1000)
+            return statistics.median(timings), result
+
+        repo = LogRepository(db)
+        failures = 0
+        for keyword in [probe_token, "red-packets", probe_ip]:
+            legacy_ms, legacy_ids = measure(lambda keyword=keyword: legacy(keyword))
+            fts_ms, fts_ids = measure(
+                lambda keyword=keyword: [
+                    row.id for row in repo.list_access_logs(limit=50, keyword=keyword)
+                ]
+            )
+            same = legacy_ids == fts_ids
+            failures += 0 if same else 1
+            print(
+                f"关键词 {keyword!r}: ilike={legacy_ms:.1f}ms fts5={fts_ms:.1f}ms "
+                f"命中={len(fts_ids)} 结果一致={same}"
+            )
+
+        ip_ms, ip_ids = measure(
+            lambda: [row.id for row in repo.list_access_logs(limit=50, ip=probe_ip)]
+        )
+        status_ms, _ = measure(
+            lambda: [row.id for row in repo.list_access_logs(limit=50, status_code=500)]
+        )
+        print(f"结构化参数: ip={ip_ms:.1f}ms(命中 {len(ip_ids)}) status_code={status_ms:.1f}ms")
+    finally:
+        db.close()
+
+    if failures:
+        print(f"校验失败: {failures} 个关键词的结果与 ilike 不一致")
+        return 1
+    print("校验通过: FTS5 结果与 ilike 一致")
+    return 0
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    raise SystemExit(run(args.rows, args.repeat))
@@ -0,0 +1,112 @@
+"""二维码解码基准：生成模拟手机截图，对比旧的全图解码、分阶段解码与进程池并行解码的耗时。"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from io import BytesIO
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="二维码解码基准")
+    parser.add_argument("--images", type=int, default=40, help="图片数量")
+    parser.add_argument("--workers", type=int, default=4, help="解码进程数")
+    parser.add_argument("--timeout", type=float, default=10, help="单张图片超时秒数")
+    return parser.parse_args()
+
+
+def build_screenshot(index: int) -> tuple[str, bytes]:
+    import qrcode
+    from PIL import Image, ImageDraw
+
+    url = f"https://qr.alipay.com/bench{index:06d}{random.randrange(10**8):08d}"
+    qr_image = qrcode.make(url, box_size=12, border=2).convert("RGB")
+    # 中文注释：模拟 1170x2532 的手机截图，二维码位于页面中部，周围带有色块与文字干扰。
+    canvas = Image.new("RGB", (1170, 2532), (230, 60, 50))
+    draw = ImageDraw.Draw(canvas)
+    draw.rectangle((60, 500, 1110, 2000), fill=(255, 255, 255))
+    for line in range(12):
+        draw.text((80, 200 + line * 20), f"支付宝红包 {index} - {line}", fill=(255, 255, 255))
+    offset = ((1170 - qr_image.width) // 2, 700)
+    canvas.paste(qr_image, offset)
+    buffer = BytesIO()
+    canvas.save(buffer, "JPEG", quality=90)
+    return url, buffer.getvalue()
+
+
+def legacy_decode(raw: bytes) -> str | None:
+    import cv2
+    import numpy as np
+
+    # 中文注释：旧实现，直接在全分辨率彩色图上依次尝试单码与多码识别。
+    image = cv2.imdecode(np.frombuffer(raw, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        return None
+    detector = cv2.QRCodeDetector()
+    text, _, _ = detector.detectAndDecode(image)
+    if text:
+        return text.strip()
+    ok, decoded_info, _, _ = detector.detectAndDecodeMulti(image)
+    if ok:
+        for item in decoded_info:
+            if item:
+                return item.strip()
+    return None
+
+
+def run(image_count: int, workers: int, timeout: float) -> None:
+    from app.services.qr_decode import (
+        decode_images,
+        decode_qrcode_url,
+        decode_stats,
+        shutdown_decode_pool,
+    )
+
+    samples = [build_screenshot(index) for index in range(image_count)]
+    size_kb = sum(len(raw) for _url, raw in samples) / len(samples) / 1024
+    print(f"图片={image_count} 平均大小={size_kb:.0f}KB 进程数={workers}")
+
+    started = time.perf_counter()
+    legacy_ok = sum(1 for url, raw in samples if legacy_decode(raw) == url)
+    legacy_elapsed = time.perf_counter() - started
+    print(f"旧全图解码   成功={legacy_ok:<4} 耗时={legacy_elapsed:6.2f}s")
+
+    started = time.perf_counter()
+    serial_ok = sum(1 for url, raw in samples if decode_qrcode_url(raw) == url)
+    serial_elapsed = time.perf_counter() - started
+    print(
+        f"分阶段串行   成功={serial_ok:<4} 耗时={serial_elapsed:6.2f}s "
+        f"加速比={legacy_elapsed / serial_elapsed:.2f}x"
+    )
+
+    # 中文注释：先预热进程池，避免把子进程启动与导入 OpenCV 的时间计入并行耗时。
+    list(decode_images([(0, samples[0][1])], workers=workers))
+    started = time.perf_counter()
+    first_result_at = None
+    parallel_ok = 0
+    for result in decode_images(
+        ((index, raw) for index, (_url, raw) in enumerate(samples)),
+        workers=workers,
+        timeout=timeout,
+    ):
+        if first_result_at is None:
+            first_result_at = time.perf_counter() - started
+        if result.url == samples[result.key][0]:
+            parallel_ok += 1
+    parallel_elapsed = time.perf_counter() - started
+    shutdown_decode_pool()
+    print(
+        f"分阶段进程池 成功={parallel_ok:<4} 耗时={parallel_elapsed:6.2f}s "
+        f"首个结果={first_result_at or 0:.2f}s 加速比={serial_elapsed / parallel_elapsed:.2f}x"
+    )
+    for item in decode_stats.snapshot()["stages"]:
+        print(
+            f"  阶段={item['stage']:<10} 尝试={item['attempts']:<4} "
+            f"成功={item['successes']:<4} 平均={item['avg_ms']}ms"
+        )
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    run(args.images, args.workers, args.timeout)
@@ -0,0 +1,90 @@
+"""二维码渲染基准：对比 qrcode.make_image 逐模块绘制与矩阵级 NumPy 渲染的吞吐，并校验像素一致。"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from io import BytesIO
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="二维码渲染基准")
+    parser.add_argument("--images", type=int, default=500, help="渲染张数")
+    parser.add_argument("--compress-level", type=int, default=6, help="PNG 压缩级别 0-9")
+    return parser.parse_args()
+
+
+def encode(content: str):
+    import qrcode
+
+    qr = qrcode.QRCode(border=2, box_size=10)
+    qr.add_data(content)
+    qr.make(fit=True)
+    return qr
+
+
+def legacy_draw(qr) -> bytes:
+    # 中文注释：旧实现，经 PIL 逐模块绘制后按默认参数保存 PNG。
+    image = qr.make_image(fill_color="black", back_color="white")
+    buffer = BytesIO()
+    image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def to_pixels(raw: bytes) -> tuple[tuple[int, int], bytes]:
+    from PIL import Image
+
+    image = Image.open(BytesIO(raw)).convert("L")
+    return image.size, image.tobytes()
+
+
+def measure(name: str, func, items: list) -> tuple[list, float]:
+    started = time.perf_counter()
+    results = [func(item) for item in items]
+    elapsed = time.perf_counter() - started
+    print(f"{name}: {len(items) / elapsed:.0f} 张/s 耗时={elapsed:.2f}s")
+    return results, elapsed
+
+
+def run(image_count: int, compress_level: int) -> int:
+    # 中文注释：必须在导入 app 之前设置压缩级别，配置对象会被缓存。
+    os.environ["QRCODE_PNG_COMPRESS_LEVEL"] = str(compress_level)
+
+    from app.services.qr_render import render_matrix_png, render_qrcode_png
+
+    urls = [
+        f"https://gift.example.com/r/bench-{index:06d}-{'x' * (index % 40)}"
+        for index in range(image_count)
+    ]
+
+    # 中文注释：编码（选掩码）两种实现共用，单独计时；绘制与 PNG 编码是本次替换的部分。
+    codes, encode_elapsed = measure("编码", encode, urls)
+    legacy, legacy_elapsed = measure("旧绘制+保存", legacy_draw, codes)
+    current, current_elapsed = measure(
+        "矩阵绘制+保存", lambda qr: render_matrix_png(qr.get_matrix()), codes
+    )
+    measure("端到端 render_qrcode_png", render_qrcode_png, urls)
+    overall = (encode_elapsed + legacy_elapsed) / (encode_elapsed + current_elapsed)
+    print(
+        f"绘制阶段加速={legacy_elapsed / current_elapsed:.1f}x 端到端理论加速={overall:.2f}x "
+        f"平均大小 旧={sum(map(len, legacy)) / image_count:.0f}B "
+        f"新={sum(map(len, current)) / image_count:.0f}B"
+    )
+
+    mismatched = [
+        url
+        for url, old, new in zip(urls, legacy, current, strict=True)
+        if to_pixels(old) != to_pixels(new)
+    ]
+    if mismatched:
+        print(f"校验失败: {len(mismatched)} 张图片像素不一致，例如 {mismatched[0]}")
+        return 1
+    print(f"校验通过: {image_count} 张图片像素完全一致")
+    return 0
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    sys.exit(run(args.images, args.compress_level))
@@ -0,0 +1,61 @@
+"""从源表重建 stats_counters 统计计数，并报告与现有计数之间的偏差。"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import date
+
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.repositories.stats_repository import SCOPE_CLAIM_DAY, StatsRepository
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="重建仪表盘统计计数")
+    parser.add_argument(
+        "--since",
+        default="",
+        help="只重建该 UTC 日期(YYYY-MM-DD)及之后的按日领取计数，默认从最新归档日期的下一天开始",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="只报告偏差，不写入")
+    return parser.parse_args()
+
+
+def run(since: str, dry_run: bool) -> int:
+    db: Session = SessionLocal()
+    try:
+        repo = StatsRepository(db)
+        # 中文注释：默认只重建日志完整保留的日期，已归档（含部分归档）日期的按日计数保持不动。
+        since_day = date.fromisoformat(since) if since else repo.first_complete_claim_day()
+        # 中文注释：没有任何领取日志且未指定日期时，按日计数全部视为已归档，不做重建。
+        claim_days = since_day is not None
+        expected = repo.compute_from_sources(since_day, claim_days=claim_days)
+        current = repo.read_all()
+
+        drift = []
+        for key in sorted(set(expected) | set(current)):
+            scope, bucket, _ = key
+            if scope == SCOPE_CLAIM_DAY and (not claim_days or bucket < since_day.isoformat()):
+                continue
+            if expected.get(key, 0) != current.get(key, 0):
+                drift.append((key, current.get(key, 0), expected.get(key, 0)))
+
+        for (scope, bucket, name), old, new in drift:
+            print(f"{scope}/{bucket or '-'}/{name}: 计数 {old} -> 源表 {new}")
+        print(f"共 {len(drift)} 项偏差")
+        if dry_run:
+            return 1 if drift else 0
+
+        repo.rebuild(since_day, claim_days=claim_days)
+        db.commit()
+        print("统计计数已重建")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    sys.exit(run(args.since, args.dry_run))
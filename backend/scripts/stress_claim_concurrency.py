@@ -0,0 +1,151 @@
+"""多线程并发领取压测：同一礼物被同时扫码多次时，必须且只能成功一次。"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="并发领取压测")
+    parser.add_argument("--gifts", type=int, default=50, help="礼物数量")
+    parser.add_argument("--hits", type=int, default=40, help="每个礼物的并发扫码次数")
+    parser.add_argument("--bindings", type=int, default=3, help="每个礼物绑定的红包数量")
+    parser.add_argument("--threads", type=int, default=32, help="并发线程数")
+    return parser.parse_args()
+
+
+def run(gift_count: int, hits_per_gift: int, bindings_per_gift: int, threads: int) -> int:
+    workdir = Path(tempfile.mkdtemp(prefix="qrgift-stress-"))
+    # 中文注释：必须在导入 app 之前切换数据库路径，避免污染真实数据。
+    os.environ["SQLITE_PATH"] = str(workdir / "stress.db")
+
+    from secrets import token_urlsafe
+
+    from sqlalchemy import func, select
+
+    from app.core.database import SessionLocal, engine
+    from app.core.security import hash_gift_token
+    from app.models import Base
+    from app.models.gift import GiftBinding, GiftClaimLog, GiftQrcode
+    from app.models.red_packet import RedPacket, RedPacketBatch
+    from app.services.claim_engine import ClaimEngine
+
+    Base.metadata.create_all(engine)
+
+    tokens: list[str] = []
+    db = SessionLocal()
+    try:
+        batch = RedPacketBatch(batch_no="STRESS", source="stress")
+        db.add(batch)
+        db.flush()
+        for index in range(gift_count):
+            token = token_urlsafe(32)
+            gift = GiftQrcode(
+                title=f"stress-{index}",
+                status="active",
+                token_plain=token,
+                token_hash=hash_gift_token(token),
+                dispatch_strategy="random",
+            )
+            db.add(gift)
+            db.flush()
+            for offset in range(bindings_per_gift):
+                packet = RedPacket(
+                    batch_id=batch.id,
+                    title=f"stress-{index}-{offset}",
+                    amount=1,
+                    level=1,
+                    content_type="url",
+                    content_value="https://example.com/stress",
+                    claim_url="https://example.com/stress",
+                    status="bound",
+                )
+                db.add(packet)
+                db.flush()
+                db.add(GiftBinding(gift_qrcode_id=gift.id, red_packet_id=packet.id))
+            tokens.append(token)
+        db.commit()
+    finally:
+        db.close()
+
+    successes: Counter[str] = Counter()
+    outcomes: Counter[str] = Counter()
+    lock = threading.Lock()
+    start_gate = threading.Barrier(threads)
+    jobs = [token for token in tokens for _ in range(hits_per_gift)]
+
+    def claim(token: str) -> None:
+        session = SessionLocal()
+        try:
+            ClaimEngine(session).claim(token, "127.0.0.1", "stress", "http://127.0.0.1")
+            outcome = "success"
+        except ValueError as exc:
+            outcome = f"rejected:{exc}"
+        except Exception as exc:
+            outcome = f"error:{type(exc).__name__}"
+        finally:
+            session.close()
+        with lock:
+            outcomes[outcome] += 1
+            if outcome == "success":
+                successes[token] += 1
+
+    def worker(chunk: list[str]) -> None:
+        # 中文注释：所有线程就绪后同时放行，尽量制造同一礼物被同时扫码的竞争。
+        start_gate.wait()
+        for token in chunk:
+            claim(token)
+
+    # 中文注释：按轮转方式分片，使同一礼物的多次扫码分散在不同线程上同时发生。
+    chunks = [jobs[index::threads] for index in range(threads)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(worker, chunks))
+    elapsed = time.perf_counter() - started
+
+    db = SessionLocal()
+    try:
+        claimed_gifts = db.scalar(
+            select(func.count(GiftQrcode.id)).where(GiftQrcode.status == "claimed")
+        )
+        claimed_packets = db.scalar(
+            select(func.count(RedPacket.id)).where(RedPacket.status == "claimed")
+        )
+        success_logs = db.scalar(
+            select(func.count(GiftClaimLog.id)).where(GiftClaimLog.result == "success")
+        )
+    finally:
+        db.close()
+
+    print(f"总请求={len(jobs)} 线程={threads} 耗时={elapsed:.2f}s 数据库={workdir / 'stress.db'}")
+    for outcome, count in outcomes.most_common():
+        print(f"  {outcome}: {count}")
+    print(f"已领取礼物={claimed_gifts} 已领取红包={claimed_packets} 成功日志={success_logs}")
+
+    duplicated = [token for token, count in successes.items() if count > 1]
+    missing = [token for token in tokens if successes[token] == 0]
+    ok = (
+        not duplicated
+        and not missing
+        and claimed_gifts == gift_count
+        and claimed_packets == gift_count
+        and success_logs == gift_count
+    )
+    if not ok:
+        print(f"校验失败: 重复成功={len(duplicated)} 未成功={len(missing)}")
+        return 1
+    print("校验通过: 每个礼物恰好成功领取一次")
+    return 0
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    sys.exit(run(args.gifts, args.hits, args.bindings, args.threads))
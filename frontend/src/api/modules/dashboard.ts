@@ -15,10 +15,17 @@ export interface DashboardOverview {
   today_rejected_claims: number
 }
 
+export type DashboardTrendRange = '7d' | '30d' | '90d'
+
 export interface DashboardTrend {
+  range: DashboardTrendRange
+  timezone: string
   days: string[]
   success: number[]
   rejected: number[]
+  rejected_reasons: Array<{ reason: string; count: number }>
+  dispatch_strategies: Array<{ dispatch_strategy: string; count: number }>
+  updated_at: string | null
 }
 
 export async function getDashboardOverview(): Promise<DashboardOverview> {
@@ -26,7 +33,9 @@ export async function getDashboardOverview(): Promise<DashboardOverview> {
   return response.data.data
 }
 
-export async function getDashboardTrend7d(): Promise<DashboardTrend> {
-  const response = await client.get<ApiEnvelope<DashboardTrend>>('/dashboard/trend-7d')
+export async function getDashboardTrend(range: DashboardTrendRange, tz: string): Promise<DashboardTrend> {
+  const response = await client.get<ApiEnvelope<DashboardTrend>>('/dashboard/trend', {
+    params: { range, tz },
+  })
   return response.data.data
 }
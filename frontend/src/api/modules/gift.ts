@@ -85,8 +85,27 @@ export async function createGift(payload: CreateGiftPayload): Promise<CreateGift
   return response.data.data
 }
 
-export async function listGifts(): Promise<GiftItem[]> {
-  const response = await client.get<ApiEnvelope<GiftItem[]>>('/gifts')
+export interface GiftListQuery {
+  after_id?: number | null
+  limit?: number
+  status?: string
+  title?: string
+  activate_from?: string
+  activate_to?: string
+  expire_from?: string
+  expire_to?: string
+}
+
+export interface GiftListPage {
+  items: GiftItem[]
+  next_after_id: number | null
+}
+
+export async function listGifts(query: GiftListQuery = {}): Promise<GiftListPage> {
+  const params = Object.fromEntries(
+    Object.entries(query).filter(([, value]) => value !== undefined && value !== null && value !== ''),
+  )
+  const response = await client.get<ApiEnvelope<GiftListPage>>('/gifts', { params })
   return response.data.data
 }
 
@@ -130,3 +149,29 @@ export async function getGiftQrcodeDownloadUrl(giftId: number): Promise<string>
   )
   return response.data.data.url
 }
+
+export interface GiftExportFilters {
+  status?: string
+  keyword?: string
+  ids?: number[]
+}
+
+export async function exportGiftQrcodes(
+  format: 'zip' | 'pdf',
+  filters: GiftExportFilters = {},
+): Promise<Blob> {
+  const response = await client.get<Blob>('/gifts/export', {
+    params: {
+      format,
+      status: filters.status || undefined,
+      keyword: filters.keyword || undefined,
+      ids: filters.ids?.length ? filters.ids.join(',') : undefined,
+    },
+    headers: {
+      'X-Web-Origin': resolveWebOrigin(),
+    },
+    responseType: 'blob',
+    timeout: 0,
+  })
+  return response.data
+}
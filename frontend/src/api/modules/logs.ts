@@ -8,10 +8,15 @@ interface ApiEnvelope<T> {
 
 interface LogListQuery {
   limit?: number
-  offset?: number
+  cursor?: string
   q?: string
 }
 
+export interface LogPage<T> {
+  items: T[]
+  next_cursor: string | null
+}
+
 export interface AccessLogItem {
   id: number
   source: string
@@ -42,17 +47,29 @@ export interface OperationLogItem {
   created_at: string
 }
 
-export async function listAccessLogs(params: LogListQuery = {}): Promise<AccessLogItem[]> {
-  const response = await client.get<ApiEnvelope<AccessLogItem[]>>('/logs/access', { params })
+function withoutEmpty(params: LogListQuery): Record<string, string | number> {
+  return Object.fromEntries(
+    Object.entries(params).filter(([, value]) => value !== undefined && value !== ''),
+  ) as Record<string, string | number>
+}
+
+export async function listAccessLogs(params: LogListQuery = {}): Promise<LogPage<AccessLogItem>> {
+  const response = await client.get<ApiEnvelope<LogPage<AccessLogItem>>>('/logs/access', {
+    params: withoutEmpty(params),
+  })
   return response.data.data
 }
 
-export async function listClaimLogs(params: LogListQuery = {}): Promise<ClaimLogItem[]> {
-  const response = await client.get<ApiEnvelope<ClaimLogItem[]>>('/logs/claims', { params })
+export async function listClaimLogs(params: LogListQuery = {}): Promise<LogPage<ClaimLogItem>> {
+  const response = await client.get<ApiEnvelope<LogPage<ClaimLogItem>>>('/logs/claims', {
+    params: withoutEmpty(params),
+  })
   return response.data.data
 }
 
-export async function listOperationLogs(params: LogListQuery = {}): Promise<OperationLogItem[]> {
-  const response = await client.get<ApiEnvelope<OperationLogItem[]>>('/logs/operations', { params })
+export async function listOperationLogs(params: LogListQuery = {}): Promise<LogPage<OperationLogItem>> {
+  const response = await client.get<ApiEnvelope<LogPage<OperationLogItem>>>('/logs/operations', {
+    params: withoutEmpty(params),
+  })
   return response.data.data
 }
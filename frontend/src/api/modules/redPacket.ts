@@ -66,11 +66,46 @@ export interface ParseImagesResult {
   results: ParsedImageUrlItem[]
 }
 
-export async function listRedPackets(): Promise<RedPacketItem[]> {
-  const response = await client.get<ApiEnvelope<RedPacketItem[]>>('/red-packets')
+export interface RedPacketListQuery {
+  after_id?: number | null
+  limit?: number
+  status?: string
+  ids?: number[]
+  category?: string
+  tag?: string
+  level?: number | null
+  amount_min?: number | null
+  amount_max?: number | null
+  available_at?: string
+}
+
+export interface RedPacketListPage {
+  items: RedPacketItem[]
+  next_after_id: number | null
+}
+
+export async function listRedPackets(query: RedPacketListQuery = {}): Promise<RedPacketListPage> {
+  const params = Object.fromEntries(
+    Object.entries({ ...query, ids: query.ids?.length ? query.ids.join(',') : undefined }).filter(
+      ([, value]) => value !== undefined && value !== null && value !== '',
+    ),
+  )
+  const response = await client.get<ApiEnvelope<RedPacketListPage>>('/red-packets', { params })
   return response.data.data
 }
 
+export async function listBindableRedPackets(selectedIds: number[] = []): Promise<RedPacketItem[]> {
+  const [idle, selected] = await Promise.all([
+    listRedPackets({ status: 'idle', limit: 200 }),
+    selectedIds.length ? listRedPackets({ ids: selectedIds, limit: 200 }) : null,
+  ])
+  const merged = new Map<number, RedPacketItem>()
+  for (const item of [...(selected?.items ?? []), ...idle.items]) {
+    merged.set(item.id, item)
+  }
+  return Array.from(merged.values())
+}
+
 export async function listRedPacketCategories(): Promise<RedPacketCategory[]> {
   const response = await client.get<ApiEnvelope<RedPacketCategory[]>>('/red-packets/categories')
   return response.data.data